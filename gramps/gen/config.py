@@ -142,6 +142,7 @@ register('behavior.do-not-show-previously-seen-addon-updates', True)
 register('behavior.date-about-range', 50)
 register('behavior.date-after-range', 50)
 register('behavior.date-before-range', 50)
+register('behavior.worker-processes', 0)
 register('behavior.generation-depth', 15)
 register('behavior.max-age-prob-alive', 110)
 register('behavior.max-sib-age-diff', 20)
@@ -161,10 +162,16 @@ register('behavior.addons-url', "https://raw.githubusercontent.com/gramps-projec
 
 register('database.backend', 'sqlite')
 register('database.compress-backup', True)
+register('database.cache-size', 32767)
+register('database.compress-blobs', False)
 register('database.backup-path', USER_HOME)
 register('database.backup-on-exit', True)
 register('database.autobackup', 0)
 register('database.path', os.path.join(HOME_DIR, 'grampsdb'))
+register('database.undo-depth', 0)
+register('database.undo-size', 512)
+register('database.sqlite-cache-size', 16)
+register('database.sqlite-mmap-size', 256)
 register('database.host', '')
 register('database.port', '')
 
@@ -175,6 +182,7 @@ register('export.proxy-order',
           ["note", 0],
           ["reference", 0]]
         )
+register('export.xml-compression-level', 9)
 
 register('geography.center-lon', 0.0)
 register('geography.lock', False)
@@ -32,6 +32,7 @@ date parsing class. The default base class provides parsing for English.
 #-------------------------------------------------------------------------
 import re
 import calendar
+import threading
 
 #-------------------------------------------------------------------------
 #
@@ -49,6 +50,7 @@ log = logging.getLogger(".DateParser")
 from ..lib.date import Date, DateError, Today
 from ..const import GRAMPS_LOCALE as glocale
 from ..utils.grampslocale import GrampsLocale
+from ..utils.lru import LRU
 from ._datestrings import DateStrings
 
 #-------------------------------------------------------------------------
@@ -56,6 +58,8 @@ from ._datestrings import DateStrings
 # Top-level module functions
 #
 #-------------------------------------------------------------------------
+PARSE_CACHE_SIZE = 10000   # The number of parsed texts kept
+
 _max_days = [ 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 ]
 _leap_days = [ 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 ]
 
@@ -305,6 +309,13 @@ class DateParser:
         # for "today".
         # We also secretly support "$T" like in some reports.
 
+    # Parsed dates shared by all parsers, keyed by the class, language and
+    # format of the parser and the text.  See parse.
+    _parse_cache = LRU(PARSE_CACHE_SIZE)
+    _parse_cache_lock = threading.Lock()
+    _parse_cache_hits = 0
+    _parse_cache_misses = 0
+
     _langs = set()
     def __init_prefix_tables(self):
         lang = self._locale.lang
@@ -313,6 +324,8 @@ class DateParser:
             return
         else:
             DateParser._langs.add(lang)
+            # More month names are recognized from now on
+            DateParser.clear_cache()
         ds = self._ds = DateStrings(self._locale)
         log.debug("Begin building parser prefix tables for {}".format(lang))
         _build_prefix_table(DateParser.month_to_int,
@@ -486,6 +499,8 @@ class DateParser:
             r"(\+|-)\d\d\d\d" % (self._rfc_day_str, self._rfc_mon_str))
         self._today = re.compile(r"^\s*%s\s*$" % self._today_str,
                                  re.IGNORECASE)
+        # Dates relative to today are not cached
+        self._uncached = re.compile(self._today_str, re.IGNORECASE)
 
     def _get_int(self, val):
         """
@@ -948,10 +963,48 @@ class DateParser:
     def parse(self, text):
         """
         Parses the text, returning a :class:`.Date` object.
+
+        Imports parse the same texts many times, so the parsed dates are
+        kept in a cache shared by all parsers.  The format of the parser is
+        part of the key, so that a change of format does not find the dates
+        parsed in the old one.
         """
+        key = (self.__class__, self._locale.lang, self.dhformat, text)
+        with DateParser._parse_cache_lock:
+            if key in DateParser._parse_cache:
+                DateParser._parse_cache_hits += 1
+                return Date().unserialize(DateParser._parse_cache[key])
+            DateParser._parse_cache_misses += 1
         new_date = Date()
         try:
             self.set_date(new_date, text)
         except DateError:
             new_date.set_as_text(text)
+        if not self._uncached.search(text):
+            data = new_date.serialize()
+            with DateParser._parse_cache_lock:
+                DateParser._parse_cache[key] = (data[:3] + (tuple(data[3]),) +
+                                                data[4:])
         return new_date
+
+    @staticmethod
+    def clear_cache():
+        """
+        Empty the cache of parsed dates.
+        """
+        with DateParser._parse_cache_lock:
+            DateParser._parse_cache.clear()
+
+    @staticmethod
+    def get_cache_stats():
+        """
+        Return a dictionary with the number of hits and misses of the cache
+        of parsed dates, the ratio of hits and the number of dates cached.
+        """
+        with DateParser._parse_cache_lock:
+            hits = DateParser._parse_cache_hits
+            misses = DateParser._parse_cache_misses
+            return {'hits': hits,
+                    'misses': misses,
+                    'hit_rate': hits / (hits + misses) if hits + misses else 0,
+                    'size': len(DateParser._parse_cache.data)}
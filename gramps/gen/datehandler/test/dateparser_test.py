@@ -77,6 +77,53 @@ class DateParserTest(unittest.TestCase):
         self.assert_map_key_val(self.parser.calendar_to_int, 'юлианский', Date.CAL_JULIAN)
         self.assert_map_key_val(self.parser.calendar_to_int, 'ю', Date.CAL_JULIAN)
 
+class DateParserCacheTest(unittest.TestCase):
+    def setUp(self):
+        from .._dateparser import DateParser
+        self.parser = DateParser()
+        DateParser.clear_cache()
+
+    def stats(self):
+        return self.parser.get_cache_stats()
+
+    def test_repeated_text_is_a_hit(self):
+        before = self.stats()
+        date1 = self.parser.parse("abt 1850")
+        date2 = self.parser.parse("abt 1850")
+        after = self.stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        self.assertEqual(after['size'], 1)
+        self.assertEqual(date2.serialize(), date1.serialize())
+        self.assertEqual(date2.get_modifier(), Date.MOD_ABOUT)
+        date1.set_yr_mon_day(1900, 1, 1)
+        self.assertEqual(self.parser.parse("abt 1850").get_year(), 1850)
+
+    def test_text_only(self):
+        date = self.parser.parse("not a date")
+        self.assertTrue(self.parser.parse("not a date").is_equal(date))
+        self.assertEqual(self.parser.parse("not a date").get_modifier(),
+                         Date.MOD_TEXTONLY)
+
+    def test_today_is_not_cached(self):
+        before = self.stats()
+        self.parser.parse("today")
+        self.parser.parse("today")
+        self.assertEqual(self.stats()['misses'] - before['misses'], 2)
+
+    def test_format_is_part_of_key(self):
+        from .._dateparser import DateParser
+        class FormatParser(DateParser):
+            def dhformat_changed(self):
+                self.dhformat = FormatParser.dhformat
+        FormatParser.dhformat = "%d/%m/%y"
+        day_first = FormatParser()
+        FormatParser.dhformat = "%m/%d/%y"
+        month_first = FormatParser()
+        self.assertEqual(day_first.parse("2/3/1850").get_month(), 3)
+        self.assertEqual(month_first.parse("2/3/1850").get_month(), 2)
+        self.assertEqual(day_first.parse("2/3/1850").get_month(), 3)
+
 class Test_generate_variants(unittest.TestCase):
     def setUp(self):
         from .. import _datestrings
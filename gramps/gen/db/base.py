@@ -1433,6 +1433,65 @@ class DbReadBase:
         """
         return False
 
+    def select_handles(self, obj_class, where, args):
+        """
+        Return the handles of the objects of the given class that satisfy an
+        SQL WHERE clause over the secondary columns of its table.
+
+        Returns None if the database cannot evaluate SQL, in which case the
+        caller must fall back to testing each object.
+
+        :param obj_class: Primary object class name, e.g. 'Person'.
+        :type obj_class: str
+        :param where: SQL WHERE clause, using ? for parameters.
+        :type where: str
+        :param args: Parameters of the WHERE clause.
+        :type args: list
+        :returns: List of handles, or None.
+        :rtype: list
+        """
+        return None
+
+    def get_ancestors(self, handle):
+        """
+        Return the ancestors of a person, from the ancestry index.
+
+        The ancestors are found through all parent families, whatever the
+        relation of the person to their parents.  A person is their own
+        ancestor, at depth 0.  A family without parents stands for the
+        unknown parents of its children, so its handle is included too.
+
+        Returns None if the database does not maintain an ancestry index.
+
+        :param handle: handle of the person.
+        :type handle: str
+        :returns: Dictionary mapping the handles of the ancestors to the
+                  number of generations between them and the person, or
+                  None.
+        :rtype: dict
+        """
+        return None
+
+    def get_ancestry_lines(self, handle1, handle2):
+        """
+        Return the people on the lines of ancestry joining two people to
+        their common ancestors, from the ancestry index.
+
+        This includes the two people if they have a common ancestor.  Any
+        path of parents from either person to a common ancestor only goes
+        through the returned people.
+
+        Returns None if the database does not maintain an ancestry index.
+
+        :param handle1: handle of the first person.
+        :type handle1: str
+        :param handle2: handle of the second person.
+        :type handle2: str
+        :returns: Set of handles, or None.
+        :rtype: set
+        """
+        return None
+
     def method(self, fmt, *args):
         """
         Convenience function to return database methods.
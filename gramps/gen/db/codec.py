@@ -0,0 +1,132 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Encoding of serialized primary objects for storage in a database.
+
+Every blob written by a :class:`BlobCodec` ends with a three byte trailer:
+the id of the codec used for the payload, a set of flags describing how the
+payload was post-processed and a marker byte.  Blobs without the trailer
+are plain pickles written by older versions of Gramps, so a database can
+still be read before it has been migrated.
+
+The information is kept at the end because all of the supported decoders
+ignore trailing bytes, so the payload can be decoded without copying it.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import marshal
+import pickle
+import zlib
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+__all__ = ('BlobCodec', 'register_codec', 'CODEC_PICKLE', 'CODEC_MARSHAL',
+           'FLAG_ZLIB')
+
+BLOB_MARKER = 0             # Never the last byte of a pickle
+CODEC_PICKLE = 0
+CODEC_MARSHAL = 1
+FLAG_ZLIB = 0x01
+MARSHAL_VERSION = 4         # Pinned so that the stored format never drifts
+
+_CODECS = {
+    CODEC_PICKLE: (pickle.dumps, pickle.loads),
+    CODEC_MARSHAL: (lambda data: marshal.dumps(data, MARSHAL_VERSION),
+                    marshal.loads),
+}
+
+def register_codec(codec_id, dumps, loads):
+    """
+    Register an additional payload codec.
+
+    The loads function must ignore any bytes following the payload.
+
+    :param codec_id: identifier stored in the blob trailer, 0-255.
+    :type codec_id: int
+    :param dumps: function converting serialized data to bytes.
+    :type dumps: callable
+    :param loads: function converting bytes back to serialized data.
+    :type loads: callable
+    """
+    if codec_id in _CODECS:
+        raise ValueError("Codec %d is already registered" % codec_id)
+    _CODECS[codec_id] = (dumps, loads)
+
+#-------------------------------------------------------------------------
+#
+# BlobCodec class
+#
+#-------------------------------------------------------------------------
+class BlobCodec:
+    """
+    Convert the tuples returned by the serialize methods of primary objects
+    to and from bytes.
+
+    The serialized tuples only contain strings, numbers, booleans, None and
+    nested tuples and lists laid out in the order given by the object's
+    schema, which is exactly what :mod:`marshal` stores natively.
+    """
+
+    def __init__(self, codec=CODEC_MARSHAL, compress=False, level=1):
+        """
+        :param codec: id of the codec used when encoding.
+        :type codec: int
+        :param compress: if True, compress encoded payloads with zlib.
+        :type compress: bool
+        :param level: zlib compression level.
+        :type level: int
+        """
+        self.codec = codec
+        self.compress = compress
+        self.level = level
+        self.__dumps = _CODECS[codec][0]
+        self.__trailer = bytes([codec, FLAG_ZLIB if compress else 0,
+                                BLOB_MARKER])
+
+    def encode(self, data):
+        """
+        Return the bytes used to store the serialized data.
+        """
+        payload = self.__dumps(data)
+        if self.compress:
+            payload = zlib.compress(payload, self.level)
+        return payload + self.__trailer
+
+    @staticmethod
+    def decode(blob):
+        """
+        Return the serialized data stored in the blob, whichever codec was
+        used to write it.
+        """
+        if blob[-1] != BLOB_MARKER:
+            return pickle.loads(blob)
+        loads = _CODECS[blob[-3]][1]
+        if blob[-2] & FLAG_ZLIB:
+            return loads(zlib.decompress(blob))
+        return loads(blob)
+
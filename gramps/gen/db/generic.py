@@ -35,6 +35,9 @@ import ast
 import sys
 import datetime
 import glob
+import sqlite3
+import threading
+from itertools import chain
 
 #------------------------------------------------------------------------
 #
@@ -54,6 +57,7 @@ from ..updatecallback import UpdateCallback
 from .bookmarks import DbBookmarks
 
 from ..utils.id import create_id
+from ..utils.lru import LRU
 from ..lib.researcher import Researcher
 from ..lib import (Tag, Media, Person, Family, Source, Citation, Event,
                    Place, Repository, Note, NameOriginType)
@@ -79,50 +83,158 @@ def touch(fname, mode=0o666, dir_fd=None, **kwargs):
                      dir_fd=None if os.supports_fd else dir_fd, **kwargs)
 
 class DbGenericUndo(DbUndo):
+    """
+    Undo/redo manager of DbGeneric.
+
+    The pickled records of the transactions are kept in a journal, a SQLite
+    file next to the database, and are read back when a transaction is
+    undone or redone, so that the memory used does not grow with the
+    history.  The journal only lasts for the session.
+
+    The history is bounded by the database.undo-depth option, the number of
+    transactions which can be undone, and by the database.undo-size option,
+    the size of the journal in megabytes.  When a transaction is committed,
+    the oldest transactions beyond these bounds are dropped and their
+    records are removed from the journal.  The last transaction can always
+    be undone.
+    """
     def __init__(self, grampsdb, path):
         super(DbGenericUndo, self).__init__(grampsdb)
-        self.undodb = []
+        self.path = path
+        self.journal = None
+        self.filename = None
+        self.count = 0  # the number of records appended
+        self.size = 0   # the size of the records in the journal
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the journal.  A database in memory or opened read-only keeps
+        its journal in memory.
         """
-        pass
+        self.filename = None
+        if (self.path and not self.db.readonly and
+                os.path.isdir(os.path.dirname(self.path))):
+            try:
+                if os.path.exists(self.path):
+                    # left by a session which did not close
+                    os.remove(self.path)
+                self.filename = self.path
+            except OSError as msg:
+                LOG.warning("Undo journal kept in memory: %s", str(msg))
+        self.journal = sqlite3.connect(self.filename or ':memory:')
+        self.journal.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # The journal does not need to survive a crash
+        self.journal.execute("PRAGMA journal_mode = OFF")
+        self.journal.execute("PRAGMA synchronous = OFF")
+        self.journal.execute("CREATE TABLE undo "
+                             "(recno INTEGER PRIMARY KEY, data BLOB)")
+        self.count = 0
+        self.size = 0
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close and remove the journal.
         """
-        pass
+        if self.journal is None:
+            return
+        self.journal.close()
+        self.journal = None
+        if self.filename:
+            try:
+                os.remove(self.filename)
+            except OSError:
+                pass
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its record number.
         """
-        self.undodb.append(value)
+        self.journal.execute("INSERT INTO undo VALUES (?, ?)",
+                             (self.count, value))
+        self.count += 1
+        self.size += len(value)
+        return self.count - 1
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns an entry by index number.
         """
-        return self.undodb[index]
+        row = self.journal.execute("SELECT data FROM undo WHERE recno = ?",
+                                   (index,)).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return row[0]
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set an entry to a value.
         """
-        self.undodb[index] = value
+        old_value = self[index]
+        self.journal.execute("UPDATE undo SET data = ? WHERE recno = ?",
+                             (value, index))
+        self.size += len(value) - len(old_value)
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries appended, including those which were
+        removed from the journal.
+        """
+        return self.count
+
+    def clear(self):
+        """
+        Clear the undo/redo list, and the journal if no transaction is in
+        progress.
         """
-        return len(self.undodb)
+        super(DbGenericUndo, self).clear()
+        if self.db.transaction is None:
+            self.__compact()
+
+    def commit(self, txn, msg):
+        """
+        Commit the transaction to the undo/redo database, and drop the
+        oldest transactions beyond the bounds of the history.
+        """
+        super(DbGenericUndo, self).commit(txn, msg)
+        depth = config.get('database.undo-depth')
+        max_size = config.get('database.undo-size') * 1024 * 1024
+        if depth and len(self.undoq) > depth:
+            while len(self.undoq) > depth:
+                self.undoq.popleft()
+            self.__compact()
+        while max_size and self.size > max_size and len(self.undoq) > 1:
+            self.undoq.popleft()
+            self.__compact()
+        self.journal.commit()
+
+    def __compact(self):
+        """
+        Remove the records older than the first record of the transactions
+        which can still be undone or redone.
+        """
+        oldest = min((txn.first for txn in chain(self.undoq, self.redoq)
+                      if txn.first is not None), default=self.count)
+        (size,) = self.journal.execute(
+            "SELECT TOTAL(LENGTH(data)) FROM undo WHERE recno < ?",
+            (oldest,)).fetchone()
+        if size:
+            self.journal.execute("DELETE FROM undo WHERE recno < ?", (oldest,))
+            self.journal.commit()
+            self.journal.execute("PRAGMA incremental_vacuum")
+            self.size -= int(size)
+
+    def __records(self, transaction, reverse=False):
+        """
+        Return an iterator over the records of a transaction, read from the
+        journal as they are needed.
+        """
+        if transaction.first is None:
+            return iter(())
+        cursor = self.journal.execute(
+            "SELECT data FROM undo WHERE recno BETWEEN ? AND ? "
+            "ORDER BY recno " + ("DESC" if reverse else "ASC"),
+            (transaction.first, transaction.last))
+        return (pickle.loads(data) for (data,) in cursor)
 
     def _redo(self, update_history):
         """
@@ -133,16 +245,14 @@ class DbGenericUndo(DbUndo):
         self.undoq.append(txn)
         transaction = txn
         db = self.db
-        subitems = transaction.get_recnos()
         # sigs[obj_type][trans_type]
         sigs = [[[] for trans_type in range(3)] for key in range(11)]
 
         # Process all records in the transaction
         try:
             self.db._txn_begin()
-            for record_id in subitems:
-                (key, trans_type, handle, old_data, new_data) = \
-                    pickle.loads(self.undodb[record_id])
+            for (key, trans_type, handle, old_data, new_data) in \
+                    self.__records(transaction):
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
@@ -182,16 +292,14 @@ class DbGenericUndo(DbUndo):
         self.redoq.append(txn)
         transaction = txn
         db = self.db
-        subitems = transaction.get_recnos(reverse=True)
         # sigs[obj_type][trans_type]
         sigs = [[[] for trans_type in range(3)] for key in range(11)]
 
         # Process all records in the transaction
         try:
             self.db._txn_begin()
-            for record_id in subitems:
-                (key, trans_type, handle, old_data, new_data) = \
-                        pickle.loads(self.undodb[record_id])
+            for (key, trans_type, handle, old_data, new_data) in \
+                    self.__records(transaction, reverse=True):
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
@@ -312,7 +420,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
     __callback_map = {}
 
-    VERSION = (20, 0, 0)
+    VERSION = (23, 0, 0)
 
     def __init__(self, directory=None):
         DbReadBase.__init__(self)
@@ -541,6 +649,11 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.surname_list = []
         self.genderStats = GenderStats() # can pass in loaded stats as dict
         self.owner = Researcher()
+        self._raw_cache = LRU(config.get('database.cache-size'))
+        # Readers of other threads bypass the cache, see _is_reader
+        self._raw_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
         if directory:
             self.load(directory)
 
@@ -586,6 +699,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             mode = DBMODE_R
 
         self.readonly = mode == DBMODE_R
+        self.clear_cache()
 
         if not self.readonly and directory != ':memory:':
             write_lock_file(directory)
@@ -752,6 +866,9 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
+        self.clear_cache()
         self.db_is_open = False
         self._directory = None
 
@@ -1272,7 +1389,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             raise HandleError('Handle is None')
         if not handle:
             raise HandleError('Handle is empty')
-        data = self._get_raw_data(obj_key, handle)
+        data = self._get_cached_raw_data(obj_key, handle)
         if data:
             return obj_class.create(data)
         else:
@@ -1669,34 +1786,103 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         raise NotImplementedError
 
     def get_raw_person_data(self, handle):
-        return self._get_raw_data(PERSON_KEY, handle)
+        return self._get_cached_raw_data(PERSON_KEY, handle)
 
     def get_raw_family_data(self, handle):
-        return self._get_raw_data(FAMILY_KEY, handle)
+        return self._get_cached_raw_data(FAMILY_KEY, handle)
 
     def get_raw_source_data(self, handle):
-        return self._get_raw_data(SOURCE_KEY, handle)
+        return self._get_cached_raw_data(SOURCE_KEY, handle)
 
     def get_raw_citation_data(self, handle):
-        return self._get_raw_data(CITATION_KEY, handle)
+        return self._get_cached_raw_data(CITATION_KEY, handle)
 
     def get_raw_event_data(self, handle):
-        return self._get_raw_data(EVENT_KEY, handle)
+        return self._get_cached_raw_data(EVENT_KEY, handle)
 
     def get_raw_media_data(self, handle):
-        return self._get_raw_data(MEDIA_KEY, handle)
+        return self._get_cached_raw_data(MEDIA_KEY, handle)
 
     def get_raw_place_data(self, handle):
-        return self._get_raw_data(PLACE_KEY, handle)
+        return self._get_cached_raw_data(PLACE_KEY, handle)
 
     def get_raw_repository_data(self, handle):
-        return self._get_raw_data(REPOSITORY_KEY, handle)
+        return self._get_cached_raw_data(REPOSITORY_KEY, handle)
 
     def get_raw_note_data(self, handle):
-        return self._get_raw_data(NOTE_KEY, handle)
+        return self._get_cached_raw_data(NOTE_KEY, handle)
 
     def get_raw_tag_data(self, handle):
-        return self._get_raw_data(TAG_KEY, handle)
+        return self._get_cached_raw_data(TAG_KEY, handle)
+
+    ################################################################
+    #
+    # Object cache methods
+    #
+    ################################################################
+
+    def _is_reader(self):
+        """
+        Return True if the current thread only sees the committed changes of
+        the database, so that it cannot share the cache of the thread writing
+        the database.
+        """
+        return False
+
+    def _get_cached_raw_data(self, obj_key, handle):
+        """
+        Return raw data from the cache, reading it from the backend if it
+        is not there.
+        """
+        if self._is_reader():
+            # The cache holds the uncommitted changes of the writer, and a
+            # reader must not store its older data over them.
+            return self._get_raw_data(obj_key, handle)
+        key = (obj_key, handle)
+        with self._raw_cache_lock:
+            if key in self._raw_cache:
+                self.cache_hits += 1
+                return self._raw_cache[key]
+            self.cache_misses += 1
+        data = self._get_raw_data(obj_key, handle)
+        if data is not None:
+            with self._raw_cache_lock:
+                self._raw_cache[key] = data
+        return data
+
+    def _cache_raw_data(self, obj_key, handle, data):
+        """
+        Store raw data just written to the backend in the cache.
+
+        The data must not be shared with a live object.
+        """
+        with self._raw_cache_lock:
+            self._raw_cache[(obj_key, handle)] = data
+
+    def _uncache_raw_data(self, obj_key, handle):
+        """
+        Remove the raw data of an object from the cache.
+        """
+        key = (obj_key, handle)
+        with self._raw_cache_lock:
+            if key in self._raw_cache:
+                del self._raw_cache[key]
+
+    def clear_cache(self):
+        """
+        Empty the object cache.
+        """
+        with self._raw_cache_lock:
+            self._raw_cache.clear()
+
+    def get_cache_stats(self):
+        """
+        Return a dictionary with the number of cache hits and misses and
+        the number of objects currently cached.
+        """
+        return {'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'size': len(self._raw_cache.data)}
 
     ################################################################
     #
@@ -2492,7 +2678,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         from gramps.gen.db.upgrade import (
             gramps_upgrade_14, gramps_upgrade_15, gramps_upgrade_16,
             gramps_upgrade_17, gramps_upgrade_18, gramps_upgrade_19,
-            gramps_upgrade_20)
+            gramps_upgrade_20, gramps_upgrade_21, gramps_upgrade_22,
+            gramps_upgrade_23)
 
         if version < 14:
             gramps_upgrade_14(self)
@@ -2508,6 +2695,12 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_19(self)
         if version < 20:
             gramps_upgrade_20(self)
+        if version < 21:
+            gramps_upgrade_21(self)
+        if version < 22:
+            gramps_upgrade_22(self)
+        if version < 23:
+            gramps_upgrade_23(self)
 
         self.rebuild_secondary(callback)
         self.reindex_reference_map(callback)
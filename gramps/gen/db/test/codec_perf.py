@@ -0,0 +1,79 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the database blob codecs.
+
+Run with::
+
+    python3 -m unittest gramps.gen.db.test.codec_perf
+"""
+
+import os
+import time
+import pickle
+import unittest
+
+from gramps.gen.db.codec import BlobCodec, CODEC_PICKLE
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.const import DATA_DIR
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+ROUNDS = 10
+
+class CodecPerfTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        db = import_as_dict(EXAMPLE, User())
+        cls.rows = []
+        for obj_class in ('Person', 'Family', 'Event', 'Place', 'Repository',
+                          'Source', 'Citation', 'Media', 'Note', 'Tag'):
+            with db.method('get_%s_cursor', obj_class)() as cursor:
+                cls.rows.extend(data for handle, data in cursor)
+        db.close()
+
+    def __measure(self, name, encode, decode):
+        start = time.perf_counter()
+        for dummy in range(ROUNDS):
+            blobs = [encode(data) for data in self.rows]
+        encode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for dummy in range(ROUNDS):
+            result = [decode(blob) for blob in blobs]
+        decode_time = time.perf_counter() - start
+        self.assertEqual(result, self.rows)
+        count = len(self.rows) * ROUNDS
+        print("%-16s encode %8.0f obj/s  decode %8.0f obj/s  size %9d bytes"
+              % (name, count / encode_time, count / decode_time,
+                 sum(len(blob) for blob in blobs)))
+
+    def test_codecs(self):
+        print()
+        self.__measure('pickle (legacy)', pickle.dumps, pickle.loads)
+        for name, codec in (('pickle', BlobCodec(CODEC_PICKLE)),
+                            ('marshal', BlobCodec()),
+                            ('marshal+zlib', BlobCodec(compress=True))):
+            self.__measure(name, codec.encode, codec.decode)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the database blob codec """
+
+import unittest
+import pickle
+
+from ..codec import BlobCodec, CODEC_PICKLE
+from ..txn import DbTxn
+from ..utils import make_database
+from ...lib import Person, Name, Surname, Date, Event, EventType
+
+class CodecTest(unittest.TestCase):
+
+    def setUp(self):
+        person = Person()
+        name = Name()
+        name.set_first_name('John')
+        surname = Surname()
+        surname.set_surname('Smith')
+        name.add_surname(surname)
+        person.set_primary_name(name)
+        person.set_gender(Person.MALE)
+        self.person = person.serialize()
+        event = Event()
+        event.set_type(EventType.BIRTH)
+        event.set_date_object(Date(1850, 3, 1))
+        self.event = event.serialize()
+
+    def __round_trip(self, codec):
+        for data in (self.person, self.event):
+            blob = codec.encode(data)
+            self.assertIsInstance(blob, bytes)
+            self.assertEqual(codec.decode(blob), data)
+
+    def test_marshal(self):
+        self.__round_trip(BlobCodec())
+
+    def test_marshal_compressed(self):
+        self.__round_trip(BlobCodec(compress=True))
+
+    def test_pickle(self):
+        self.__round_trip(BlobCodec(CODEC_PICKLE))
+
+    def test_legacy_pickle(self):
+        codec = BlobCodec(compress=True)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            blob = pickle.dumps(self.person, protocol)
+            self.assertEqual(codec.decode(blob), self.person)
+
+class DatabaseCodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_legacy_rows(self):
+        person = Person()
+        with DbTxn('Add person', self.db) as trans:
+            handle = self.db.add_person(person, trans)
+        data = self.db.get_raw_person_data(handle)
+        # Rows written by earlier versions are plain pickles
+        self.db.dbapi.execute("UPDATE person SET blob_data = ? "
+                              "WHERE handle = ?",
+                              [pickle.dumps(data), handle])
+        self.assertEqual(self.db.get_raw_person_data(handle), data)
+        with self.db.get_person_cursor() as cursor:
+            self.assertEqual(list(cursor), [(handle, data)])
+
+def perfSuite():
+    from gramps.gen.db.test.codec_perf import CodecPerfTest
+    return unittest.defaultTestLoader.loadTestsFromTestCase(CodecPerfTest)
+
+if __name__ == "__main__":
+    unittest.main()
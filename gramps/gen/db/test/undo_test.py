@@ -0,0 +1,134 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the undo journal of DbGeneric """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..dbconst import DBBACKEND, DBUNDOFN
+from ..txn import DbTxn
+from ..utils import make_database
+from ...config import config
+from ...lib import Person, Name, Surname, Note
+
+class UndoJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with open(os.path.join(self.path, DBBACKEND), "w") as backend_file:
+            backend_file.write("sqlite")
+        self.db = make_database("sqlite")
+        self.db.load(self.path)
+        self.depth = config.get('database.undo-depth')
+        self.size = config.get('database.undo-size')
+
+    def tearDown(self):
+        config.set('database.undo-depth', self.depth)
+        config.set('database.undo-size', self.size)
+        self.db.close()
+        shutil.rmtree(self.path)
+
+    def add_person(self, first_name):
+        person = Person()
+        name = Name()
+        name.set_first_name(first_name)
+        surname = Surname()
+        surname.set_surname("Smith")
+        name.add_surname(surname)
+        person.set_primary_name(name)
+        with DbTxn("Add %s" % first_name, self.db) as trans:
+            self.db.add_person(person, trans)
+        return person.handle
+
+    def rename(self, handle, first_name):
+        with DbTxn("Rename", self.db) as trans:
+            person = self.db.get_person_from_handle(handle)
+            person.get_primary_name().set_first_name(first_name)
+            self.db.commit_person(person, trans)
+
+    def first_name(self, handle):
+        return self.db.get_person_from_handle(
+            handle).get_primary_name().get_first_name()
+
+    def test_undo_redo(self):
+        handle = self.add_person("John")
+        self.rename(handle, "Jack")
+        undodb = self.db.get_undodb()
+        self.assertTrue(os.path.isfile(os.path.join(self.path, DBUNDOFN)))
+        self.assertTrue(self.db.undo())
+        self.assertEqual(self.first_name(handle), "John")
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.has_person_handle(handle))
+        self.assertTrue(self.db.redo())
+        self.assertTrue(self.db.redo())
+        self.assertEqual(self.first_name(handle), "Jack")
+        self.assertEqual(undodb.undo_count, 2)
+
+    def test_depth(self):
+        config.set('database.undo-depth', 2)
+        handle = self.add_person("John")
+        for first_name in ("Jack", "Jim", "Joe"):
+            self.rename(handle, first_name)
+        undodb = self.db.get_undodb()
+        self.assertEqual(undodb.undo_count, 2)
+        (rows,) = undodb.journal.execute(
+            "SELECT COUNT(*) FROM undo").fetchone()
+        self.assertEqual(rows, sum(len(txn) for txn in undodb.undoq))
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.undo())
+        self.assertEqual(self.first_name(handle), "Jack")
+
+    def test_size(self):
+        config.set('database.undo-size', 1)
+        note = Note("x" * 400000)
+        with DbTxn("Add note", self.db) as trans:
+            self.db.add_note(note, trans)
+        undodb = self.db.get_undodb()
+        self.assertEqual(undodb.undo_count, 1)
+        # the old and the new text, beyond the size with the first one
+        note.set("y" * 400000)
+        with DbTxn("Edit note", self.db) as trans:
+            self.db.commit_note(note, trans)
+        self.assertEqual(undodb.undo_count, 1)
+        self.assertLess(undodb.size, 1024 * 1024)
+        self.assertTrue(self.db.undo())
+        self.assertEqual(self.db.get_note_from_handle(note.handle).get(),
+                         "x" * 400000)
+        self.assertFalse(self.db.undo())
+
+    def test_clear(self):
+        handle = self.add_person("John")
+        self.rename(handle, "Jack")
+        undodb = self.db.get_undodb()
+        undodb.clear()
+        self.assertEqual(undodb.size, 0)
+        self.assertFalse(self.db.undo())
+        self.db.close()
+        self.assertFalse(os.path.exists(os.path.join(self.path, DBUNDOFN)))
+        self.db = make_database("sqlite")
+        self.db.load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -47,6 +47,57 @@ _ = glocale.translation.gettext
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_23(self):
+    """
+    Upgrade database from version 22 to 23.
+
+    Add the sort key columns.  They are filled when the secondary indexes
+    are rebuilt at the end of the upgrade.
+    """
+    self._txn_begin()
+    self._create_sort_key_columns()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata('version', 23)
+
+
+def gramps_upgrade_22(self):
+    """
+    Upgrade database from version 21 to 22.
+
+    Add the ancestry index.  It is filled when the secondary indexes are
+    rebuilt at the end of the upgrade.
+    """
+    self._txn_begin()
+    self._create_ancestry_schema()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata('version', 22)
+
+
+def gramps_upgrade_21(self):
+    """
+    Upgrade database from version 20 to 21.
+
+    Re-encode the data of all primary objects with the blob codec of the
+    database, replacing the pickles written by earlier versions.
+    """
+    self.set_total(self.get_total())
+    self._txn_begin()
+
+    for obj_key in (PERSON_KEY, FAMILY_KEY, EVENT_KEY, MEDIA_KEY, PLACE_KEY,
+                    REPOSITORY_KEY, CITATION_KEY, SOURCE_KEY, NOTE_KEY,
+                    TAG_KEY):
+        for handle in list(self._iter_handles(obj_key)):
+            data = self._get_raw_data(obj_key, handle)
+            self._commit_raw(data, obj_key)
+            self.update()
+
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata('version', 21)
+
+
 def gramps_upgrade_20(self):
     """
     Placeholder update.
@@ -59,6 +59,7 @@ Specific symbols for parts of a name are defined:
 #-------------------------------------------------------------------------
 import re
 import logging
+import weakref
 LOG = logging.getLogger(".gramps.gen")
 
 #-------------------------------------------------------------------------
@@ -70,6 +71,7 @@ from ..const import ARABIC_COMMA, ARABIC_SEMICOLON, GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 from ..lib.name import Name
 from ..lib.nameorigintype import NameOriginType
+from ..utils.callback import Callback
 
 try:
     from ..config import config
@@ -83,6 +85,7 @@ except ImportError:
 # Constants
 #
 #-------------------------------------------------------------------------
+_PRIMARY_NAME = 3 # in the raw person data
 _FIRSTNAME = 4
 _SURNAME_LIST = 5
 _SUFFIX = 6
@@ -366,10 +369,11 @@ class NameDisplay:
                          '%y' + COMMAGLYPH + ' %s %f', _INA),
         ]
 
-        self.LNFN_STR = "%s" + COMMAGLYPH + " %s %s"
-
         self.name_formats = {}
 
+        # formatted primary names, per database and person handle
+        self._caches = weakref.WeakKeyDictionary()
+
         if WITH_GRAMPS_CONFIG:
             self.default_format = config.get('preferences.name-format')
             if self.default_format == 0:
@@ -391,6 +395,7 @@ class NameDisplay:
         """ How to handle single patronymic as surname is changed"""
         global PAT_AS_SURN
         PAT_AS_SURN = config.get('preferences.patronimic-surname')
+        self.clear_cache()
 
     def get_pat_as_surn(self):
         global PAT_AS_SURN
@@ -400,40 +405,22 @@ class NameDisplay:
         return lambda x: self.format_str(x, fmt_str)
 
     def _format_raw_fn(self, fmt_str):
-        return lambda x: self.format_str_raw(x, fmt_str)
-
-    def _raw_lnfn(self, raw_data):
-        result = self.LNFN_STR % (_raw_full_surname(raw_data[_SURNAME_LIST]),
-                             raw_data[_FIRSTNAME],
-                             raw_data[_SUFFIX])
-        return ' '.join(result.split())
-
-    def _raw_fnln(self, raw_data):
-        result = "%s %s %s" % (raw_data[_FIRSTNAME],
-                               _raw_full_surname(raw_data[_SURNAME_LIST]),
-                               raw_data[_SUFFIX])
-        return ' '.join(result.split())
-
-    def _raw_fn(self, raw_data):
-        result = raw_data[_FIRSTNAME]
-        return ' '.join(result.split())
+        func = self.__class__.raw_format_funcs.get(fmt_str)
+        if func is None:
+            func = self._gen_raw_func(fmt_str)
+            self.__class__.raw_format_funcs[fmt_str] = func
+        return func
 
     def clear_custom_formats(self):
         self.name_formats = {num: value
                              for num, value in self.name_formats.items()
                              if num >= 0}
+        self.clear_cache()
 
     def set_name_format(self, formats):
-
-        raw_func_dict = {
-            Name.LNFN : self._raw_lnfn,
-            Name.FNLN : self._raw_fnln,
-            Name.FN   : self._raw_fn,
-            }
-
         for (num, name, fmt_str, act) in formats:
             func = self._format_fn(fmt_str)
-            func_raw = raw_func_dict.get(num, self._format_raw_fn(fmt_str))
+            func_raw = self._format_raw_fn(fmt_str)
             self.name_formats[num] = (name, fmt_str, act, func, func_raw)
         self.set_default_format(self.get_default_format())
 
@@ -457,6 +444,7 @@ class NameDisplay:
             del self.name_formats[num]
         except:
             pass
+        self.clear_cache()
 
     def set_default_format(self, num):
         if num not in self.name_formats:
@@ -473,6 +461,7 @@ class NameDisplay:
                                        self.name_formats[Name.DEF][_F_ACT],
                                        self.name_formats[num][_F_FN],
                                        self.name_formats[num][_F_RAWFN])
+        self.clear_cache()
 
     def get_default_format(self):
         return self.default_format
@@ -486,6 +475,7 @@ class NameDisplay:
                                       self.name_formats[num][_F_RAWFN])
         except:
             pass
+        self.clear_cache()
 
     def get_name_format(self, also_default=False,
                         only_custom=False,
@@ -760,12 +750,7 @@ class NameDisplay:
         Is does not call :meth:`_format_str_base` because it would introduce an
         extra method call and we need all the speed we can squeeze out of this.
         """
-        func = self.__class__.raw_format_funcs.get(format_str)
-        if func is None:
-            func = self._gen_raw_func(format_str)
-            self.__class__.raw_format_funcs[format_str] = func
-
-        return func(raw_data)
+        return self._format_raw_fn(format_str)(raw_data)
 
     def _format_str_base(self, first, surname_list, suffix, title, call,
                          nick, famnick, format_str):
@@ -961,6 +946,81 @@ class NameDisplay:
         num = self._is_format_valid(raw_data[_DISPLAY])
         return self.name_formats[num][_F_RAWFN](raw_data)
 
+    def display_handles(self, db, handles, num=None):
+        """
+        Return the names of many people at once, as :meth:`display` would,
+        or as :meth:`display_format` would if num is given. The names are
+        built from the raw person data and, for a database that signals its
+        changes, kept until the person or the name formats change.
+
+        :param db: the database the people are in
+        :type db: :class:`.DbReadBase`
+        :param handles: handles of the people
+        :type handles: iterable of str
+        :param num: num of the format to be used, or None for the display
+                    format of each name
+        :type num: int
+        :returns: the names, in the order of the handles
+        :rtype: list of str
+        """
+        if num is None:
+            return self._format_handles(db, handles, 'display',
+                                        self.raw_display_name)
+        return self._format_handles(db, handles, num,
+                                    self.name_formats[num][_F_RAWFN])
+
+    def sorted_handles(self, db, handles):
+        """
+        Return the names of many people at once, as :meth:`sorted` would.
+        See :meth:`display_handles`.
+        """
+        return self._format_handles(db, handles, 'sorted',
+                                    self.raw_sorted_name)
+
+    def clear_cache(self):
+        """
+        Forget the names kept by :meth:`display_handles` for all databases.
+        """
+        for cache in self._caches.values():
+            cache.clear()
+
+    def _get_cache(self, db):
+        """
+        Return the cache of formatted names of a database, or None if the
+        database does not signal the changes to its people.
+        """
+        if not isinstance(db, Callback):
+            return None
+        cache = self._caches.get(db)
+        if cache is None:
+            cache = self._caches[db] = {}
+            def invalidate(handles):
+                for handle in handles:
+                    cache.pop(handle, None)
+            db.connect('person-update', invalidate)
+            db.connect('person-delete', invalidate)
+            db.connect('person-rebuild', cache.clear)
+        return cache
+
+    def _format_handles(self, db, handles, key, func):
+        cache = self._get_cache(db)
+        names = []
+        for handle in handles:
+            if cache is not None:
+                formatted = cache.get(handle)
+                if formatted is not None and key in formatted:
+                    names.append(formatted[key])
+                    continue
+            data = db.get_raw_person_data(handle)
+            if data is None:
+                names.append("")
+                continue
+            name = func(data[_PRIMARY_NAME])
+            if cache is not None:
+                cache.setdefault(handle, {})[key] = name
+            names.append(name)
+        return names
+
     def display_given(self, person):
         return self.format_str(person.get_primary_name(),'%f')
 
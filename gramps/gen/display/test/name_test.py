@@ -0,0 +1,108 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the name display of raw person data """
+
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Name, Surname
+from ...user import User
+from ..name import NameDisplay, _F_FN, _F_RAWFN
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class NameDisplayHandlesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+
+    def setUp(self):
+        self.displayer = NameDisplay()
+        self.handles = self.db.get_person_handles()
+
+    def test_formats(self):
+        custom = self.displayer.add_name_format(
+            'Custom', '%t "%f" (%c) %M, %0m %1y %s')
+        people = [self.db.get_person_from_handle(handle)
+                  for handle in self.handles]
+        for num in [Name.LNFN, Name.FNLN, Name.FN, Name.LNFNP, Name.PTFN,
+                    custom]:
+            self.assertEqual(
+                self.displayer.display_handles(self.db, self.handles, num),
+                [self.displayer.display_format(person, num)
+                 for person in people])
+            self.displayer.set_default_format(num)
+            self.assertEqual(
+                self.displayer.display_handles(self.db, self.handles),
+                [self.displayer.display(person) for person in people])
+            self.assertEqual(
+                self.displayer.sorted_handles(self.db, self.handles),
+                [self.displayer.sorted(person) for person in people])
+
+    def test_empty_parts(self):
+        name = Name()
+        name.add_surname(Surname())
+        name.get_primary_surname().set_surname("Smith")
+        for num in [Name.LNFN, Name.FNLN, Name.FN]:
+            self.assertEqual(
+                self.displayer.name_formats[num][_F_RAWFN](name.serialize()),
+                self.displayer.name_formats[num][_F_FN](name))
+
+    def test_invalidate(self):
+        handle = self.handles[0]
+        (before,) = self.displayer.display_handles(self.db, [handle], Name.FN)
+        person = self.db.get_person_from_handle(handle)
+        person.get_primary_name().set_first_name("Changed")
+        with DbTxn("Rename", self.db) as trans:
+            self.db.commit_person(person, trans)
+        try:
+            self.assertEqual(
+                self.displayer.display_handles(self.db, [handle], Name.FN),
+                ["Changed"])
+            self.displayer.set_default_format(Name.FN)
+            self.assertEqual(
+                self.displayer.display_handles(self.db, [handle]),
+                ["Changed"])
+            self.displayer.set_default_format(Name.FNLN)
+            self.assertEqual(
+                self.displayer.display_handles(self.db, [handle]),
+                [self.displayer.display(person)])
+        finally:
+            person.get_primary_name().set_first_name(before)
+            with DbTxn("Rename", self.db) as trans:
+                self.db.commit_person(person, trans)
+
+    def test_missing(self):
+        self.assertEqual(
+            self.displayer.display_handles(self.db, ["missing"]), [""])
+
+
+if __name__ == "__main__":
+    unittest.main()
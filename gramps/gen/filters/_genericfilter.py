@@ -39,6 +39,8 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
+from ..utils.pool import get_worker_processes
+from ._parallel import apply_parallel, can_apply_parallel
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -136,6 +138,61 @@ class GenericFilter:
     def get_number(self, db):
         return db.get_number_of_people()
 
+    def select_handles(self, db, operator):
+        """
+        Let the database evaluate the rules that have an SQL predicate.
+
+        The predicates are joined with operator, which is 'AND' or 'OR'.
+        For 'OR' every rule must have a predicate, otherwise the whole table
+        has to be scanned anyway.
+
+        Returns a tuple of the selected handles and the rules which still
+        have to be applied in Python to them, or None if nothing could be
+        pushed down to the database.
+        """
+        clauses = []
+        args = []
+        remaining = []
+        for rule in self.flist:
+            predicate = rule.sql()
+            if predicate is None:
+                remaining.append(rule)
+            else:
+                clauses.append('(%s)' % predicate[0])
+                args.extend(predicate[1])
+        if not clauses or (remaining and operator == 'OR'):
+            return None
+        obj_class = self.make_obj().__class__.__name__
+        handles = db.select_handles(obj_class,
+                                    (' %s ' % operator).join(clauses), args)
+        if handles is None:
+            return None
+        return handles, remaining
+
+    def check_selected(self, db, handles, task, user=None):
+        """
+        Apply task to the objects of the handles selected by the database,
+        and return the handles that pass the filter.
+        """
+        matches = []
+        if user:
+            user.begin_progress(_('Filter'), _('Applying ...'), len(handles))
+        for handle in handles:
+            obj = self.find_from_handle(db, handle)
+            if user:
+                user.step_progress()
+            if task(db, obj):
+                matches.append(handle)
+        if user:
+            user.end_progress()
+        if not self.invert:
+            return matches
+        matches = set(matches)
+        obj_class = self.make_obj().__class__.__name__
+        return [handle
+                for handle in db.method('iter_%s_handles', obj_class)()
+                if handle not in matches]
+
     def check_func(self, db, id_list, task, user=None, tupleind=None,
                    tree=False):
         final_list = []
@@ -168,6 +225,14 @@ class GenericFilter:
         return final_list
 
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
+        if id_list is None and not tree:
+            selected = self.select_handles(db, 'AND')
+            if selected is not None:
+                handles, flist = selected
+                return self.check_selected(
+                    db, handles,
+                    lambda db, obj: all(rule.apply(db, obj) for rule in flist),
+                    user)
         final_list = []
         flist = self.flist
         if user:
@@ -201,6 +266,11 @@ class GenericFilter:
         return final_list
 
     def check_or(self, db, id_list, user=None, tupleind=None, tree=False):
+        if id_list is None and not tree:
+            selected = self.select_handles(db, 'OR')
+            if selected is not None:
+                return self.check_selected(db, selected[0],
+                                           lambda db, obj: True, user)
         return self.check_func(db, id_list, self.or_test, user, tupleind,
                                tree=False)
 
@@ -252,11 +322,20 @@ class GenericFilter:
 
         user is optional. If present it must be an instance of a User class.
 
+        If the behavior.worker-processes option is greater than one, large
+        filters on a database stored on disk are evaluated in that many
+        worker processes.
+
         :Returns: if id_list given, it is returned with the items that
                 do not match the filter, filtered out.
                 if id_list not given, all items in the database that
                 match the filter are returned as a list of handles
         """
+        processes = get_worker_processes()
+        if processes > 1 and not tree and can_apply_parallel(db):
+            res = apply_parallel(self, db, processes, id_list, tupleind, user)
+            if res is not None:
+                return res
         m = self.get_check_func()
         for rule in self.flist:
             rule.requestprepare(db, user)
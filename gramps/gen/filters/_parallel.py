@@ -0,0 +1,180 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Evaluation of generic filters in a pool of worker processes.
+
+Each worker opens its own read-only connection to the database, rebuilds
+the filter and the custom filters it may refer to, and prepares the rules
+once.  The handles are then split into chunks which are checked by the
+workers, and the results are merged in their original order.
+
+Rules are shipped as their class and values, as they are stored in the
+custom filters file, rather than pickled: prepared rules may hold
+references to the database.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..const import CUSTOM_FILTERS
+from ..utils.pool import worker_pool
+from ..const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.gettext
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+NAMESPACES = ('Person', 'Family', 'Event', 'Source', 'Citation', 'Place',
+              'Media', 'Repository', 'Note')
+MIN_CHUNK_SIZE = 100
+CHUNKS_PER_PROCESS = 4
+
+# State of a worker process
+_DB = None
+_FILTER = None
+
+#-------------------------------------------------------------------------
+#
+# Filter specifications
+#
+#-------------------------------------------------------------------------
+def filter_to_spec(filter_):
+    """
+    Return a picklable description of a filter.
+    """
+    return (filter_.make_obj().__class__.__name__, filter_.get_name(),
+            filter_.get_logical_op(), filter_.get_invert(),
+            [(rule.__class__, list(rule.list), rule.use_regex)
+             for rule in filter_.get_rules()])
+
+def spec_to_filter(spec):
+    """
+    Rebuild a filter from its description.
+    """
+    from ._genericfilter import GenericFilterFactory
+    namespace, name, logical_op, invert, rules = spec
+    filter_ = GenericFilterFactory(namespace)()
+    filter_.set_name(name)
+    filter_.set_logical_op(logical_op)
+    filter_.set_invert(invert)
+    for rule_class, values, use_regex in rules:
+        filter_.add_rule(rule_class(values, use_regex))
+    return filter_
+
+def _custom_filter_specs():
+    """
+    Return the descriptions of the custom filters, including those that
+    were defined in this process but not saved yet.
+    """
+    from .. import filters
+    specs = []
+    if filters.CustomFilters:
+        for namespace in NAMESPACES:
+            for filter_ in filters.CustomFilters.get_filters_dict(
+                    namespace).values():
+                specs.append((namespace, filter_to_spec(filter_)))
+    return specs
+
+#-------------------------------------------------------------------------
+#
+# Worker process
+#
+#-------------------------------------------------------------------------
+def _init_worker(backend, path, spec, custom_specs):
+    """
+    Open the database and prepare the filter in a worker process.
+    """
+    global _DB, _FILTER
+    from .. import filters
+    from ._filterlist import FilterList
+    from ..db.dbconst import DBMODE_R
+    from ..db.utils import make_database
+    filters.CustomFilters = FilterList(CUSTOM_FILTERS)
+    for namespace, custom_spec in custom_specs:
+        filters.CustomFilters.add(namespace, spec_to_filter(custom_spec))
+    _DB = make_database(backend)
+    _DB.load(path, mode=DBMODE_R, update=False)
+    _FILTER = spec_to_filter(spec)
+    for rule in _FILTER.get_rules():
+        rule.requestprepare(_DB, None)
+
+def _check_chunk(args):
+    """
+    Return the items of a chunk that pass the filter.
+    """
+    chunk, tupleind = args
+    return _FILTER.get_check_func()(_DB, chunk, None, tupleind)
+
+#-------------------------------------------------------------------------
+#
+# apply_parallel
+#
+#-------------------------------------------------------------------------
+def can_apply_parallel(db):
+    """
+    Return True if the database can be opened by worker processes.
+
+    This requires a database stored on disk with no pending changes.  Proxy
+    databases are excluded, because the workers would bypass the proxy.
+    """
+    from ..db.generic import DbGeneric
+    return (isinstance(db, DbGeneric) and
+            db.get_save_path() not in (None, ':memory:') and
+            db.transaction is None)
+
+def apply_parallel(filter_, db, processes, id_list=None, tupleind=None,
+                   user=None):
+    """
+    Apply a filter using a pool of worker processes.
+
+    Returns the same result as :meth:`.GenericFilter.apply`, or None if the
+    filter was not worth splitting between processes.
+    """
+    from ..db.utils import get_dbid_from_path
+    if id_list is None:
+        namespace = filter_.make_obj().__class__.__name__
+        id_list = list(db.method('iter_%s_handles', namespace)())
+        tupleind = None
+    chunk_size = max(MIN_CHUNK_SIZE,
+                     -(-len(id_list) // (processes * CHUNKS_PER_PROCESS)))
+    if len(id_list) <= chunk_size:
+        return None
+    chunks = [(id_list[start:start + chunk_size], tupleind)
+              for start in range(0, len(id_list), chunk_size)]
+    path = db.get_save_path()
+    initargs = (get_dbid_from_path(path), path, filter_to_spec(filter_),
+                _custom_filter_specs())
+    final_list = []
+    if user:
+        user.begin_progress(_('Filter'), _('Applying ...'), len(chunks))
+    with worker_pool(min(processes, len(chunks)), _init_worker,
+                     initargs) as pool:
+        for result in pool.imap(_check_chunk, chunks):
+            final_list.extend(result)
+            if user:
+                user.step_progress()
+    if user:
+        user.end_progress()
+    return final_list
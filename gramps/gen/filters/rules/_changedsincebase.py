@@ -104,3 +104,16 @@ class ChangedSinceBase(Rule):
         if self.before:
             return obj_time < self.before
         return False
+
+    def sql(self):
+        clauses = []
+        args = []
+        if self.since:
+            clauses.append("change >= ?")
+            args.append(self.since)
+        if self.before:
+            clauses.append("change < ?")
+            args.append(self.before)
+        if not clauses:
+            return ("1 = 0", [])
+        return (" AND ".join(clauses), args)
@@ -43,3 +43,6 @@ class IsPrivate(Rule):
 
     def apply(self, db, obj):
         return obj.get_privacy()
+
+    def sql(self):
+        return ("private = 1", [])
@@ -54,3 +54,17 @@ class RegExpIdBase(Rule):
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def sql(self):
+        if not self.list[0]:
+            return ("1 = 1", [])
+        if self.use_regex:
+            pattern = self.regex[0].pattern
+        else:
+            pattern = re.escape(self.list[0])
+        pattern = "(?i:%s)" % pattern
+        try:
+            re.compile(pattern)
+        except re.error:
+            return None
+        return ("gramps_id REGEXP ?", [pattern])
@@ -139,6 +139,18 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def sql(self):
+        """
+        Return an SQL predicate equivalent to the rule, or None if the rule
+        can only be evaluated in Python.
+
+        The predicate is a tuple of a WHERE clause over the secondary columns
+        of the object's table and a list of its parameters.  It is only
+        requested after the rule has been prepared, and must select exactly
+        the objects for which apply returns True.
+        """
+        return None
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = ('%s="%s"' % (_(self.labels[ix][0] if
@@ -54,3 +54,8 @@ class HasSourceIdOf(HasGrampsId):
         if HasGrampsId.apply(self, dbase, source):
             return True
         return False
+
+    def sql(self):
+        where, args = HasGrampsId.sql(self)
+        return ("source_handle IN (SELECT handle FROM source WHERE %s)"
+                % where, args)
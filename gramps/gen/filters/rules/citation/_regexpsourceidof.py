@@ -56,3 +56,10 @@ class RegExpSourceIdOf(RegExpIdBase):
         if RegExpIdBase.apply(self, dbase, source):
             return True
         return False
+
+    def sql(self):
+        predicate = RegExpIdBase.sql(self)
+        if predicate is None:
+            return None
+        return ("source_handle IN (SELECT handle FROM source WHERE %s)"
+                % predicate[0], predicate[1])
@@ -29,6 +29,9 @@ Example:
 in the class body, outside any method:
 >    base_class = SearchName
 >    apply = child_base
+
+If the personal rule has an SQL predicate, the sql method should also be set
+to the matching wrapper, so that the rule does not inherit the personal one.
 """
 
 def father_base(self, db, family):
@@ -55,3 +58,20 @@ def child_base(self, db, family):
         if self.base_class.apply(self, db, child):
             return True
     return False
+
+def _member_sql(self, column):
+    predicate = self.base_class.sql(self)
+    if predicate is None:
+        return None
+    return ("%s IN (SELECT handle FROM person WHERE %s)"
+            % (column, predicate[0]), predicate[1])
+
+def father_sql(self):
+    return _member_sql(self, 'father_handle')
+
+def mother_sql(self):
+    return _member_sql(self, 'mother_handle')
+
+def child_sql(self):
+    # Children are only stored in the serialized family data
+    return None
@@ -64,6 +64,11 @@ class HasCommonAncestorWith(Rule):
 
     def add_ancs(self, db, person):
         if person and person.handle not in self.ancestor_cache:
+            # The ancestry index holds the same sets, when there is one
+            ancestors = db.get_ancestors(person.handle)
+            if ancestors is not None:
+                self.ancestor_cache[person.handle] = set(ancestors)
+                return
             self.ancestor_cache[person.handle] = set()
             # We are going to compare ancestors of one person with that of
             # another person; if that other person is an ancestor and itself
@@ -31,7 +31,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 #-------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import probably_alive, CachedProbablyAlive
 from .. import Rule
 from ....datehandler import parser
 
@@ -51,6 +51,10 @@ class ProbablyAlive(Rule):
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        self.cache = CachedProbablyAlive(db)
+
+    def reset(self):
+        self.cache = None
 
     def apply(self,db,person):
-        return probably_alive(person,db,self.current_date)
+        return probably_alive(person, db, self.current_date, cache=self.cache)
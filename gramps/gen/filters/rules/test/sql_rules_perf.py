@@ -0,0 +1,80 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of filter rules evaluated by the database against the same rules
+evaluated in Python.
+
+Run with::
+
+    python3 -m unittest gramps.gen.filters.rules.test.sql_rules_perf
+"""
+
+import os
+import time
+import unittest
+
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.filters import GenericFilterFactory
+from gramps.gen.filters.rules import person, event
+from gramps.gen.const import DATA_DIR
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+ROUNDS = 10
+
+class SqlRulesPerfTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def __measure(self, name, namespace, rules):
+        filter_ = GenericFilterFactory(namespace)()
+        filter_.set_rules(rules)
+        handles = list(self.db.method('iter_%s_handles', namespace)())
+        start = time.perf_counter()
+        for dummy in range(ROUNDS):
+            python = filter_.apply(self.db, handles)
+        python_time = (time.perf_counter() - start) / ROUNDS
+        start = time.perf_counter()
+        for dummy in range(ROUNDS):
+            pushed = filter_.apply(self.db)
+        pushed_time = (time.perf_counter() - start) / ROUNDS
+        self.assertCountEqual(pushed, python)
+        print("%-24s %5d of %5d  python %7.2f ms  sql %7.2f ms  %6.1fx"
+              % (name, len(pushed), len(handles), python_time * 1000,
+                 pushed_time * 1000, python_time / pushed_time))
+
+    def test_rules(self):
+        print()
+        self.__measure('HasIdOf', 'Person', [person.HasIdOf(['I0044'])])
+        self.__measure('RegExpIdOf', 'Person',
+                       [person.RegExpIdOf(['I01.[05]'], use_regex=True)])
+        self.__measure('HasTag', 'Person', [person.HasTag(['ToDo'])])
+        self.__measure('ChangedSince', 'Event',
+                       [event.ChangedSince(['2011-01-01', ''])])
+        self.__measure('RegExpIdOf and IsMale', 'Person',
+                       [person.RegExpIdOf(['I01'], use_regex=True),
+                        person.IsMale([])])
+
+if __name__ == "__main__":
+    unittest.main()
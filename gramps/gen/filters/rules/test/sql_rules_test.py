@@ -0,0 +1,182 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest that checks rules evaluated by the database against the same rules
+evaluated in Python.
+"""
+import unittest
+import os
+
+from ....db.utils import import_as_dict
+from ....filters import GenericFilterFactory
+from ....const import DATA_DIR
+from ....user import User
+from ....proxy import LivingProxyDb
+
+from .. import (person, family, event, place, source, citation, repository,
+                media, note)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class SqlRulesTest(unittest.TestCase):
+    """
+    Rules with an SQL predicate.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database.
+        """
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def filter_both_ways(self, namespace, rules, l_op='and', invert=False):
+        """
+        Apply a filter with and without the help of the database, check that
+        the results agree and return them.
+        """
+        filter_ = GenericFilterFactory(namespace)()
+        filter_.set_rules(rules)
+        filter_.set_logical_op(l_op)
+        filter_.set_invert(invert)
+        handles = list(self.db.method('iter_%s_handles', namespace)())
+        python = filter_.apply(self.db, handles)
+        pushed = filter_.apply(self.db)
+        self.assertCountEqual(pushed, python)
+        return set(pushed)
+
+    def test_pushdown(self):
+        """
+        Test that supported rules are evaluated by the database.
+        """
+        filter_ = GenericFilterFactory('Person')()
+        filter_.set_rules([person.RegExpIdOf(['I000.'], use_regex=True),
+                           person.IsFemale([])])
+        for rule in filter_.get_rules():
+            rule.requestprepare(self.db, None)
+        handles, remaining = filter_.select_handles(self.db, 'AND')
+        self.assertEqual(len(handles), 10)
+        self.assertEqual([type(rule) for rule in remaining], [person.IsFemale])
+        self.assertIsNone(filter_.select_handles(self.db, 'OR'))
+        for rule in filter_.get_rules():
+            rule.requestreset()
+
+    def test_proxy(self):
+        """
+        Test that rules are not evaluated by the database behind a proxy.
+        """
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL)
+        self.assertIsNone(proxy.select_handles('Person', '1 = 1', []))
+        filter_ = GenericFilterFactory('Person')()
+        filter_.add_rule(person.RegExpIdOf(['I000.'], use_regex=True))
+        self.assertLess(len(filter_.apply(proxy)), 10)
+
+    def test_hasidof(self):
+        """
+        Test HasIdOf rules.
+        """
+        self.assertEqual(len(self.filter_both_ways(
+            'Person', [person.HasIdOf(['I0044'])])), 1)
+        self.assertEqual(self.filter_both_ways(
+            'Person', [person.HasIdOf(['I9999'])]), set())
+
+    def test_regexpidof(self):
+        """
+        Test RegExpIdOf rules, as substrings and regular expressions.
+        """
+        self.assertEqual(len(self.filter_both_ways(
+            'Person', [person.RegExpIdOf(['i004'])])), 10)
+        self.assertEqual(len(self.filter_both_ways(
+            'Person', [person.RegExpIdOf(['I00[45]'], use_regex=True)])), 20)
+        self.assertEqual(len(self.filter_both_ways(
+            'Person', [person.RegExpIdOf(['(?i)i004'], use_regex=True)])), 10)
+        self.assertEqual(len(self.filter_both_ways(
+            'Person', [person.RegExpIdOf([''])])),
+                         self.db.get_number_of_people())
+
+    def test_combined(self):
+        """
+        Test rules combined with rules that are evaluated in Python.
+        """
+        rules = [person.RegExpIdOf(['I00'], use_regex=True),
+                 person.IsMale([])]
+        self.filter_both_ways('Person', rules)
+        self.filter_both_ways('Person', rules, invert=True)
+        rules = [person.HasIdOf(['I0044']), person.HasIdOf(['I0045'])]
+        self.assertEqual(len(self.filter_both_ways('Person', rules,
+                                                   l_op='or')), 2)
+        self.filter_both_ways('Person', rules, l_op='or', invert=True)
+
+    def test_family_members(self):
+        """
+        Test family rules that match against the members of a family.
+        """
+        self.assertEqual(len(self.filter_both_ways(
+            'Family', [family.FatherHasIdOf(['I0106'])])), 1)
+        self.assertEqual(len(self.filter_both_ways(
+            'Family', [family.MotherHasIdOf(['I0107'])])), 1)
+        self.filter_both_ways('Family', [family.ChildHasIdOf(['I0001'])])
+
+    def test_changedsince(self):
+        """
+        Test ChangedSince rules.
+        """
+        for namespace, rules in (('Person', person), ('Family', family),
+                                 ('Event', event), ('Place', place),
+                                 ('Source', source), ('Citation', citation),
+                                 ('Repository', repository), ('Media', media),
+                                 ('Note', note)):
+            for values in (['2006-01-01', '2012-01-01'], ['2010', ''],
+                           ['', '2010']):
+                self.filter_both_ways(namespace,
+                                      [rules.ChangedSince(values)])
+
+    def test_private_and_tags(self):
+        """
+        Test IsPrivate and HasTag rules.
+        """
+        self.filter_both_ways('Person', [person.PeoplePrivate([])])
+        self.assertEqual(len(self.filter_both_ways(
+            'Person', [person.HasTag(['ToDo'])])), 1)
+        self.assertEqual(self.filter_both_ways(
+            'Person', [person.HasTag(['NoSuchTag'])]), set())
+
+    def test_citation_source(self):
+        """
+        Test citation rules that match against the cited source.
+        """
+        self.assertTrue(self.filter_both_ways(
+            'Citation', [citation.HasSourceIdOf(['S0001'])]))
+        self.assertTrue(self.filter_both_ways(
+            'Citation', [citation.RegExpSourceIdOf(['S000'])]))
+        # A regular expression the database cannot take is applied in Python
+        self.assertTrue(self.filter_both_ways(
+            'Citation', [citation.RegExpSourceIdOf(['(?i)s000'],
+                                                   use_regex=True)]))
+
+
+def perfSuite():
+    from gramps.gen.filters.rules.test.sql_rules_perf import SqlRulesPerfTest
+    return unittest.defaultTestLoader.loadTestsFromTestCase(SqlRulesPerfTest)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for filters evaluated in worker processes """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ... import filters
+from .. import GenericFilter, GenericFilterFactory, reload_custom_filters
+from .._parallel import apply_parallel, can_apply_parallel
+from ..rules.person import (HasIdOf, IsMale, IsFemale, HasUnknownGender,
+                            HasTextMatchingSubstringOf, IsAncestorOf,
+                            MatchesFilter)
+from ..rules.family import FatherHasNameOf
+from ...config import config
+from ...const import DATA_DIR
+from ...db.dbconst import DBBACKEND
+from ...db.utils import make_database, import_from_filename
+from ...proxy import PrivateProxyDb
+from ...user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class ParallelFilterTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.path = tempfile.mkdtemp()
+        with open(os.path.join(cls.path, DBBACKEND), "w") as backend_file:
+            backend_file.write("sqlite")
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.path)
+        import_from_filename(cls.db, EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.path)
+
+    def setUp(self):
+        self.processes = config.get('behavior.worker-processes')
+        config.set('behavior.worker-processes', 2)
+
+    def tearDown(self):
+        config.set('behavior.worker-processes', self.processes)
+
+    def __check(self, filter_, id_list=None, tupleind=None):
+        parallel = apply_parallel(filter_, self.db, 2, id_list, tupleind)
+        self.assertIsNotNone(parallel)
+        config.set('behavior.worker-processes', 0)
+        serial = filter_.apply(self.db, id_list, tupleind)
+        config.set('behavior.worker-processes', 2)
+        if id_list is None:
+            # The table is split in handle order, not in cursor order
+            self.assertCountEqual(parallel, serial)
+        else:
+            self.assertEqual(parallel, serial)
+        return parallel
+
+    def test_can_apply(self):
+        self.assertTrue(can_apply_parallel(self.db))
+        self.assertFalse(can_apply_parallel(PrivateProxyDb(self.db)))
+
+    def test_logical_ops(self):
+        filter_ = GenericFilter()
+        filter_.set_rules([IsMale([]), HasTextMatchingSubstringOf(['Garner'])])
+        for logical_op in GenericFilter.logical_functions:
+            filter_.set_logical_op(logical_op)
+            self.__check(filter_)
+        filter_.set_invert(True)
+        self.__check(filter_)
+
+    def test_id_list(self):
+        filter_ = GenericFilter()
+        filter_.set_rules([IsFemale([])])
+        handles = sorted(self.db.get_person_handles())
+        self.assertTrue(self.__check(filter_, handles))
+        rows = [(index, handle) for index, handle in enumerate(handles)]
+        self.assertTrue(self.__check(filter_, rows, 1))
+
+    def test_prepared_rules(self):
+        filter_ = GenericFilter()
+        filter_.add_rule(IsAncestorOf(['I0044', 1]))
+        self.assertEqual(len(self.__check(filter_)), 7)
+
+    def test_custom_filters(self):
+        base = GenericFilter()
+        base.set_name('Parallel')
+        base.add_rule(HasUnknownGender([]))
+        if not filters.CustomFilters:
+            reload_custom_filters()
+        filters.CustomFilters.get_filters_dict('Person')['Parallel'] = base
+        filter_ = GenericFilter()
+        filter_.add_rule(MatchesFilter(['Parallel']))
+        self.assertTrue(self.__check(filter_))
+
+    def test_family_filter(self):
+        filter_ = GenericFilterFactory('Family')()
+        filter_.add_rule(FatherHasNameOf(['', 'Garner', '', '', '', '', '',
+                                          '', '', '', '']))
+        self.assertTrue(self.__check(filter_))
+
+    def test_apply(self):
+        filter_ = GenericFilter()
+        filter_.add_rule(HasIdOf(['I0044']))
+        self.assertEqual(len(filter_.apply(self.db)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,6 +32,8 @@ and a register for the data of all plugins .
 import os
 import sys
 import re
+import ast
+import pickle
 import traceback
 
 #-------------------------------------------------------------------------
@@ -40,7 +42,7 @@ import traceback
 #
 #-------------------------------------------------------------------------
 from ...version import VERSION as GRAMPSVERSION, VERSION_TUPLE
-from ..const import IMAGE_DIR
+from ..const import IMAGE_DIR, VERSION_DIR
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 import logging
@@ -1111,6 +1113,151 @@ def make_environment(**kwargs):
     env.update(kwargs)
     return env
 
+#-------------------------------------------------------------------------
+#
+# RegistrationCache
+#
+#-------------------------------------------------------------------------
+CACHE_FILE = os.path.join(VERSION_DIR, "plugin_registration.cache")
+CACHE_VERSION = 1
+
+# Statements which can make the registration depend on more than the file
+_DYNAMIC_NODES = tuple(getattr(ast, name) for name in (
+    'If', 'IfExp', 'Try', 'TryStar', 'While', 'With', 'Match', 'Import',
+    'FunctionDef', 'AsyncFunctionDef', 'ClassDef', 'Lambda', 'Global')
+                       if hasattr(ast, name))
+_STATIC_MODULES = ('gramps.gen.plug._pluginreg', 'gramps.gen.const')
+
+def is_static_registration(stream):
+    """
+    Return True if the registration code of a gpr.py file only registers
+    plugins, so that it gives the same :class:`PluginData` objects each time
+    it is run with the same Gramps version and language.
+
+    Files which test for optional modules, read the configuration or use
+    the uistate are not static.
+    """
+    try:
+        tree = ast.parse(stream)
+    except SyntaxError:
+        return False
+    for node in ast.walk(tree):
+        if isinstance(node, _DYNAMIC_NODES):
+            return False
+        if isinstance(node, ast.ImportFrom) and \
+                node.module not in _STATIC_MODULES:
+            return False
+        if isinstance(node, ast.Name) and node.id == 'uistate':
+            return False
+    return True
+
+class RegistrationCache:
+    """
+    Keeps the :class:`PluginData` objects registered by each gpr.py file,
+    so that the registration code is only run again when the file changed.
+
+    The cache is stored in a file, and is only valid for the Gramps version
+    and the languages it was written with.  The entries are keyed by the path
+    of the gpr.py file, with its modification time and size.  Files which do
+    not have a static registration are always run, see
+    :func:`is_static_registration`.
+    """
+    def __init__(self, filename=CACHE_FILE):
+        self.filename = filename
+        self.__entries = None
+        self.__changed = False
+
+    def __key(self):
+        return (CACHE_VERSION, GRAMPSVERSION, glocale.lang,
+                tuple(glocale.language))
+
+    def __load(self):
+        self.__entries = {}
+        if self.filename is None:
+            return
+        try:
+            with open(self.filename, 'rb') as cache:
+                key, entries = pickle.load(cache)
+        except FileNotFoundError:
+            return
+        except Exception as msg:
+            LOG.warning("Ignoring the plugin registration cache %s: %s",
+                        self.filename, msg)
+            return
+        if key == self.__key():
+            self.__entries = entries
+
+    @staticmethod
+    def __stat(filename):
+        stat = os.stat(filename)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, filename):
+        """
+        Return the :class:`PluginData` objects registered by a gpr.py file,
+        or None if its registration code must be run.
+        """
+        if self.__entries is None:
+            self.__load()
+        entry = self.__entries.get(filename)
+        if entry is None:
+            return None
+        try:
+            stat = self.__stat(filename)
+        except OSError:
+            return None
+        if entry[0] != stat or entry[1] is None:
+            return None
+        try:
+            return pickle.loads(entry[1])
+        except Exception:
+            return None
+
+    def add(self, filename, stream, plugins):
+        """
+        Add the :class:`PluginData` objects just registered by a gpr.py file.
+
+        :param filename: the full path of the gpr.py file
+        :param stream: the registration code which was run
+        :param plugins: the :class:`PluginData` objects it registered
+        """
+        if self.__entries is None:
+            self.__load()
+        try:
+            stat = self.__stat(filename)
+        except OSError:
+            return
+        data = None
+        if is_static_registration(stream):
+            try:
+                data = pickle.dumps(plugins, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                pass
+        self.__entries[filename] = (stat, data)
+        self.__changed = True
+
+    def save(self):
+        """
+        Write the cache, if it changed and the user directory exists.  The
+        entries of files which no longer exist are removed.
+        """
+        if (not self.__changed or self.filename is None or
+                not os.path.isdir(os.path.dirname(self.filename))):
+            return
+        entries = {filename: entry
+                   for filename, entry in self.__entries.items()
+                   if os.path.isfile(filename)}
+        try:
+            with open(self.filename, 'wb') as cache:
+                pickle.dump((self.__key(), entries), cache,
+                            pickle.HIGHEST_PROTOCOL)
+        except OSError as msg:
+            LOG.warning("Could not write the plugin registration cache "
+                        "%s: %s", self.filename, msg)
+            self.filename = None
+            return
+        self.__changed = False
+
 #-------------------------------------------------------------------------
 #
 # PluginRegister
@@ -1122,6 +1269,9 @@ class PluginRegister:
 
     .. attribute : stable_only
         Bool, include stable plugins only or not. Default True
+    .. attribute : cache
+        :class:`RegistrationCache` of the registered plugins, or None to
+        always run the registration code
     """
     __instance = None
 
@@ -1143,6 +1293,7 @@ class PluginRegister:
             self.stable_only = False
         self.__plugindata = []
         self.__id_to_pdata = {}
+        self.cache = RegistrationCache()
 
     def add_plugindata(self, plugindata):
         """ This is used to add an entry to the registration list.  The way it
@@ -1171,29 +1322,23 @@ class PluginRegister:
                 continue
             lenpd = len(self.__plugindata)
             full_filename = os.path.join(dir, filename)
+            plugins = None
+            if self.cache is not None:
+                plugins = self.cache.get(full_filename)
+            if plugins is None:
+                stream = self.__read_registration(full_filename)
+                if stream is None:
+                    continue
+                local_gettext = self.__get_gettext(full_filename)
             try:
-                with open(full_filename, "r", encoding='utf-8') as fd:
-                    stream = fd.read()
-            except Exception as msg:
-                print(_('ERROR: Failed reading plugin registration %(filename)s') % \
-                            {'filename' : filename})
-                print(msg)
-                continue
-            if os.path.exists(os.path.join(os.path.dirname(full_filename),
-                                           'locale')):
-                try:
-                    local_gettext = glocale.get_addon_translator(full_filename).gettext
-                except ValueError:
-                    print(_('WARNING: Plugin %(plugin_name)s has no translation'
-                            ' for any of your configured languages, using US'
-                            ' English instead') %
-                          {'plugin_name' : filename.split('.')[0] })
-                    local_gettext = glocale.translation.gettext
-            else:
-                local_gettext = glocale.translation.gettext
-            try:
-                exec (compile(stream, filename, 'exec'),
-                      make_environment(_=local_gettext), {'uistate': uistate})
+                if plugins is None:
+                    exec (compile(stream, filename, 'exec'),
+                          make_environment(_=local_gettext), {'uistate': uistate})
+                    if self.cache is not None:
+                        self.cache.add(full_filename, stream,
+                                       self.__plugindata[lenpd:])
+                else:
+                    self.__plugindata.extend(plugins)
                 for pdata in self.__plugindata[lenpd:]:
                     # should not be duplicate IDs in different plugins
                     assert pdata.id not in self.__id_to_pdata
@@ -1265,6 +1410,47 @@ class PluginRegister:
                 del self.__id_to_pdata[self.__plugindata[ind].id]
                 del self.__plugindata[ind]
 
+    @staticmethod
+    def __read_registration(full_filename):
+        """
+        Return the registration code of a gpr.py file, or None if it cannot
+        be read.
+        """
+        try:
+            with open(full_filename, "r", encoding='utf-8') as fd:
+                return fd.read()
+        except Exception as msg:
+            print(_('ERROR: Failed reading plugin registration %(filename)s') % \
+                        {'filename' : os.path.basename(full_filename)})
+            print(msg)
+            return None
+
+    @staticmethod
+    def __get_gettext(full_filename):
+        """
+        Return the gettext function for a gpr.py file, which uses the
+        translations of the plugin if it has any.
+        """
+        if os.path.exists(os.path.join(os.path.dirname(full_filename),
+                                       'locale')):
+            try:
+                return glocale.get_addon_translator(full_filename).gettext
+            except ValueError:
+                print(_('WARNING: Plugin %(plugin_name)s has no translation'
+                        ' for any of your configured languages, using US'
+                        ' English instead') %
+                      {'plugin_name' :
+                       os.path.basename(full_filename).split('.')[0] })
+        return glocale.translation.gettext
+
+    def save_cache(self):
+        """
+        Write the cache of the registered plugins, see
+        :class:`RegistrationCache`.
+        """
+        if self.cache is not None:
+            self.cache.save()
+
     def get_plugin(self, id):
         """
         Return the :class:`PluginData` for the plugin with id
@@ -0,0 +1,73 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the CLI startup time, with and without the plugin registration
+cache.
+
+Run with::
+
+    python3 -m unittest gramps.gen.plug.test.pluginreg_perf
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+from gramps.gen.const import ROOT_DIR
+
+GRAMPS = os.path.join(ROOT_DIR, os.pardir, "Gramps.py")
+CACHE = os.path.join("gramps", "gramps51", "plugin_registration.cache")
+ROUNDS = 5
+
+class StartupPerfTest(unittest.TestCase):
+
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.env = dict(os.environ, GRAMPSHOME=self.home)
+
+    def tearDown(self):
+        shutil.rmtree(self.home)
+
+    def __start(self):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, GRAMPS, "-y", "-L"], env=self.env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        return time.perf_counter() - start
+
+    def test_startup(self):
+        self.__start()
+        cache = os.path.join(self.home, CACHE)
+        self.assertTrue(os.path.isfile(cache))
+        cold = warm = 0
+        for dummy in range(ROUNDS):
+            os.remove(cache)
+            cold += self.__start()
+            warm += self.__start()
+        print("\nCLI startup: %.3f s without the cache, %.3f s with the cache"
+              % (cold / ROUNDS, warm / ROUNDS))
+
+if __name__ == "__main__":
+    unittest.main()
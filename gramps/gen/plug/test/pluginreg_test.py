@@ -0,0 +1,120 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the plugin registration cache """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from .._pluginreg import (PluginData, RegistrationCache, GENERAL, STABLE,
+                          is_static_registration)
+
+STATIC = '''
+from gramps.gen.plug._pluginreg import register, STABLE, GENERAL
+register(GENERAL,
+         id = 'test',
+         name = _("Test"),
+         version = '1.0',
+         status = STABLE,
+         fname = 'test.py',
+         )
+'''
+
+class RegistrationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.gpr = os.path.join(self.tmpdir, 'test.gpr.py')
+        self.write_gpr(STATIC)
+        self.filename = os.path.join(self.tmpdir, 'registration.cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_gpr(self, stream):
+        with open(self.gpr, 'w') as gpr:
+            gpr.write(stream)
+
+    @staticmethod
+    def make_plugin():
+        pdata = PluginData()
+        pdata.ptype = GENERAL
+        pdata.id = 'test'
+        pdata.status = STABLE
+        pdata.fname = 'test.py'
+        pdata.data = ['a', 'b']
+        return pdata
+
+    def test_static(self):
+        self.assertTrue(is_static_registration(STATIC))
+        self.assertTrue(is_static_registration(
+            STATIC + 'for ref in ["a", "b"]:\n    register(GENERAL, id=ref)\n'))
+        for code in ('if uistate:\n    pass\n',
+                     'x = uistate\n',
+                     'from gi import Repository\n',
+                     'import gi\n',
+                     'try:\n    pass\nexcept:\n    pass\n',
+                     'from gramps.gen.config import config\n',
+                     'x = 1 if True else 2\n',
+                     'def f():\n    pass\n',
+                     'x = (\n'):
+            self.assertFalse(is_static_registration(STATIC + code), code)
+
+    def test_cache(self):
+        cache = RegistrationCache(self.filename)
+        self.assertIsNone(cache.get(self.gpr))
+        cache.add(self.gpr, STATIC, [self.make_plugin()])
+        cache.save()
+
+        cache = RegistrationCache(self.filename)
+        plugins = cache.get(self.gpr)
+        self.assertEqual(len(plugins), 1)
+        self.assertEqual(plugins[0].__dict__, self.make_plugin().__dict__)
+
+        # the file changed
+        self.write_gpr(STATIC + '\n')
+        self.assertIsNone(cache.get(self.gpr))
+
+    def test_dynamic(self):
+        cache = RegistrationCache(self.filename)
+        cache.add(self.gpr, STATIC + 'if uistate:\n    pass\n',
+                  [self.make_plugin()])
+        self.assertIsNone(cache.get(self.gpr))
+
+    def test_removed_file(self):
+        cache = RegistrationCache(self.filename)
+        cache.add(self.gpr, STATIC, [self.make_plugin()])
+        os.remove(self.gpr)
+        cache.save()
+        self.write_gpr(STATIC)
+        self.assertIsNone(RegistrationCache(self.filename).get(self.gpr))
+
+    def test_invalid_cache(self):
+        with open(self.filename, 'wb') as cache:
+            cache.write(b'invalid')
+        cache = RegistrationCache(self.filename)
+        with self.assertLogs('._manager', 'WARNING'):
+            self.assertIsNone(cache.get(self.gpr))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,7 +31,7 @@ Proxy class for the Gramps databases. Filter out all living people.
 from .proxybase import ProxyDbBase
 from ..lib import (Date, Person, Name, Surname, NameOriginType, Family, Source,
                    Citation, Event, Media, Place, Repository, Note, Tag)
-from ..utils.alive import probably_alive
+from ..utils.alive import probably_alive, CachedProbablyAlive
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -91,6 +91,7 @@ class LivingProxyDb(ProxyDbBase):
         else:
             self.current_date = None
         self.years_after_death = years_after_death
+        self.__alive = CachedProbablyAlive(dbase)
         self._ = llocale.translation.gettext
         self._p_f_n = self._(config.get('preferences.private-given-text'))
         self._p_s_n = self._(config.get('preferences.private-surname-text'))
@@ -243,7 +244,8 @@ class LivingProxyDb(ProxyDbBase):
         return probably_alive( unfil_person,
                                self.db,
                                self.current_date,
-                               self.years_after_death )
+                               self.years_after_death,
+                               cache=self.__alive )
 
     def __remove_living_from_family(self, family):
         """
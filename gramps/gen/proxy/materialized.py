@@ -0,0 +1,329 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Proxy class for the Gramps databases. Resolves a chain of proxies once.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Gramps libraries
+#
+#-------------------------------------------------------------------------
+from ..db.dbconst import (PERSON_KEY, FAMILY_KEY, SOURCE_KEY, EVENT_KEY,
+                          MEDIA_KEY, PLACE_KEY, REPOSITORY_KEY, NOTE_KEY,
+                          TAG_KEY, CITATION_KEY, KEY_TO_NAME_MAP)
+from ..lib import (Citation, Event, Family, Media, Note, Person, Place,
+                   Repository, Source, Tag)
+from .proxybase import ProxyDbBase
+
+#-------------------------------------------------------------------------
+#
+# MaterializedProxyDb
+#
+#-------------------------------------------------------------------------
+class MaterializedProxyDb(ProxyDbBase):
+    """
+    A proxy to a Gramps database, usually a chain of other proxies, which
+    resolves the chain once for all the objects.
+
+    Each proxy of a chain decides again whether an object is included, and
+    restricts it again, every time the object is read.  This proxy reads
+    every object the chain includes once, and keeps the set of included
+    handles and the restricted raw data of each table.  The objects are
+    then built from that snapshot, so that a proxy chain costs no more
+    than one pass over the database.
+
+    The snapshot is not updated, so this proxy should only be used for a
+    single read-only task, like an export.
+    """
+
+    def __init__(self, db):
+        """
+        Create a new MaterializedProxyDb instance, and read the objects
+        included by db.
+        """
+        ProxyDbBase.__init__(self, db)
+        self.raw_data = {}   # key -> {handle: restricted raw data}
+        self.gramps_ids = {} # key -> {gramps_id: handle}
+        for key, name in KEY_TO_NAME_MAP.items():
+            get_object = getattr(db, 'get_%s_from_handle' % name)
+            table = {}
+            gramps_ids = {}
+            for handle in getattr(db, 'iter_%s_handles' % name)():
+                obj = get_object(handle)
+                if obj is None:
+                    continue
+                table[handle] = obj.serialize()
+                if key != TAG_KEY:
+                    gramps_ids[obj.gramps_id] = handle
+            self.raw_data[key] = table
+            self.gramps_ids[key] = gramps_ids
+
+    def _get_from_handle(self, obj_key, obj_class, handle):
+        data = self.raw_data[obj_key].get(handle)
+        if data is None:
+            # Not included, but a proxy may still give a restricted object
+            return getattr(self.db, 'get_%s_from_handle' %
+                           KEY_TO_NAME_MAP[obj_key])(handle)
+        return obj_class.create(data)
+
+    def _get_from_gramps_id(self, obj_key, obj_class, gramps_id):
+        handle = self.gramps_ids[obj_key].get(gramps_id)
+        if handle is None:
+            return getattr(self.db, 'get_%s_from_gramps_id' %
+                           KEY_TO_NAME_MAP[obj_key])(gramps_id)
+        return obj_class.create(self.raw_data[obj_key][handle])
+
+    def _get_raw_data(self, obj_key, obj_class, handle):
+        data = self.raw_data[obj_key].get(handle)
+        if data is None:
+            obj = self._get_from_handle(obj_key, obj_class, handle)
+            if obj is not None:
+                data = obj.serialize()
+        return data
+
+    def _iter_objects(self, obj_key, obj_class):
+        return (obj_class.create(data)
+                for data in self.raw_data[obj_key].values())
+
+    # Predicates of the included objects
+
+    def include_person(self, handle):
+        return handle in self.raw_data[PERSON_KEY]
+
+    def include_family(self, handle):
+        return handle in self.raw_data[FAMILY_KEY]
+
+    def include_event(self, handle):
+        return handle in self.raw_data[EVENT_KEY]
+
+    def include_source(self, handle):
+        return handle in self.raw_data[SOURCE_KEY]
+
+    def include_citation(self, handle):
+        return handle in self.raw_data[CITATION_KEY]
+
+    def include_place(self, handle):
+        return handle in self.raw_data[PLACE_KEY]
+
+    def include_media(self, handle):
+        return handle in self.raw_data[MEDIA_KEY]
+
+    def include_repository(self, handle):
+        return handle in self.raw_data[REPOSITORY_KEY]
+
+    def include_note(self, handle):
+        return handle in self.raw_data[NOTE_KEY]
+
+    def include_tag(self, handle):
+        return handle in self.raw_data[TAG_KEY]
+
+    has_person_handle = include_person
+    has_family_handle = include_family
+    has_event_handle = include_event
+    has_source_handle = include_source
+    has_citation_handle = include_citation
+    has_place_handle = include_place
+    has_media_handle = include_media
+    has_repository_handle = include_repository
+    has_note_handle = include_note
+    has_tag_handle = include_tag
+
+    # Handles
+
+    def iter_person_handles(self):
+        return iter(self.raw_data[PERSON_KEY])
+
+    def iter_family_handles(self):
+        return iter(self.raw_data[FAMILY_KEY])
+
+    def iter_event_handles(self):
+        return iter(self.raw_data[EVENT_KEY])
+
+    def iter_source_handles(self):
+        return iter(self.raw_data[SOURCE_KEY])
+
+    def iter_citation_handles(self):
+        return iter(self.raw_data[CITATION_KEY])
+
+    def iter_place_handles(self):
+        return iter(self.raw_data[PLACE_KEY])
+
+    def iter_media_handles(self):
+        return iter(self.raw_data[MEDIA_KEY])
+
+    def iter_repository_handles(self):
+        return iter(self.raw_data[REPOSITORY_KEY])
+
+    def iter_note_handles(self):
+        return iter(self.raw_data[NOTE_KEY])
+
+    def iter_tag_handles(self):
+        return iter(self.raw_data[TAG_KEY])
+
+    def get_number_of_people(self):
+        return len(self.raw_data[PERSON_KEY])
+
+    def get_number_of_families(self):
+        return len(self.raw_data[FAMILY_KEY])
+
+    def get_number_of_events(self):
+        return len(self.raw_data[EVENT_KEY])
+
+    def get_number_of_sources(self):
+        return len(self.raw_data[SOURCE_KEY])
+
+    def get_number_of_citations(self):
+        return len(self.raw_data[CITATION_KEY])
+
+    def get_number_of_places(self):
+        return len(self.raw_data[PLACE_KEY])
+
+    def get_number_of_media(self):
+        return len(self.raw_data[MEDIA_KEY])
+
+    def get_number_of_repositories(self):
+        return len(self.raw_data[REPOSITORY_KEY])
+
+    def get_number_of_notes(self):
+        return len(self.raw_data[NOTE_KEY])
+
+    def get_number_of_tags(self):
+        return len(self.raw_data[TAG_KEY])
+
+    # Objects
+
+    def get_person_from_handle(self, handle):
+        return self._get_from_handle(PERSON_KEY, Person, handle)
+
+    def get_family_from_handle(self, handle):
+        return self._get_from_handle(FAMILY_KEY, Family, handle)
+
+    def get_event_from_handle(self, handle):
+        return self._get_from_handle(EVENT_KEY, Event, handle)
+
+    def get_source_from_handle(self, handle):
+        return self._get_from_handle(SOURCE_KEY, Source, handle)
+
+    def get_citation_from_handle(self, handle):
+        return self._get_from_handle(CITATION_KEY, Citation, handle)
+
+    def get_place_from_handle(self, handle):
+        return self._get_from_handle(PLACE_KEY, Place, handle)
+
+    def get_media_from_handle(self, handle):
+        return self._get_from_handle(MEDIA_KEY, Media, handle)
+
+    def get_repository_from_handle(self, handle):
+        return self._get_from_handle(REPOSITORY_KEY, Repository, handle)
+
+    def get_note_from_handle(self, handle):
+        return self._get_from_handle(NOTE_KEY, Note, handle)
+
+    def get_tag_from_handle(self, handle):
+        return self._get_from_handle(TAG_KEY, Tag, handle)
+
+    def get_person_from_gramps_id(self, val):
+        return self._get_from_gramps_id(PERSON_KEY, Person, val)
+
+    def get_family_from_gramps_id(self, val):
+        return self._get_from_gramps_id(FAMILY_KEY, Family, val)
+
+    def get_event_from_gramps_id(self, val):
+        return self._get_from_gramps_id(EVENT_KEY, Event, val)
+
+    def get_source_from_gramps_id(self, val):
+        return self._get_from_gramps_id(SOURCE_KEY, Source, val)
+
+    def get_citation_from_gramps_id(self, val):
+        return self._get_from_gramps_id(CITATION_KEY, Citation, val)
+
+    def get_place_from_gramps_id(self, val):
+        return self._get_from_gramps_id(PLACE_KEY, Place, val)
+
+    def get_media_from_gramps_id(self, val):
+        return self._get_from_gramps_id(MEDIA_KEY, Media, val)
+
+    def get_repository_from_gramps_id(self, val):
+        return self._get_from_gramps_id(REPOSITORY_KEY, Repository, val)
+
+    def get_note_from_gramps_id(self, val):
+        return self._get_from_gramps_id(NOTE_KEY, Note, val)
+
+    def get_raw_person_data(self, handle):
+        return self._get_raw_data(PERSON_KEY, Person, handle)
+
+    def get_raw_family_data(self, handle):
+        return self._get_raw_data(FAMILY_KEY, Family, handle)
+
+    def get_raw_event_data(self, handle):
+        return self._get_raw_data(EVENT_KEY, Event, handle)
+
+    def get_raw_source_data(self, handle):
+        return self._get_raw_data(SOURCE_KEY, Source, handle)
+
+    def get_raw_citation_data(self, handle):
+        return self._get_raw_data(CITATION_KEY, Citation, handle)
+
+    def get_raw_place_data(self, handle):
+        return self._get_raw_data(PLACE_KEY, Place, handle)
+
+    def get_raw_media_data(self, handle):
+        return self._get_raw_data(MEDIA_KEY, Media, handle)
+
+    def get_raw_repository_data(self, handle):
+        return self._get_raw_data(REPOSITORY_KEY, Repository, handle)
+
+    def get_raw_note_data(self, handle):
+        return self._get_raw_data(NOTE_KEY, Note, handle)
+
+    def get_raw_tag_data(self, handle):
+        return self._get_raw_data(TAG_KEY, Tag, handle)
+
+    def iter_people(self):
+        return self._iter_objects(PERSON_KEY, Person)
+
+    def iter_families(self):
+        return self._iter_objects(FAMILY_KEY, Family)
+
+    def iter_events(self):
+        return self._iter_objects(EVENT_KEY, Event)
+
+    def iter_sources(self):
+        return self._iter_objects(SOURCE_KEY, Source)
+
+    def iter_citations(self):
+        return self._iter_objects(CITATION_KEY, Citation)
+
+    def iter_places(self):
+        return self._iter_objects(PLACE_KEY, Place)
+
+    def iter_media(self):
+        return self._iter_objects(MEDIA_KEY, Media)
+
+    def iter_repositories(self):
+        return self._iter_objects(REPOSITORY_KEY, Repository)
+
+    def iter_notes(self):
+        return self._iter_objects(NOTE_KEY, Note)
+
+    def iter_tags(self):
+        return self._iter_objects(TAG_KEY, Tag)
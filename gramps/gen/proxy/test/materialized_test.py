@@ -0,0 +1,98 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the materialized proxy chain """
+
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db.dbconst import KEY_TO_NAME_MAP
+from ...db.utils import import_as_dict
+from ...user import User
+from .. import PrivateProxyDb, LivingProxyDb, MaterializedProxyDb
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class MaterializedProxyTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+
+    def chain(self, mode=LivingProxyDb.MODE_INCLUDE_LAST_NAME_ONLY):
+        return LivingProxyDb(PrivateProxyDb(self.db), mode, current_year=1960)
+
+    def test_tables(self):
+        chain = self.chain()
+        snapshot = MaterializedProxyDb(chain)
+        for name in KEY_TO_NAME_MAP.values():
+            handles = list(chain.method('iter_%s_handles', name)())
+            self.assertEqual(list(snapshot.method('iter_%s_handles', name)()),
+                             handles)
+            get_chain = chain.method('get_%s_from_handle', name)
+            get_snapshot = snapshot.method('get_%s_from_handle', name)
+            for handle in handles:
+                self.assertEqual(get_snapshot(handle).serialize(),
+                                 get_chain(handle).serialize())
+        self.assertEqual(snapshot.get_person_handles(sort_handles=True),
+                         chain.get_person_handles(sort_handles=True))
+        self.assertEqual(snapshot.get_number_of_families(),
+                         chain.get_number_of_families())
+        self.assertEqual(snapshot.get_number_of_notes(),
+                         chain.get_number_of_notes())
+
+    def test_gramps_id(self):
+        chain = self.chain()
+        snapshot = MaterializedProxyDb(chain)
+        for gramps_id in ("I0044", "F0017", "E0001", "S0001"):
+            self.assertEqual(
+                snapshot.get_person_from_gramps_id(gramps_id) is None,
+                chain.get_person_from_gramps_id(gramps_id) is None)
+        person = snapshot.get_person_from_gramps_id("I0044")
+        self.assertEqual(person.serialize(),
+                         chain.get_person_from_gramps_id("I0044").serialize())
+
+    def test_excluded(self):
+        chain = self.chain(LivingProxyDb.MODE_EXCLUDE_ALL)
+        snapshot = MaterializedProxyDb(chain)
+        excluded = (set(self.db.get_person_handles()) -
+                    set(snapshot.iter_person_handles()))
+        self.assertTrue(excluded)
+        for handle in excluded:
+            self.assertFalse(snapshot.has_person_handle(handle))
+            self.assertIsNone(snapshot.get_person_from_handle(handle))
+
+    def test_copies(self):
+        snapshot = MaterializedProxyDb(self.chain())
+        handle = next(snapshot.iter_person_handles())
+        person = snapshot.get_person_from_handle(handle)
+        person.set_gramps_id("changed")
+        self.assertNotEqual(
+            snapshot.get_person_from_handle(handle).get_gramps_id(), "changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -837,6 +837,8 @@ class RelationshipCalculator:
         self.stored_map = None
         self.map_handle = None
         self.map_meta = None
+        self.__path_memo = None
+        self.__path_memo_key = None
         self.__db_connected = False
         self.depth = 15
         try:
@@ -1230,6 +1232,12 @@ class RelationshipCalculator:
         :param only_birth: if True only parents with birth relation are
                            considered
         :type only_birth:  bool
+
+        If the database keeps an ancestry index, only the parents on the
+        lines to the common ancestors of the two people are searched.  The
+        message about the maximum number of generations is then only given
+        when such a line is longer than that, not for the other branches
+        of the tree.
         """
         #data storage to communicate with recursive functions
         self.__max_depth_reached = False
@@ -1249,6 +1257,17 @@ class RelationshipCalculator:
         second_map = {}
         rank = 9999999
 
+        # Within get_relationships_from the paths of the other person are
+        # shared with the people looked up before
+        use_memo = (self.__path_memo is not None and self.__path_memo_key ==
+                    (orig_person.handle, all_families, only_birth))
+        # The ancestry index of the database tells which parents lead to a
+        # common ancestor, the search does not look up the others.
+        lines = None
+        if not use_memo:
+            lines = db.get_ancestry_lines(orig_person.handle,
+                                          other_person.handle)
+
         try:
             if (self.storemap and self.stored_map is not None
                     and self.map_handle == orig_person.handle
@@ -1260,14 +1279,24 @@ class RelationshipCalculator:
                  self.__crosslinks, self.__msg = self.map_meta
                 self.__msg = list(self.__msg)
             else:
-                self.__apply_filter(db, orig_person, '', [], first_map)
+                # A stored map is reused for other people, so it must be
+                # complete
+                self.__apply_filter(db, orig_person, '', [], first_map,
+                                    lines=None if self.storemap else lines)
+                if use_memo:
+                    self.__path_memo = {}
                 self.map_meta = (self.__max_depth_reached,
                                  self.__loop_detected,
                                  self.__all_families,
                                  self.__all_dist, self.__only_birth,
                                  self.__crosslinks, list(self.__msg))
-            self.__apply_filter(db, other_person, '', [], second_map,
-                                stoprecursemap=first_map)
+            if use_memo:
+                second_map = self.__get_second_map(db, other_person,
+                                                   first_map)
+            if second_map is None or not use_memo:
+                second_map = {}
+                self.__apply_filter(db, other_person, '', [], second_map,
+                                    stoprecursemap=first_map, lines=lines)
         except RuntimeError:
             return (-1, None, -1, [], -1, []), \
                             [_("Relationship loop detected")] + self.__msg
@@ -1353,7 +1382,7 @@ class RelationshipCalculator:
             return [(-1, None, '', [], '', [])], self.__msg
 
     def __apply_filter(self, db, person, rel_str, rel_fam, pmap,
-                       depth=1, stoprecursemap=None):
+                       depth=1, stoprecursemap=None, lines=None):
         """
         Typically this method is called recursively in two ways:
         First method is stoprecursemap= None
@@ -1366,6 +1395,8 @@ class RelationshipCalculator:
         of first contains loops, and parents
         will be looked up anyway an stored if common. At end the doubles
         are filtered out
+
+        If lines is given, only the parents in it are looked up.
         """
         if person is None or not person.handle:
             return
@@ -1418,58 +1449,11 @@ class RelationshipCalculator:
             #don't continue search, great speedup!
             return
 
-        family_handles = []
-        main = person.get_main_parents_family_handle()
-        if main:
-            family_handles = [main]
-        if self.__all_families:
-            family_handles = person.get_parent_family_handle_list()
-
         try:
-            parentstodo = {}
-            fam = 0
-            for family_handle in family_handles:
-                rel_fam_new = rel_fam + [fam]
-                family = db.get_family_from_handle(family_handle)
-                if not family:
-                    continue
-                #obtain childref for this person
-                childrel = [(ref.get_mother_relation(),
-                             ref.get_father_relation())
-                            for ref in family.get_child_ref_list()
-                            if ref.ref == person.handle]
-                fhandle = family.father_handle
-                mhandle = family.mother_handle
-                for data in [(fhandle, self.REL_FATHER,
-                              self.REL_FATHER_NOTBIRTH, childrel[0][1]),
-                             (mhandle, self.REL_MOTHER,
-                              self.REL_MOTHER_NOTBIRTH, childrel[0][0])]:
-                    if data[0] and data[0] not in parentstodo:
-                        persontodo = db.get_person_from_handle(data[0])
-                        if data[3] == ChildRefType.BIRTH:
-                            addstr = data[1]
-                        elif not self.__only_birth:
-                            addstr = data[2]
-                        else:
-                            addstr = ''
-                        if addstr:
-                            parentstodo[data[0]] = (persontodo,
-                                                    rel_str + addstr,
-                                                    rel_fam_new)
-                    elif data[0] and data[0] in parentstodo:
-                        #this person is already scheduled to research
-                        #update family list
-                        famlist = parentstodo[data[0]][2]
-                        if not isinstance(famlist[-1], list) and \
-                                fam != famlist[-1]:
-                            famlist = famlist[:-1] + [[famlist[-1]]]
-                        if isinstance(famlist[-1], list) and \
-                                fam not in famlist[-1]:
-                            famlist = famlist[:-1] + [famlist[-1] + [fam]]
-                            parentstodo[data[0]] = (parentstodo[data[0]][0],
-                                                    parentstodo[data[0]][1],
-                                                    famlist)
-                if not fhandle and not mhandle and stoprecursemap is None:
+            parentstodo, parentless = self.__get_parents_todo(db, person,
+                                                              rel_str, rel_fam)
+            if stoprecursemap is None:
+                for family, rel_fam_new in parentless:
                     #family without parents, add brothers for orig person
                     #other person has recusemap, and will stop when seeing
                     #the brother.
@@ -1483,17 +1467,141 @@ class RelationshipCalculator:
                             #person is already a grandparent in another branch
                         else:
                             pmap[chandle] = [[rel_str+addstr], [rel_fam_new]]
-                fam += 1
 
             for handle, data in parentstodo.items():
+                if lines is not None and handle not in lines:
+                    continue
                 self.__apply_filter(db, data[0],
                                     data[1], data[2],
-                                    pmap, depth, stoprecursemap)
+                                    pmap, depth, stoprecursemap, lines)
         except:
             import traceback
             traceback.print_exc()
             return
 
+    def __get_second_map(self, db, person, stoprecursemap):
+        """
+        Return the map of person to the common ancestors in stoprecursemap,
+        as __apply_filter builds it, from the memoised paths.
+
+        None is returned if the map contains a loop, the paths then depend
+        on the order in which they are found.
+        """
+        pmap = {}
+        for handle, rel_str, rel_fam in self.__get_paths(db, person, 1,
+                                                         stoprecursemap):
+            if handle in pmap:
+                pmap[handle][0].append(rel_str)
+                pmap[handle][1].append(rel_fam)
+            else:
+                pmap[handle] = [[rel_str], [rel_fam]]
+        for rel_strs, dummy in pmap.values():
+            for rel1 in rel_strs:
+                for rel2 in rel_strs:
+                    if len(rel1) < len(rel2) and rel1 == rel2[:len(rel1)]:
+                        return None
+        return pmap
+
+    def __get_paths(self, db, person, depth, stoprecursemap):
+        """
+        Return the paths from person, looked up at depth, to the common
+        ancestors in stoprecursemap as a list of
+        (handle, rel_str, rel_fam) tuples.
+
+        The paths only depend on the person and the depth, so they are
+        memoised and the ancestors shared by several people are looked up
+        once.
+        """
+        if person is None or not person.handle:
+            return []
+        key = (person.handle, depth)
+        if key in self.__path_memo:
+            paths, max_depth_reached = self.__path_memo[key]
+            self.__max_depth_reached |= max_depth_reached
+            return paths
+
+        max_depth_reached = self.__max_depth_reached
+        self.__max_depth_reached = False
+        paths = []
+        if depth > self.__max_depth:
+            self.__max_depth_reached = True
+        else:
+            commonancestor = person.handle in stoprecursemap
+            if commonancestor:
+                paths.append((person.handle, '', []))
+            if not commonancestor or self.__crosslinks:
+                parentstodo = self.__get_parents_todo(db, person, '', [])[0]
+                for parent, addstr, fam in parentstodo.values():
+                    for handle, rel_str, rel_fam in self.__get_paths(
+                            db, parent, depth + 1, stoprecursemap):
+                        paths.append((handle, addstr + rel_str,
+                                      fam + rel_fam))
+        self.__path_memo[key] = (paths, self.__max_depth_reached)
+        self.__max_depth_reached |= max_depth_reached
+        return paths
+
+    def __get_parents_todo(self, db, person, rel_str, rel_fam):
+        """
+        Return the parents of person to be looked up, as a dictionary of
+        parent handle to (parent, rel_str, rel_fam), and the families of
+        person without parents as a list of (family, rel_fam).
+        """
+        family_handles = []
+        main = person.get_main_parents_family_handle()
+        if main:
+            family_handles = [main]
+        if self.__all_families:
+            family_handles = person.get_parent_family_handle_list()
+
+        parentstodo = {}
+        parentless = []
+        fam = 0
+        for family_handle in family_handles:
+            rel_fam_new = rel_fam + [fam]
+            family = db.get_family_from_handle(family_handle)
+            if not family:
+                continue
+            #obtain childref for this person
+            childrel = [(ref.get_mother_relation(),
+                         ref.get_father_relation())
+                        for ref in family.get_child_ref_list()
+                        if ref.ref == person.handle]
+            fhandle = family.father_handle
+            mhandle = family.mother_handle
+            for data in [(fhandle, self.REL_FATHER,
+                          self.REL_FATHER_NOTBIRTH, childrel[0][1]),
+                         (mhandle, self.REL_MOTHER,
+                          self.REL_MOTHER_NOTBIRTH, childrel[0][0])]:
+                if data[0] and data[0] not in parentstodo:
+                    persontodo = db.get_person_from_handle(data[0])
+                    if data[3] == ChildRefType.BIRTH:
+                        addstr = data[1]
+                    elif not self.__only_birth:
+                        addstr = data[2]
+                    else:
+                        addstr = ''
+                    if addstr:
+                        parentstodo[data[0]] = (persontodo,
+                                                rel_str + addstr,
+                                                rel_fam_new)
+                elif data[0] and data[0] in parentstodo:
+                    #this person is already scheduled to research
+                    #update family list
+                    famlist = parentstodo[data[0]][2]
+                    if not isinstance(famlist[-1], list) and \
+                            fam != famlist[-1]:
+                        famlist = famlist[:-1] + [[famlist[-1]]]
+                    if isinstance(famlist[-1], list) and \
+                            fam not in famlist[-1]:
+                        famlist = famlist[:-1] + [famlist[-1] + [fam]]
+                        parentstodo[data[0]] = (parentstodo[data[0]][0],
+                                                parentstodo[data[0]][1],
+                                                famlist)
+            if not fhandle and not mhandle:
+                parentless.append((family, rel_fam_new))
+            fam += 1
+        return parentstodo, parentless
+
     def collapse_relations(self, relations):
         """
         Internal method to condense the relationships as returned by
@@ -1790,6 +1898,43 @@ class RelationshipCalculator:
         else:
             return rel_str
 
+    def get_relationships_from(self, db, orig_person, handles=None,
+                               olocale=glocale):
+        """
+        Generate the most relevant relationship between orig_person and
+        each of the people with the given handles, as
+        (handle, relationship string) tuples in the order of handles. All
+        people of the database are used if handles is None.  The handles are
+        read one at a time, as the relationships are generated.
+
+        The strings are those of :meth:`get_one_relationship`, but the
+        ancestors of orig_person are looked up once, and the paths from
+        the other people to them are shared between people with common
+        ancestors.
+
+        :param olocale: allow selection of the relationship language
+        :type olocale: a GrampsLocale instance
+        """
+        if handles is None:
+            handles = db.iter_person_handles()
+        storemap = self.storemap
+        if not storemap:
+            self.storemap = True
+            self.dirtymap = True
+        self.__path_memo = {}
+        self.__path_memo_key = (orig_person.handle, True, False)
+        try:
+            for handle in handles:
+                other_person = db.get_person_from_handle(handle)
+                yield (handle, self.get_one_relationship(
+                    db, orig_person, other_person, olocale=olocale))
+        finally:
+            self.__path_memo = None
+            self.__path_memo_key = None
+            if not storemap:
+                self.storemap = False
+                self.stored_map = None
+
     def get_all_relationships(self, db, orig_person, other_person):
         """
         Return a tuple, of which the first entry is a list with all
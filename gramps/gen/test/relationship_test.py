@@ -0,0 +1,105 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the relationship calculator """
+
+import os
+import unittest
+
+from ..const import DATA_DIR
+from ..db.utils import import_as_dict
+from ..relationship import RelationshipCalculator
+from ..user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class AncestryIndexTest(unittest.TestCase):
+    """
+    The relationship calculator gives the same results with and without
+    the ancestry index of the database.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        home = cls.db.get_person_from_gramps_id('I0044')
+        people = [cls.db.get_person_from_handle(handle)
+                  for handle in sorted(cls.db.get_person_handles())]
+        cls.pairs = ([(home, person) for person in people[::10]] +
+                     list(zip(people[::23], people[7::23])))
+
+    def relationships(self, calc):
+        return ([calc.get_one_relationship(self.db, person1, person2)
+                 for person1, person2 in self.pairs],
+                [calc.get_relationship_distance_new(
+                    self.db, person1, person2, all_dist=True,
+                    all_families=True, only_birth=False)[0]
+                 for person1, person2 in self.pairs])
+
+    def test_same_relationships(self):
+        self.assertIsNotNone(self.db.get_ancestry_lines(*[
+            person.handle for person in self.pairs[0]]))
+        calc = RelationshipCalculator()
+        expected = None
+        try:
+            self.db.get_ancestry_lines = lambda handle1, handle2: None
+            expected = self.relationships(calc)
+        finally:
+            del self.db.get_ancestry_lines
+        result = self.relationships(calc)
+        self.assertEqual(result, expected)
+        self.assertTrue(any(result[0]))
+
+    def test_stored_map(self):
+        calc = RelationshipCalculator()
+        expected = self.relationships(calc)
+        calc.storemap = True
+        self.assertEqual(self.relationships(calc), expected)
+
+    def test_relationships_from(self):
+        calc = RelationshipCalculator()
+        for home in (self.pairs[0][0], self.pairs[-1][0]):
+            handles = [person.handle for dummy, person in self.pairs]
+            expected = [(handle, calc.get_one_relationship(
+                self.db, home, self.db.get_person_from_handle(handle)))
+                        for handle in handles]
+            result = calc.get_relationships_from(self.db, home, handles)
+            self.assertEqual(list(result), expected)
+        self.assertFalse(calc.storemap)
+
+    def test_relationships_from_lazily(self):
+        calc = RelationshipCalculator()
+        home = self.pairs[0][0]
+        handles = [person.handle for dummy, person in self.pairs]
+        # The handles are only read as the relationships are asked for
+        wanted = []
+        result = calc.get_relationships_from(self.db, home,
+                                             iter(wanted.pop, None))
+        for handle in handles:
+            wanted.append(handle)
+            self.assertEqual(next(result), (handle, calc.get_one_relationship(
+                self.db, home, self.db.get_person_from_handle(handle))))
+            self.assertEqual(wanted, [])
+        result.close()
+        self.assertFalse(calc.storemap)
+
+if __name__ == "__main__":
+    unittest.main()
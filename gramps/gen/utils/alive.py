@@ -163,62 +163,9 @@ class ProbablyAlive:
             family = self.db.get_family_from_handle(family_handle)
             if family is None:
                 continue
-            for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.ref
-                child = self.db.get_person_from_handle(child_handle)
-                if child is None:
-                    continue
-                # Go through once looking for direct evidence:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                        Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE),
-                                        _("sibling birth date"),
-                                        child)
-                    elif ev and ev.type.is_death():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE),
-                                        Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE
-                                                                + self.MAX_AGE_PROB_ALIVE),
-                                        _("sibling death date"),
-                                        child)
-                # Go through again looking for fallback:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling birth date
-                                return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
-                                        Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE),
-                                        _("sibling birth-related date"),
-                                        child)
-                    elif ev and ev.type.is_death_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
-                            if year != 0:
-                                # sibling death date
-                                return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE),
-                                        Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                        _("sibling death-related date"),
-                                        child)
+            result = self._siblings_range(family)
+            if result:
+                return result
 
         if not is_spouse: # if you are not in recursion, let's recurse:
             for family_handle in person.get_family_handle_list():
@@ -227,8 +174,7 @@ class ProbablyAlive:
                     mother_handle = family.get_mother_handle()
                     father_handle = family.get_father_handle()
                     if mother_handle == person.handle and father_handle:
-                        father = self.db.get_person_from_handle(father_handle)
-                        date1, date2, explain, other = self.probably_alive_range(father, is_spouse=True)
+                        date1, date2, explain, other = self._spouse_range(father_handle)
                         if date1 and date1.get_year() != 0:
                             return (Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
                                     Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
@@ -238,8 +184,7 @@ class ProbablyAlive:
                                     Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
                                     _("a spouse's death-related date, ") + explain, other)
                     elif father_handle == person.handle and mother_handle:
-                        mother = self.db.get_person_from_handle(mother_handle)
-                        date1, date2, explain, other = self.probably_alive_range(mother, is_spouse=True)
+                        date1, date2, explain, other = self._spouse_range(mother_handle)
                         if date1 and date1.get_year() != 0:
                             return (Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
                                     Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
@@ -249,93 +194,25 @@ class ProbablyAlive:
                                     Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
                                     _("a spouse's death-related date, ") + explain, other)
                     # Let's check the family events and see if we find something
-                    for ref in family.get_event_ref_list():
-                        if ref:
-                            event = self.db.get_event_from_handle(ref.ref)
-                            if event:
-                                date = event.get_date_object()
-                                year = date.get_year()
-                                if year != 0:
-                                    other = None
-                                    if person.handle == mother_handle and father_handle:
-                                        other = self.db.get_person_from_handle(father_handle)
-                                    elif person.handle == father_handle and mother_handle:
-                                        other = self.db.get_person_from_handle(mother_handle)
-                                    return (Date().copy_ymd(year - self.AVG_GENERATION_GAP),
-                                            Date().copy_ymd(year - self.AVG_GENERATION_GAP +
-                                                                    self.MAX_AGE_PROB_ALIVE),
-
-                                            _("event with spouse"), other)
-
-        # Try looking for descendants that were born more than a lifespan
-        # ago.
-
-        def descendants_too_old (person, years):
-            if person.handle in self.pset:
-                return (None, None, "", None)
-            self.pset.add(person.handle)
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    continue
-                for child_ref in family.get_child_ref_list():
-                    child_handle = child_ref.ref
-                    child = self.db.get_person_from_handle(child_handle)
-                    child_birth_ref = child.get_birth_ref()
-                    if child_birth_ref:
-                        child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
-                        dobj = child_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            d = Date(dobj)
-                            val = d.get_start_date()
-                            val = d.get_year() - years
-                            d.set_year(val)
-                            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant birth date"),
-                                    child)
-                    child_death_ref = child.get_death_ref()
-                    if child_death_ref:
-                        child_death = self.db.get_event_from_handle(child_death_ref.ref)
-                        dobj = child_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
-                                    dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant death date"),
-                                    child)
-                    date1, date2, explain, other = descendants_too_old (child, years + self.AVG_GENERATION_GAP)
-                    if date1 and date2:
-                        return date1, date2, explain, other
-                    # Check fallback data:
-                    for ev_ref in child.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                d = Date(dobj)
-                                val = d.get_start_date()
-                                val = d.get_year() - years
-                                d.set_year(val)
-                                return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                        _("descendant birth-related date"),
-                                        child)
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
-                                        dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
-                                        _("descendant death-related date"),
-                                        child)
-
-            return (None, None, "", None)
+                    year = self._family_event_year(family)
+                    if year != 0:
+                        other = None
+                        if person.handle == mother_handle and father_handle:
+                            other = self.db.get_person_from_handle(father_handle)
+                        elif person.handle == father_handle and mother_handle:
+                            other = self.db.get_person_from_handle(mother_handle)
+                        return (Date().copy_ymd(year - self.AVG_GENERATION_GAP),
+                                Date().copy_ymd(year - self.AVG_GENERATION_GAP +
+                                                        self.MAX_AGE_PROB_ALIVE),
+
+                                _("event with spouse"), other)
 
         # If there are descendants that are too old for the person to have
         # been alive in the current year then they must be dead.
 
         date1, date2, explain, other = None, None, "", None
         try:
-            date1, date2, explain, other = descendants_too_old(person, self.AVG_GENERATION_GAP)
+            date1, date2, explain, other = self._descendants_too_old(person, self.AVG_GENERATION_GAP)
         except RuntimeError:
             raise DatabaseError(
                 _("Database error: loop in %s's descendants") %
@@ -344,128 +221,468 @@ class ProbablyAlive:
         if date1 and date2:
             return (date1, date2, explain, other)
 
-        def ancestors_too_old(person, year):
-            if person.handle in self.pset:
+        try:
+            # If there are ancestors that would be too old in the current year
+            # then assume our person must be dead too.
+            date1, date2, explain, other = self._ancestors_too_old(person, - self.AVG_GENERATION_GAP)
+        except RuntimeError:
+            raise DatabaseError(
+                _("Database error: loop in %s's ancestors") %
+                name_displayer.display(person))
+        if date1 and date2:
+            return (date1, date2, explain, other)
+
+        # If we can't find any reason to believe that they are dead we
+        # must assume they are alive.
+
+        return (None, None, "", None)
+
+    def _siblings_range(self, family):
+        """
+        Return the range of a person from the birth or death of the
+        children of a family, or None.
+        """
+        for child_ref in family.get_child_ref_list():
+            child_handle = child_ref.ref
+            child = self.db.get_person_from_handle(child_handle)
+            if child is None:
+                continue
+            # Go through once looking for direct evidence:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
+                            return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
+                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE),
+                                    _("sibling birth date"),
+                                    child)
+                elif ev and ev.type.is_death():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
+                            return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE),
+                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE
+                                                            + self.MAX_AGE_PROB_ALIVE),
+                                    _("sibling death date"),
+                                    child)
+            # Go through again looking for fallback:
+            for ev_ref in child.get_primary_event_ref_list():
+                ev = self.db.get_event_from_handle(ev_ref.ref)
+                if ev and ev.type.is_birth_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling birth date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling birth date
+                            return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
+                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE),
+                                    _("sibling birth-related date"),
+                                    child)
+                elif ev and ev.type.is_death_fallback():
+                    dobj = ev.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        # if sibling death date too far away, then not alive:
+                        year = dobj.get_year()
+                        if year != 0:
+                            # sibling death date
+                            return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE),
+                                    Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
+                                    _("sibling death-related date"),
+                                    child)
+        return None
+
+    def _spouse_range(self, handle):
+        """
+        Return the range of the spouse of a person, from the evidence of the
+        spouse itself.
+        """
+        spouse = self.db.get_person_from_handle(handle)
+        return self.probably_alive_range(spouse, is_spouse=True)
+
+    def _family_event_year(self, family):
+        """
+        Return the year of the first event of a family with a year, or 0.
+        """
+        for ref in family.get_event_ref_list():
+            if ref:
+                event = self.db.get_event_from_handle(ref.ref)
+                if event:
+                    year = event.get_date_object().get_year()
+                    if year != 0:
+                        return year
+        return 0
+
+    def _descendants_too_old(self, person, years):
+        """
+        Return the range of a person from the birth or death of its
+        descendants.  The birth of a descendant is moved back by years.
+        """
+        if person.handle in self.pset:
+            return (None, None, "", None)
+        self.pset.add(person.handle)
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            if not family:
+                # can happen with LivingProxyDb(PrivateProxyDb(db))
+                continue
+            for child_ref in family.get_child_ref_list():
+                child_handle = child_ref.ref
+                child = self.db.get_person_from_handle(child_handle)
+                child_birth_ref = child.get_birth_ref()
+                if child_birth_ref:
+                    child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
+                    dobj = child_birth.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        d = Date(dobj)
+                        val = d.get_start_date()
+                        val = d.get_year() - years
+                        d.set_year(val)
+                        return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                                _("descendant birth date"),
+                                child)
+                child_death_ref = child.get_death_ref()
+                if child_death_ref:
+                    child_death = self.db.get_event_from_handle(child_death_ref.ref)
+                    dobj = child_death.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
+                                dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+                                _("descendant death date"),
+                                child)
+                date1, date2, explain, other = self._descendants_too_old(child, years + self.AVG_GENERATION_GAP)
+                if date1 and date2:
+                    return date1, date2, explain, other
+                # Check fallback data:
+                for ev_ref in child.get_primary_event_ref_list():
+                    ev = self.db.get_event_from_handle(ev_ref.ref)
+                    if ev and ev.type.is_birth_fallback():
+                        dobj = ev.get_date_object()
+                        if dobj.get_start_date() != Date.EMPTY:
+                            d = Date(dobj)
+                            val = d.get_start_date()
+                            val = d.get_year() - years
+                            d.set_year(val)
+                            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                                    _("descendant birth-related date"),
+                                    child)
+
+                    elif ev and ev.type.is_death_fallback():
+                        dobj = ev.get_date_object()
+                        if dobj.get_start_date() != Date.EMPTY:
+                            return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
+                                    dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+                                    _("descendant death-related date"),
+                                    child)
+
+        return (None, None, "", None)
+
+    def _ancestors_too_old(self, person, year):
+        """
+        Return the range of a person from the birth or death of its
+        ancestors.  The dates of an ancestor are moved by year.
+        """
+        if person.handle in self.pset:
+            return (None, None, "", None)
+        self.pset.add(person.handle)
+        LOG.debug("ancestors_too_old('%s', %s)".format(
+            name_displayer.display(person), year) )
+        family_handle = person.get_main_parents_family_handle()
+        if family_handle:
+            family = self.db.get_family_from_handle(family_handle)
+            if not family:
+                # can happen with LivingProxyDb(PrivateProxyDb(db))
                 return (None, None, "", None)
-            self.pset.add(person.handle)
-            LOG.debug("ancestors_too_old('%s', %s)".format(
-                name_displayer.display(person), year) )
-            family_handle = person.get_main_parents_family_handle()
-            if family_handle:
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    return (None, None, "", None)
-                father_handle = family.get_father_handle()
-                if father_handle:
-                    father = self.db.get_person_from_handle(father_handle)
-                    father_birth_ref = father.get_birth_ref()
-                    if father_birth_ref and father_birth_ref.get_role().is_primary():
-                        father_birth = self.db.get_event_from_handle(
-                            father_birth_ref.ref)
-                        dobj = father_birth.get_date_object()
+            father_handle = family.get_father_handle()
+            if father_handle:
+                father = self.db.get_person_from_handle(father_handle)
+                father_birth_ref = father.get_birth_ref()
+                if father_birth_ref and father_birth_ref.get_role().is_primary():
+                    father_birth = self.db.get_event_from_handle(
+                        father_birth_ref.ref)
+                    dobj = father_birth.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (dobj.copy_offset_ymd(- year),
+                                dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
+                                _("ancestor birth date"),
+                                father)
+                father_death_ref = father.get_death_ref()
+                if father_death_ref and father_death_ref.get_role().is_primary():
+                    father_death = self.db.get_event_from_handle(
+                        father_death_ref.ref)
+                    dobj = father_death.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
+                                dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
+                                _("ancestor death date"),
+                                father)
+
+                # Check fallback data:
+                for ev_ref in father.get_primary_event_ref_list():
+                    ev = self.db.get_event_from_handle(ev_ref.ref)
+                    if ev and ev.type.is_birth_fallback():
+                        dobj = ev.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (dobj.copy_offset_ymd(- year),
                                     dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor birth date"),
+                                    _("ancestor birth-related date"),
                                     father)
-                    father_death_ref = father.get_death_ref()
-                    if father_death_ref and father_death_ref.get_role().is_primary():
-                        father_death = self.db.get_event_from_handle(
-                            father_death_ref.ref)
-                        dobj = father_death.get_date_object()
+
+                    elif ev and ev.type.is_death_fallback():
+                        dobj = ev.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
                                     dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor death date"),
+                                    _("ancestor death-related date"),
                                     father)
 
-                    # Check fallback data:
-                    for ev_ref in father.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year),
-                                        dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor birth-related date"),
-                                        father)
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
-                                        dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor death-related date"),
-                                        father)
-
-                    date1, date2, explain, other = ancestors_too_old (father, year - self.AVG_GENERATION_GAP)
-                    if date1 and date2:
-                        return date1, date2, explain, other
-
-                mother_handle = family.get_mother_handle()
-                if mother_handle:
-                    mother = self.db.get_person_from_handle(mother_handle)
-                    mother_birth_ref = mother.get_birth_ref()
-                    if mother_birth_ref and mother_birth_ref.get_role().is_primary():
-                        mother_birth = self.db.get_event_from_handle(mother_birth_ref.ref)
-                        dobj = mother_birth.get_date_object()
+                date1, date2, explain, other = self._ancestors_too_old(father, year - self.AVG_GENERATION_GAP)
+                if date1 and date2:
+                    return date1, date2, explain, other
+
+            mother_handle = family.get_mother_handle()
+            if mother_handle:
+                mother = self.db.get_person_from_handle(mother_handle)
+                mother_birth_ref = mother.get_birth_ref()
+                if mother_birth_ref and mother_birth_ref.get_role().is_primary():
+                    mother_birth = self.db.get_event_from_handle(mother_birth_ref.ref)
+                    dobj = mother_birth.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (dobj.copy_offset_ymd(- year),
+                                dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
+                                _("ancestor birth date"),
+                                mother)
+                mother_death_ref = mother.get_death_ref()
+                if mother_death_ref and mother_death_ref.get_role().is_primary():
+                    mother_death = self.db.get_event_from_handle(
+                        mother_death_ref.ref)
+                    dobj = mother_death.get_date_object()
+                    if dobj.get_start_date() != Date.EMPTY:
+                        return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
+                                dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
+                                _("ancestor death date"),
+                                mother)
+
+                # Check fallback data:
+                for ev_ref in mother.get_primary_event_ref_list():
+                    ev = self.db.get_event_from_handle(ev_ref.ref)
+                    if ev and ev.type.is_birth_fallback():
+                        dobj = ev.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (dobj.copy_offset_ymd(- year),
                                     dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor birth date"),
+                                    _("ancestor birth-related date"),
                                     mother)
-                    mother_death_ref = mother.get_death_ref()
-                    if mother_death_ref and mother_death_ref.get_role().is_primary():
-                        mother_death = self.db.get_event_from_handle(
-                            mother_death_ref.ref)
-                        dobj = mother_death.get_date_object()
+
+                    elif ev and ev.type.is_death_fallback():
+                        dobj = ev.get_date_object()
                         if dobj.get_start_date() != Date.EMPTY:
                             return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
                                     dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor death date"),
+                                    _("ancestor death-related date"),
                                     mother)
 
-                    # Check fallback data:
-                    for ev_ref in mother.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year),
-                                        dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor birth-related date"),
-                                        mother)
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
-                                        dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor death-related date"),
-                                        mother)
-
-                    date1, date2, explain, other = ancestors_too_old (mother, year - self.AVG_GENERATION_GAP)
-                    if date1 and date2:
-                        return (date1, date2, explain, other)
+                date1, date2, explain, other = self._ancestors_too_old(mother, year - self.AVG_GENERATION_GAP)
+                if date1 and date2:
+                    return (date1, date2, explain, other)
 
-            return (None, None, "", None)
+        return (None, None, "", None)
 
-        try:
-            # If there are ancestors that would be too old in the current year
-            # then assume our person must be dead too.
-            date1, date2, explain, other = ancestors_too_old (person, - self.AVG_GENERATION_GAP)
-        except RuntimeError:
-            raise DatabaseError(
-                _("Database error: loop in %s's ancestors") %
-                name_displayer.display(person))
-        if date1 and date2:
-            return (date1, date2, explain, other)
+#-------------------------------------------------------------------------
+#
+# CachedProbablyAlive class
+#
+#-------------------------------------------------------------------------
+_DESCENDANT_BIRTH = 0
+_DESCENDANT_DEATH = 1
 
-        # If we can't find any reason to believe that they are dead we
-        # must assume they are alive.
+class _Fallback(Exception):
+    """
+    Raised when the cached evidence may differ from the evidence found by
+    the walks of :class:`ProbablyAlive`.
+    """
 
-        return (None, None, "", None)
+class CachedProbablyAlive(ProbablyAlive):
+    """
+    A :class:`ProbablyAlive` which keeps the evidence it finds about the
+    families and the people of the database, to compute the range of many
+    people.  The database must not change while it is used.
+
+    The evidence kept is the range given by the children of each family, the
+    year of the first event of each family, the range of each spouse, and the
+    first descendant of each person with a birth or death date.  The
+    descendants are found once for each person, as the descendants of a
+    person are the descendants of its children, so the walk over the family
+    graph visits each person once, children before their parents.
+
+    The ranges are the same as those of :class:`ProbablyAlive`.  For loops in
+    the descendants, and for the few people whose spouse has descendants
+    with a date without a year, the walks of :class:`ProbablyAlive` are
+    used.
+    """
+    def __init__(self, db, max_sib_age_diff=None, max_age_prob_alive=None,
+                 avg_generation_gap=None):
+        """
+        :param db: the database, or a proxy of it; the evidence is taken
+                   from the database itself
+        """
+        db = _base_database(db)
+        ProbablyAlive.__init__(self, db, max_sib_age_diff,
+                               max_age_prob_alive, avg_generation_gap)
+        self.__walks = ProbablyAlive(db, self.MAX_SIB_AGE_DIFF,
+                                     self.MAX_AGE_PROB_ALIVE,
+                                     self.AVG_GENERATION_GAP)
+        self.__siblings = {}    # family handle -> range or None
+        self.__events = {}      # family handle -> year
+        self.__spouses = {}     # person handle -> (range, found descendant)
+        self.__children = {}    # person handle -> evidence or None
+        self.__walking = set()
+        self.__found = False
+        self.__spouse_found = False
+
+    def probably_alive_range(self, person, is_spouse=False):
+        if is_spouse:
+            return ProbablyAlive.probably_alive_range(self, person, is_spouse)
+        self.__spouse_found = False
+        try:
+            return ProbablyAlive.probably_alive_range(self, person)
+        except _Fallback:
+            return self.__walks.probably_alive_range(person)
+
+    def probably_alive_ranges(self, handles=None):
+        """
+        Return a dictionary with the range of each person, see
+        :meth:`probably_alive_range`.
+
+        :param handles: the handles of the people, all people by default
+        """
+        if handles is None:
+            handles = self.db.iter_person_handles()
+        return {handle: self.probably_alive_range(
+                    self.db.get_person_from_handle(handle))
+                for handle in handles}
+
+    def _siblings_range(self, family):
+        if family.handle not in self.__siblings:
+            self.__siblings[family.handle] = ProbablyAlive._siblings_range(
+                self, family)
+        return self.__siblings[family.handle]
+
+    def _family_event_year(self, family):
+        if family.handle not in self.__events:
+            self.__events[family.handle] = \
+                ProbablyAlive._family_event_year(self, family)
+        return self.__events[family.handle]
+
+    def _spouse_range(self, handle):
+        if handle not in self.__spouses:
+            self.__found = False
+            result = ProbablyAlive._spouse_range(self, handle)
+            self.__spouses[handle] = (result, self.__found)
+        result, self.__spouse_found = self.__spouses[handle]
+        return result
+
+    def _descendants_too_old(self, person, years):
+        if person.handle in self.pset:
+            return (None, None, "", None)
+        if self.__spouse_found:
+            # The walk for the spouse stopped at a descendant, and the walk
+            # of ProbablyAlive skips the people it visited.
+            raise _Fallback
+        self.pset.add(person.handle)
+        self.__walking = {person.handle}
+        evidence = self.__descendant_evidence(person)
+        if evidence is None:
+            return (None, None, "", None)
+        self.__found = True
+        kind, dobj, generations, child, explain = evidence
+        if kind == _DESCENDANT_BIRTH:
+            d = Date(dobj)
+            d.set_year(d.get_year() - years -
+                       generations * self.AVG_GENERATION_GAP)
+            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                    explain, child)
+        return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
+                dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP +
+                                     self.MAX_AGE_PROB_ALIVE),
+                explain, child)
+
+    def __descendant_evidence(self, person):
+        """
+        Return the first evidence given by the descendants of a person, in
+        the order of the walk of :meth:`_descendants_too_old`, or None.
+        """
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            if not family:
+                continue
+            for child_ref in family.get_child_ref_list():
+                evidence = self.__child_evidence(child_ref.ref)
+                if evidence:
+                    return evidence
+        return None
+
+    def __child_evidence(self, handle):
+        """
+        Return the evidence given by a child and its descendants, as
+        (kind, date, generations, person, explain), where generations is
+        the number of generations below the child.
+        """
+        if handle in self.__children:
+            return self.__children[handle]
+        if handle in self.__walking:
+            # a loop in the descendants
+            raise _Fallback
+        child = self.db.get_person_from_handle(handle)
+        child_birth_ref = child.get_birth_ref()
+        if child_birth_ref:
+            child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
+            dobj = child_birth.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return self.__keep(handle, (_DESCENDANT_BIRTH, dobj, 0, child,
+                                            _("descendant birth date")))
+        child_death_ref = child.get_death_ref()
+        if child_death_ref:
+            child_death = self.db.get_event_from_handle(child_death_ref.ref)
+            dobj = child_death.get_date_object()
+            if dobj.get_start_date() != Date.EMPTY:
+                return self.__keep(handle, (_DESCENDANT_DEATH, dobj, 0, child,
+                                            _("descendant death date")))
+        self.__walking.add(handle)
+        evidence = self.__descendant_evidence(child)
+        self.__walking.discard(handle)
+        if evidence:
+            kind, dobj, generations, other, explain = evidence
+            return self.__keep(handle, (kind, dobj, generations + 1, other,
+                                        explain))
+        # Check fallback data:
+        for ev_ref in child.get_primary_event_ref_list():
+            ev = self.db.get_event_from_handle(ev_ref.ref)
+            if ev and ev.type.is_birth_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return self.__keep(handle, (
+                        _DESCENDANT_BIRTH, dobj, 0, child,
+                        _("descendant birth-related date")))
+            elif ev and ev.type.is_death_fallback():
+                dobj = ev.get_date_object()
+                if dobj.get_start_date() != Date.EMPTY:
+                    return self.__keep(handle, (
+                        _DESCENDANT_DEATH, dobj, 0, child,
+                        _("descendant death-related date")))
+        return self.__keep(handle, None)
+
+    def __keep(self, handle, evidence):
+        self.__children[handle] = evidence
+        return evidence
 
 #-------------------------------------------------------------------------
 #
@@ -478,7 +695,8 @@ def probably_alive(person, db,
                    max_sib_age_diff=None,
                    max_age_prob_alive=None,
                    avg_generation_gap=None,
-                   return_range=False):
+                   return_range=False,
+                   cache=None):
     """
     Return true if the person may be alive on current_date.
 
@@ -492,10 +710,16 @@ def probably_alive(person, db,
     :param max_sib_age_diff: maximum sibling age difference, in years
     :param max_age_prob_alive: maximum age of a person, in years
     :param avg_generation_gap: average generation gap, in years
+    :param cache: a :class:`CachedProbablyAlive` of the database, to use
+                  instead of the parameters above when asking for many
+                  people
     """
     # First, get the real database to use all people
     # for determining alive status:
-    birth, death, explain, relative = probably_alive_range(person, db,
+    if cache is not None:
+        birth, death, explain, relative = cache.probably_alive_range(person)
+    else:
+        birth, death, explain, relative = probably_alive_range(person, db,
             max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
     if current_date is None:
         current_date = Today()
@@ -527,15 +751,36 @@ def probably_alive_range(person, db,
     """
     # First, find the real database to use all people
     # for determining alive status:
-    from ..proxy.proxybase import ProxyDbBase
-    basedb = db
-    while isinstance(basedb, ProxyDbBase):
-        basedb = basedb.db
+    basedb = _base_database(db)
     # Now, we create a wrapper for doing work:
     pb = ProbablyAlive(basedb, max_sib_age_diff,
                        max_age_prob_alive, avg_generation_gap)
     return pb.probably_alive_range(person)
 
+def probably_alive_ranges(db, handles=None,
+                          max_sib_age_diff=None,
+                          max_age_prob_alive=None,
+                          avg_generation_gap=None):
+    """
+    Computes estimated birth and death dates of many people at once.
+    Returns: a dictionary of person handle to
+             (birth_date, death_date, explain_text, related_person)
+
+    :param handles: the handles of the people, all people by default
+    """
+    pb = CachedProbablyAlive(db, max_sib_age_diff,
+                             max_age_prob_alive, avg_generation_gap)
+    return pb.probably_alive_ranges(handles)
+
+def _base_database(db):
+    """
+    Return the database behind the proxies of a database.
+    """
+    from ..proxy.proxybase import ProxyDbBase
+    while isinstance(db, ProxyDbBase):
+        db = db.db
+    return db
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
@@ -0,0 +1,100 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Pools of worker processes.
+
+Worker processes are spawned rather than forked, because forking a process
+that runs a GUI toolkit is not safe.  A spawned worker imports the main
+module of its parent under the name ``__mp_main__``, so a script starting
+Gramps must only do so when its ``__name__`` is ``'__main__'``.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+import multiprocessing
+from contextlib import contextmanager
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from ..config import config
+
+#-------------------------------------------------------------------------
+#
+# Functions
+#
+#-------------------------------------------------------------------------
+def get_worker_processes():
+    """
+    Return the number of worker processes set by the
+    behavior.worker-processes option.  Below two, the work is done in the
+    calling process.
+    """
+    return config.get('behavior.worker-processes')
+
+def start_pool(processes, initializer=None, initargs=()):
+    """
+    Start a pool of worker processes.
+
+    :param processes: the number of worker processes
+    :type processes: int
+    :param initializer: function called at the start of each worker
+    :type initializer: callable
+    :param initargs: arguments of the initializer
+    :type initargs: tuple
+    :returns: the pool
+    :rtype: :class:`multiprocessing.pool.Pool`
+    """
+    context = multiprocessing.get_context('spawn')
+    return context.Pool(processes, initializer, initargs)
+
+def start_manager():
+    """
+    Start a server process holding objects shared with worker processes.
+
+    :returns: the manager, to be shut down after use
+    :rtype: :class:`multiprocessing.managers.SyncManager`
+    """
+    return multiprocessing.get_context('spawn').Manager()
+
+def stop_pool(pool):
+    """
+    Stop the worker processes of a pool, dropping any pending work.
+    """
+    pool.terminate()
+    pool.join()
+
+@contextmanager
+def worker_pool(processes, initializer=None, initargs=()):
+    """
+    Context manager giving a pool of worker processes, which is stopped on
+    exit.  See :func:`start_pool`.
+    """
+    pool = start_pool(processes, initializer, initargs)
+    try:
+        yield pool
+    finally:
+        stop_pool(pool)
@@ -0,0 +1,156 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the cached probably alive ranges """
+
+import unittest
+
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import (Person, Family, ChildRef, Event, EventType, EventRef,
+                    Date)
+from ...proxy import LivingProxyDb
+from ..alive import (ProbablyAlive, CachedProbablyAlive, probably_alive,
+                     probably_alive_ranges)
+
+def key(result):
+    """ A comparable form of a range """
+    birth, death, explain, other = result
+    return (birth.serialize() if birth else birth,
+            death.serialize() if death else death,
+            explain, other.handle if other else None)
+
+class CachedProbablyAliveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_person(self, trans, birth_year=None):
+        person = Person()
+        self.db.add_person(person, trans)
+        if birth_year is not None:
+            event = Event()
+            event.set_type(EventType(EventType.BIRTH))
+            date = Date()
+            date.set_yr_mon_day(birth_year, 1, 1)
+            event.set_date_object(date)
+            self.db.add_event(event, trans)
+            ref = EventRef()
+            ref.ref = event.handle
+            person.add_event_ref(ref)
+            person.set_birth_ref(ref)
+            self.db.commit_person(person, trans)
+        return person
+
+    def add_family(self, trans, father, mother, children):
+        family = Family()
+        family.set_father_handle(father.handle)
+        family.set_mother_handle(mother.handle)
+        self.db.add_family(family, trans)
+        for child in children:
+            ref = ChildRef()
+            ref.ref = child.handle
+            family.add_child_ref(ref)
+            child.add_parent_family_handle(family.handle)
+            self.db.commit_person(child, trans)
+        self.db.commit_family(family, trans)
+        for parent in (father, mother):
+            parent.add_family_handle(family.handle)
+            self.db.commit_person(parent, trans)
+        return family
+
+    def build_tree(self):
+        """
+        Three generations without dates above a dated great-grandchild, a
+        spouse with a birth date, and a couple without any evidence.
+        """
+        with DbTxn("Add people", self.db) as trans:
+            people = [self.add_person(trans) for dummy in range(8)]
+            great = self.add_person(trans, 1990)
+            spouse = self.add_person(trans, 1900)
+            self.add_family(trans, people[0], people[1], [people[2]])
+            self.add_family(trans, people[2], people[3], [people[4]])
+            self.add_family(trans, people[4], people[5], [great])
+            self.add_family(trans, people[6], spouse, [])
+            self.add_family(trans, people[7], self.add_person(trans), [])
+        return people
+
+    def assert_same_ranges(self):
+        plain = ProbablyAlive(self.db)
+        cache = CachedProbablyAlive(self.db)
+        for person in self.db.iter_people():
+            self.assertEqual(key(cache.probably_alive_range(person)),
+                             key(plain.probably_alive_range(person)))
+
+    def test_ranges(self):
+        people = self.build_tree()
+        self.assert_same_ranges()
+        cache = CachedProbablyAlive(self.db)
+        birth, death, explain, other = cache.probably_alive_range(
+            self.db.get_person_from_handle(people[0].handle))
+        # from the descendants of the spouse, a generation earlier
+        self.assertEqual(birth.get_year(), 1990 - 4 * 20)
+        self.assertEqual(explain,
+                         "a spouse's birth-related date, descendant birth date")
+        explain = cache.probably_alive_range(
+            self.db.get_person_from_handle(people[6].handle))[2]
+        self.assertEqual(explain, "a spouse's birth-related date, birth date")
+
+    def test_loop(self):
+        with DbTxn("Add loop", self.db) as trans:
+            # the grandparent is also a child of its grandchild
+            people = [self.add_person(trans) for dummy in range(6)]
+            self.add_family(trans, people[0], people[1], [people[2]])
+            self.add_family(trans, people[2], people[3], [people[4]])
+            self.add_family(trans, people[4], people[5], [people[0]])
+            self.add_family(trans, self.add_person(trans),
+                            self.add_person(trans), [people[1]])
+        with DbTxn("Add birth", self.db) as trans:
+            self.add_family(trans, people[1], self.add_person(trans),
+                            [self.add_person(trans, 1990)])
+        self.assert_same_ranges()
+
+    def test_batch(self):
+        self.build_tree()
+        plain = ProbablyAlive(self.db)
+        ranges = probably_alive_ranges(self.db)
+        self.assertEqual(len(ranges), self.db.get_number_of_people())
+        for handle, result in ranges.items():
+            person = self.db.get_person_from_handle(handle)
+            self.assertEqual(key(result),
+                             key(plain.probably_alive_range(person)))
+
+    def test_living_proxy(self):
+        self.build_tree()
+        living = [person.handle for person in self.db.iter_people()
+                  if probably_alive(person, self.db)]
+        self.assertTrue(living)
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL)
+        self.assertEqual(
+            sorted(person.handle for person in proxy.iter_people()),
+            sorted(set(self.db.get_person_handles()) - set(living)))
+
+
+if __name__ == "__main__":
+    unittest.main()
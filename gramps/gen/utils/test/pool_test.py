@@ -0,0 +1,59 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the pools of worker processes """
+
+import os
+import runpy
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+import gramps
+from ..pool import worker_pool
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                        "..", "..", "..", ".."))
+
+class PoolTest(unittest.TestCase):
+
+    def test_pool(self):
+        with worker_pool(2) as pool:
+            self.assertEqual(pool.map(abs, range(-5, 5)),
+                             [abs(i) for i in range(-5, 5)])
+
+    def test_launchers(self):
+        # a spawned worker runs the main script of its parent under this name
+        for launcher in ("Gramps.py", os.path.join("scripts", "gramps")):
+            path = os.path.join(ROOT_DIR, launcher)
+            if not os.path.exists(path):
+                continue
+            # importing the application module replaces the standard streams
+            app = Mock()
+            with patch.dict(sys.modules, {'gramps.grampsapp': app}), \
+                    patch.object(gramps, 'grampsapp', app, create=True):
+                runpy.run_path(path, run_name='__mp_main__')
+                self.assertFalse(app.main.called, launcher)
+                runpy.run_path(path, run_name='__main__')
+                self.assertTrue(app.main.called, launcher)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the thumbnail cache """
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ...const import IMAGE_DIR
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import Media, MediaRef, Person
+from .. import thumbnails
+from ..thumbnails import (ThumbnailIndex, build_thumbnails,
+                          get_thumbnail_path, SIZE_LARGE)
+
+IMAGE = os.path.join(IMAGE_DIR, "gramps.png")
+OTHER_IMAGE = os.path.join(IMAGE_DIR, "document.png")
+RECTANGLE = (10, 10, 60, 60)
+
+class ThumbnailTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.media_dir = os.path.join(self.path, "media")
+        os.mkdir(self.media_dir)
+        # worker processes build the thumbnails under GRAMPSHOME
+        self.home = os.environ.get('GRAMPSHOME')
+        os.environ['GRAMPSHOME'] = self.path
+        thumb_dir = os.path.join(self.path, "gramps", "thumb")
+        self.normal = os.path.join(thumb_dir, "normal")
+        self.large = os.path.join(thumb_dir, "large")
+        os.makedirs(self.normal)
+        os.makedirs(self.large)
+        self.patches = [
+            patch.object(thumbnails, 'THUMB_NORMAL', self.normal),
+            patch.object(thumbnails, 'THUMB_LARGE', self.large),
+            patch.object(thumbnails, '_INDEX', ThumbnailIndex(
+                os.path.join(thumb_dir, "index.db")))]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        if self.home is None:
+            del os.environ['GRAMPSHOME']
+        else:
+            os.environ['GRAMPSHOME'] = self.home
+        shutil.rmtree(self.path)
+
+    def copy(self, image, name):
+        filename = os.path.join(self.media_dir, name)
+        shutil.copyfile(image, filename)
+        return filename
+
+    def thumbnails(self):
+        return (sorted(os.listdir(self.normal)),
+                sorted(os.listdir(self.large)))
+
+    def test_content_naming(self):
+        first = self.copy(IMAGE, "first.png")
+        thumb = get_thumbnail_path(first, 'image/png')
+        self.assertEqual(os.path.dirname(thumb), self.normal)
+        self.assertTrue(os.path.isfile(thumb))
+        # a copy of the file shares the thumbnail
+        second = self.copy(IMAGE, "second.png")
+        self.assertEqual(get_thumbnail_path(second, 'image/png'), thumb)
+        large = get_thumbnail_path(first, 'image/png', size=SIZE_LARGE)
+        self.assertEqual(os.path.dirname(large), self.large)
+        region = get_thumbnail_path(first, 'image/png', RECTANGLE)
+        self.assertNotEqual(region, thumb)
+        self.assertTrue(os.path.isfile(region))
+        # a new content has a new thumbnail
+        shutil.copyfile(OTHER_IMAGE, first)
+        os.utime(first, ns=(0, 0))
+        self.assertNotEqual(get_thumbnail_path(first, 'image/png'), thumb)
+
+    def test_index(self):
+        filename = self.copy(IMAGE, "image.png")
+        index = ThumbnailIndex(os.path.join(self.path, "index.db"))
+        stat = os.stat(filename)
+        self.assertIsNone(index.get(filename, stat))
+        index.add([(filename, stat.st_mtime_ns, stat.st_size, 'digest')])
+        self.assertEqual(index.get(filename, stat), 'digest')
+        os.utime(filename, ns=(0, 0))
+        self.assertIsNone(index.get(filename, os.stat(filename)))
+        # without an index the digests are computed every time
+        index = ThumbnailIndex(os.path.join(self.path, "missing", "index.db"))
+        index.add([(filename, stat.st_mtime_ns, stat.st_size, 'digest')])
+        self.assertIsNone(index.get(filename, stat))
+        self.assertTrue(index.disabled)
+
+    def test_large_file(self):
+        hash_file = getattr(thumbnails, '__hash_file')
+        first = os.path.join(self.media_dir, "first.bin")
+        second = os.path.join(self.media_dir, "second.bin")
+        with open(first, 'wb') as out:
+            out.write(os.urandom(5000))
+        shutil.copyfile(first, second)
+        with patch.object(thumbnails, 'FULL_DIGEST_SIZE', 1000), \
+                patch.object(thumbnails, 'SAMPLE_SIZE', 100):
+            digest = hash_file(first)
+            self.assertEqual(hash_file(second), digest)
+            with open(second, 'r+b') as out:
+                out.seek(4999)
+                out.write(b'x' if out.read(1) != b'x' else b'y')
+            self.assertNotEqual(hash_file(second), digest)
+
+    def __database(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        with DbTxn("Add media", db) as trans:
+            handles = []
+            for filename in (self.copy(IMAGE, "first.png"),
+                             self.copy(IMAGE, "second.png"),
+                             self.copy(OTHER_IMAGE, "other.png"),
+                             os.path.join(self.media_dir, "missing.png")):
+                media = Media()
+                media.set_path(filename)
+                media.set_mime_type('image/png')
+                handles.append(db.add_media(media, trans))
+            person = Person()
+            media_ref = MediaRef()
+            media_ref.set_reference_handle(handles[0])
+            media_ref.set_rectangle(RECTANGLE)
+            person.add_media_reference(media_ref)
+            db.add_person(person, trans)
+        return db
+
+    def test_build(self):
+        db = self.__database()
+        self.assertEqual(build_thumbnails(db, 1), (3, 0, 1, 0))
+        built = self.thumbnails()
+        # first.png and second.png share their thumbnails
+        self.assertEqual([len(names) for names in built], [3, 3])
+        first = os.path.join(self.media_dir, "first.png")
+        self.assertIn(os.path.basename(
+            get_thumbnail_path(first, 'image/png', RECTANGLE)), built[0])
+        self.assertEqual(self.thumbnails(), built)
+        self.assertEqual(build_thumbnails(db, 1), (0, 3, 1, 0))
+
+        # the same thumbnails are built by worker processes
+        for directory in (self.normal, self.large):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+        self.assertEqual(build_thumbnails(db, 2), (3, 0, 1, 0))
+        self.assertEqual(self.thumbnails(), built)
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
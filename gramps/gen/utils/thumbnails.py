@@ -29,6 +29,7 @@ Handles generation and access to thumbnails used in Gramps.
 #-------------------------------------------------------------------------
 import os
 import logging
+import sqlite3
 from hashlib import md5
 
 #-------------------------------------------------------------------------
@@ -50,9 +51,12 @@ except:
 # gramps modules
 #
 #-------------------------------------------------------------------------
-from gramps.gen.const import (ICON, IMAGE_DIR, THUMB_LARGE, THUMB_NORMAL,
-                              THUMBSCALE, THUMBSCALE_LARGE, USE_THUMBNAILER)
+from gramps.gen.const import (ICON, IMAGE_DIR, THUMB_DIR, THUMB_LARGE,
+                              THUMB_NORMAL, THUMBSCALE, THUMBSCALE_LARGE,
+                              USE_THUMBNAILER)
 from gramps.gen.constfunc import win
+from gramps.gen.utils.file import media_path_full
+from gramps.gen.utils.pool import get_worker_processes, start_pool, stop_pool
 
 #-------------------------------------------------------------------------
 #
@@ -80,6 +84,12 @@ except (ImportError, KeyError) as msg:
 LOG = logging.getLogger(".thumbnail")
 SIZE_NORMAL = 0
 SIZE_LARGE = 1
+SIZES = (SIZE_NORMAL, SIZE_LARGE)
+THUMB_INDEX = os.path.join(THUMB_DIR, "index.db")
+CHUNK_SIZE = 4
+# larger files are only read in part to compute their digests
+FULL_DIGEST_SIZE = 16 * 1024 * 1024
+SAMPLE_SIZE = 1024 * 1024
 
 #-------------------------------------------------------------------------
 #
@@ -128,15 +138,18 @@ def __get_gconf_bool(key):
 # __build_thumb_path
 #
 #-------------------------------------------------------------------------
-def __build_thumb_path(path, rectangle=None, size=SIZE_NORMAL):
+def __build_thumb_path(digest, rectangle=None, size=SIZE_NORMAL):
     """
-    Convert the specified path into a corresponding path for the thumbnail
-    image. We do this by converting the original path into an MD5SUM value
-    (which should be unique), adding the '.png' extension, and prepending
-    with the Gramps thumbnail directory.
+    Convert the content digest of a source file into a corresponding path
+    for the thumbnail image. We do this by converting the digest and the
+    rectangle into an MD5SUM value (which should be unique), adding the
+    '.png' extension, and prepending with the Gramps thumbnail directory.
 
-    :type path: unicode
-    :param path: filename of the source file
+    Naming thumbnails after the content rather than the path of the source
+    file lets a renamed or copied file use the thumbnails already built.
+
+    :type digest: unicode
+    :param digest: content digest of the source file, see __hash_file
     :type rectangle: tuple
     :param rectangle: subsection rectangle
     :rtype: unicode
@@ -144,8 +157,8 @@ def __build_thumb_path(path, rectangle=None, size=SIZE_NORMAL):
     """
     extra = ""
     if rectangle is not None:
-        extra = "?" + str(rectangle)
-    prehash = path + extra
+        extra = "?" + str(tuple(rectangle))
+    prehash = digest + extra
     prehash = prehash.encode('utf-8')
     md5_hash = md5(prehash)
     if size == SIZE_LARGE:
@@ -154,12 +167,143 @@ def __build_thumb_path(path, rectangle=None, size=SIZE_NORMAL):
         base_dir = THUMB_NORMAL
     return os.path.join(base_dir, md5_hash.hexdigest()+'.png')
 
+#-------------------------------------------------------------------------
+#
+# __hash_file
+#
+#-------------------------------------------------------------------------
+def __hash_file(src_file):
+    """
+    Return the MD5SUM value of the content of a file.
+
+    A file larger than FULL_DIGEST_SIZE is identified by its size and by
+    samples of SAMPLE_SIZE bytes at its start, middle and end, so that
+    showing the thumbnail of a large video or document does not read the
+    whole file.
+
+    :param src_file: filename of the source file
+    :type src_file: unicode
+    :rtype: unicode
+    """
+    md5_hash = md5()
+    with open(src_file, 'rb') as src:
+        size = os.fstat(src.fileno()).st_size
+        if size > FULL_DIGEST_SIZE:
+            md5_hash.update(str(size).encode('ascii'))
+            for offset in (0, (size - SAMPLE_SIZE) // 2, size - SAMPLE_SIZE):
+                src.seek(offset)
+                md5_hash.update(src.read(SAMPLE_SIZE))
+        else:
+            for block in iter(lambda: src.read(SAMPLE_SIZE), b''):
+                md5_hash.update(block)
+    return md5_hash.hexdigest()
+
+#-------------------------------------------------------------------------
+#
+# ThumbnailIndex
+#
+#-------------------------------------------------------------------------
+class ThumbnailIndex:
+    """
+    The content digests of the source files of the thumbnails.
+
+    The digest of each file is kept with its path, modification time and
+    size, so that a file is only read again when it changed.  The index is
+    a SQLite database in the thumbnail directory; if it cannot be used,
+    the digests are computed every time.
+    """
+    def __init__(self, filename):
+        """
+        :param filename: filename of the index database
+        :type filename: unicode
+        """
+        self.filename = filename
+        self.conn = None
+        self.disabled = False
+
+    def __connect(self):
+        """
+        Open the index database when it is first needed.
+        """
+        if self.conn is None and not self.disabled:
+            try:
+                self.conn = sqlite3.connect(self.filename)
+                self.conn.execute("CREATE TABLE IF NOT EXISTS source "
+                                  "(path TEXT PRIMARY KEY, mtime INTEGER, "
+                                  "size INTEGER, digest TEXT)")
+            except sqlite3.Error as err:
+                LOG.warning("Thumbnail index %s disabled: %s",
+                            self.filename, str(err))
+                self.conn = None
+                self.disabled = True
+        return self.conn
+
+    def get(self, path, stat):
+        """
+        Return the digest of a file, or None if it is not known for the
+        current version of the file.
+
+        :param path: absolute filename of the source file
+        :type path: unicode
+        :param stat: the result of os.stat for the file
+        :type stat: os.stat_result
+        """
+        conn = self.__connect()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT mtime, size, digest FROM source "
+                           "WHERE path = ?", (path,)).fetchone()
+        if row and row[:2] == (stat.st_mtime_ns, stat.st_size):
+            return row[2]
+        return None
+
+    def add(self, entries):
+        """
+        Store the digests of files.
+
+        :param entries: (path, mtime_ns, size, digest) of each file
+        :type entries: list
+        """
+        conn = self.__connect()
+        if conn is None or not entries:
+            return
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO source "
+                                 "VALUES (?, ?, ?, ?)", entries)
+        except sqlite3.Error as err:
+            LOG.warning("Could not update the thumbnail index: %s", str(err))
+
+_INDEX = ThumbnailIndex(THUMB_INDEX)
+
+#-------------------------------------------------------------------------
+#
+# __get_digest
+#
+#-------------------------------------------------------------------------
+def __get_digest(src_file):
+    """
+    Return the content digest of a file, from the index if the file did not
+    change since it was last read.
+
+    :param src_file: filename of the source file
+    :type src_file: unicode
+    :rtype: unicode
+    """
+    stat = os.stat(src_file)
+    path = os.path.abspath(src_file)
+    digest = _INDEX.get(path, stat)
+    if digest is None:
+        digest = __hash_file(src_file)
+        _INDEX.add([(path, stat.st_mtime_ns, stat.st_size, digest)])
+    return digest
+
 #-------------------------------------------------------------------------
 #
 # __create_thumbnail_image
 #
 #-------------------------------------------------------------------------
-def __create_thumbnail_image(src_file, mtype=None, rectangle=None,
+def __create_thumbnail_image(src_file, filename, mtype=None, rectangle=None,
                              size=SIZE_NORMAL):
     """
     Generates the thumbnail image for a file. If the mime type is specified,
@@ -169,6 +313,8 @@ def __create_thumbnail_image(src_file, mtype=None, rectangle=None,
 
     :param src_file: filename of the source file
     :type src_file: unicode
+    :param filename: filename of the thumbnail
+    :type filename: unicode
     :param mtype: mime type of the specified file (optional)
     :type mtype: unicode
     :param rectangle: subsection rectangle
@@ -176,50 +322,71 @@ def __create_thumbnail_image(src_file, mtype=None, rectangle=None,
     :rtype: bool
     :returns: True is the thumbnailwas successfully generated
     """
-    filename = __build_thumb_path(src_file, rectangle, size)
-
     if mtype and not mtype.startswith('image/'):
         # Not an image, so run the thumbnailer
-        return run_thumbnailer(mtype, src_file, filename)
+        return run_thumbnailer(mtype, src_file, filename, size)
     else:
         # build a thumbnail by scaling the image using GTK's built in
         # routines.
         try:
             pixbuf = GdkPixbuf.Pixbuf.new_from_file(src_file)
-            width = pixbuf.get_width()
-            height = pixbuf.get_height()
-
-            if rectangle is not None:
-                upper_x = min(rectangle[0], rectangle[2])/100.
-                lower_x = max(rectangle[0], rectangle[2])/100.
-                upper_y = min(rectangle[1], rectangle[3])/100.
-                lower_y = max(rectangle[1], rectangle[3])/100.
-                sub_x = int(upper_x * width)
-                sub_y = int(upper_y * height)
-                sub_width = int((lower_x - upper_x) * width)
-                sub_height = int((lower_y - upper_y) * height)
-                if sub_width > 0 and sub_height > 0:
-                    pixbuf = pixbuf.new_subpixbuf(sub_x, sub_y, sub_width, sub_height)
-                    width = sub_width
-                    height = sub_height
-
-            if size == SIZE_LARGE:
-                thumbscale = THUMBSCALE_LARGE
-            else:
-                thumbscale = THUMBSCALE
-            scale = thumbscale / (float(max(width, height)))
-
-            scaled_width = int(width * scale)
-            scaled_height = int(height * scale)
-
-            pixbuf = pixbuf.scale_simple(scaled_width, scaled_height,
-                                         GdkPixbuf.InterpType.BILINEAR)
-            pixbuf.savev(filename, "png", "", "")
+            __save_thumbnail(pixbuf, filename, rectangle, size)
             return True
         except Exception as err:
             LOG.warning("Error scaling image down: %s", str(err))
             return False
 
+#-------------------------------------------------------------------------
+#
+# __save_thumbnail
+#
+#-------------------------------------------------------------------------
+def __save_thumbnail(pixbuf, filename, rectangle=None, size=SIZE_NORMAL):
+    """
+    Scale an image, or a subsection of it, to thumbnail size, and save it.
+
+    The thumbnail is written to a temporary file first, so that other
+    processes never see a partial thumbnail.
+
+    :param pixbuf: the source image
+    :type pixbuf: GdkPixbuf.Pixbuf
+    :param filename: filename of the thumbnail
+    :type filename: unicode
+    :param rectangle: subsection rectangle
+    :type rectangle: tuple
+    """
+    width = pixbuf.get_width()
+    height = pixbuf.get_height()
+
+    if rectangle is not None:
+        upper_x = min(rectangle[0], rectangle[2])/100.
+        lower_x = max(rectangle[0], rectangle[2])/100.
+        upper_y = min(rectangle[1], rectangle[3])/100.
+        lower_y = max(rectangle[1], rectangle[3])/100.
+        sub_x = int(upper_x * width)
+        sub_y = int(upper_y * height)
+        sub_width = int((lower_x - upper_x) * width)
+        sub_height = int((lower_y - upper_y) * height)
+        if sub_width > 0 and sub_height > 0:
+            pixbuf = pixbuf.new_subpixbuf(sub_x, sub_y, sub_width, sub_height)
+            width = sub_width
+            height = sub_height
+
+    if size == SIZE_LARGE:
+        thumbscale = THUMBSCALE_LARGE
+    else:
+        thumbscale = THUMBSCALE
+    scale = thumbscale / (float(max(width, height)))
+
+    scaled_width = int(width * scale)
+    scaled_height = int(height * scale)
+
+    pixbuf = pixbuf.scale_simple(scaled_width, scaled_height,
+                                 GdkPixbuf.InterpType.BILINEAR)
+    temp_name = "%s.%d.tmp" % (filename, os.getpid())
+    pixbuf.savev(temp_name, "png", "", "")
+    os.replace(temp_name, filename)
+
 #-------------------------------------------------------------------------
 #
 # find_mime_type_pixbuf
@@ -334,7 +501,8 @@ def get_thumbnail_path(src_file, mtype=None, rectangle=None, size=SIZE_NORMAL):
     """
     Return the path to the thumbnail image associated with the
     source file passed to the function. If the thumbnail does not exist,
-    or if it is older than the source file, we create a new thumbnail image.
+    which is also the case when the content of the source file changed, we
+    create a new thumbnail image.
 
     :param src_file: Source media file
     :type src_file: unicode
@@ -345,12 +513,150 @@ def get_thumbnail_path(src_file, mtype=None, rectangle=None, size=SIZE_NORMAL):
     :returns: thumbnail representing the source file
     :rtype: GdkPixbuf.Pixbuf
     """
-    filename = __build_thumb_path(src_file, rectangle, size)
     if not os.path.isfile(src_file):
         return os.path.join(IMAGE_DIR, "image-missing.png")
+    try:
+        digest = __get_digest(src_file)
+    except OSError as err:
+        LOG.warning("Error reading %s: %s", src_file, str(err))
+        return os.path.join(IMAGE_DIR, "document.png")
+    filename = __build_thumb_path(digest, rectangle, size)
+    if not os.path.isfile(filename):
+        if not __create_thumbnail_image(src_file, filename, mtype, rectangle,
+                                        size):
+            return os.path.join(IMAGE_DIR, "document.png")
+    return os.path.abspath(filename)
+
+#-------------------------------------------------------------------------
+#
+# build_thumbnails
+#
+#-------------------------------------------------------------------------
+def build_thumbnails(database, processes=None, callback=None):
+    """
+    Build the thumbnails of all the media objects of a database, so that
+    they do not have to be built when they are first shown.
+
+    The thumbnails of both sizes are built for each media file, and for each
+    subsection rectangle of the media references.  The files are read and
+    scaled in a pool of worker processes.  Thumbnails which already exist
+    for the current content of a file are kept.
+
+    :param database: the database of the media objects
+    :type database: DbReadBase
+    :param processes: the number of worker processes, below two to build
+                      the thumbnails in this process; None for the
+                      behavior.worker-processes option
+    :type processes: int
+    :param callback: function called with the percentage of files done
+    :type callback: function
+    :returns: the numbers of files with new thumbnails, of files with
+              current thumbnails, of missing files, and of thumbnails which
+              could not be built
+    :rtype: tuple
+    """
+    rectangles = {}
+    for media in database.iter_media():
+        rectangles[media.handle] = {None}
+    for method in (database.iter_people, database.iter_families,
+                   database.iter_events, database.iter_places,
+                   database.iter_sources, database.iter_citations):
+        for obj in method():
+            for media_ref in obj.get_media_list():
+                rectangle = media_ref.get_rectangle()
+                if (rectangle is not None and
+                        media_ref.ref in rectangles):
+                    rectangles[media_ref.ref].add(tuple(rectangle))
+
+    # Media objects sharing a file share its thumbnails
+    sources = {}
+    for media in database.iter_media():
+        path = media_path_full(database, media.get_path())
+        mtype, targets = sources.setdefault(path, (media.get_mime_type(),
+                                                   set()))
+        targets.update((rectangle, size)
+                       for rectangle in rectangles[media.handle]
+                       for size in SIZES)
+
+    jobs = []
+    current = missing = 0
+    for path, (mtype, targets) in sources.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            missing += 1
+            continue
+        targets = sorted(targets, key=str)
+        digest = _INDEX.get(os.path.abspath(path), stat)
+        if digest is not None and all(
+                os.path.isfile(__build_thumb_path(digest, rectangle, size))
+                for (rectangle, size) in targets):
+            current += 1
+            continue
+        jobs.append((path, mtype, targets))
+
+    if processes is None:
+        processes = get_worker_processes()
+    pool = None
+    if processes > 1 and len(jobs) > 1:
+        pool = start_pool(min(processes, len(jobs)))
+        results = pool.imap_unordered(_build_source, jobs, CHUNK_SIZE)
     else:
-        if (not os.path.isfile(filename)) or (
-                os.path.getmtime(src_file) > os.path.getmtime(filename)):
-            if not __create_thumbnail_image(src_file, mtype, rectangle, size):
-                return os.path.join(IMAGE_DIR, "document.png")
-        return os.path.abspath(filename)
+        results = map(_build_source, jobs)
+    entries = []
+    built = failed = 0
+    try:
+        for count, (path, mtime, size, digest, failures) in enumerate(
+                results, 1):
+            if digest is not None:
+                entries.append((path, mtime, size, digest))
+            if failures:
+                failed += failures
+            else:
+                built += 1
+            if callback:
+                callback(100 * count // len(jobs))
+    finally:
+        if pool is not None:
+            stop_pool(pool)
+        _INDEX.add(entries)
+    return built, current, missing, failed
+
+def _build_source(job):
+    """
+    Build the thumbnails of a source file in a worker process.  An image is
+    only read once for all its thumbnails.
+
+    :returns: the absolute path, modification time, size and digest of the
+              file, and the number of thumbnails which could not be built
+    """
+    path, mtype, targets = job
+    try:
+        stat = os.stat(path)
+        digest = __hash_file(path)
+    except OSError as err:
+        LOG.warning("Error reading %s: %s", path, str(err))
+        return path, None, None, None, len(targets)
+    targets = [(rectangle, size, __build_thumb_path(digest, rectangle, size))
+               for (rectangle, size) in targets]
+    targets = [target for target in targets if not os.path.isfile(target[2])]
+    failed = 0
+    if mtype and not mtype.startswith('image/'):
+        for rectangle, size, filename in targets:
+            if not run_thumbnailer(mtype, path, filename, size):
+                failed += 1
+    elif targets:
+        try:
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+        except Exception as err:
+            LOG.warning("Error scaling image down: %s", str(err))
+            failed = len(targets)
+        else:
+            for rectangle, size, filename in targets:
+                try:
+                    __save_thumbnail(pixbuf, filename, rectangle, size)
+                except Exception as err:
+                    LOG.warning("Error scaling image down: %s", str(err))
+                    failed += 1
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, digest,
+            failed)
@@ -44,7 +44,8 @@ from ...user import User
 from gramps.gen.proxy import (PrivateProxyDb,
                               LivingProxyDb,
                               FilterProxyDb,
-                              ReferencedBySelectionProxyDb)
+                              ReferencedBySelectionProxyDb,
+                              MaterializedProxyDb)
 
 #-------------------------------------------------------------------------
 #
@@ -571,6 +572,7 @@ class WriterOptionBox:
             return self.preview_dbase
 
         self.proxy_dbase.clear()
+        full_dbase = dbase
         for proxy_name in self.get_proxy_names():
             dbase = self.apply_proxy(proxy_name, dbase, progress)
             if preview:
@@ -582,6 +584,13 @@ class WriterOptionBox:
                     ngettext("{number_of} Person",
                              "{number_of} People", people_count
                             ).format(number_of=people_count) )
+        if dbase is not full_dbase:
+            # Resolve the chain of proxies once, rather than for every
+            # object the exporter reads
+            if progress:
+                progress.reset(_("Collecting filtered data"))
+                progress.update(progress.progress_cnt)
+            dbase = MaterializedProxyDb(dbase)
         return dbase
 
     def apply_proxy(self, proxy_name, dbase, progress=None):
@@ -758,24 +767,57 @@ class WriterOptionBoxWithCompression(WriterOptionBox):
     """
     Extends the WriterOptionBox with option for using compression.
     """
+    # gzip compression levels offered
+    COMPRESSION_LEVELS = [(1, _('Fast')),
+                          (6, _('Normal')),
+                          (9, _('Best'))]
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.use_compression = _gzip_ok
         self.use_compression_check = None
+        self.compression_level = config.get('export.xml-compression-level')
+        self.compression_combo = None
 
     def get_use_compression(self):
         return self.use_compression
 
+    def get_compression_level(self):
+        """
+        Return the gzip compression level, from 1 (fast) to 9 (best).
+        """
+        return self.compression_level
+
     def get_option_box(self):
-        from gi.repository import Gtk
+        from gi.repository import Gtk, GObject
         option_box = super().get_option_box()
         self.use_compression_check = Gtk.CheckButton(label=_("Use Compression"))
         self.use_compression_check.set_active(1)
         self.use_compression_check.set_sensitive(_gzip_ok)
         option_box.pack_start(self.use_compression_check, False, True, 0)
+
+        box = Gtk.Box()
+        label = Gtk.Label(label=_("Compression Level") + COLON)
+        box.pack_start(label, False, True, 0)
+        self.compression_combo = Gtk.ComboBoxText()
+        active = 0
+        for index, (level, name) in enumerate(self.COMPRESSION_LEVELS):
+            self.compression_combo.append_text(name)
+            if level <= self.compression_level:
+                active = index
+        self.compression_combo.set_active(active)
+        box.pack_start(self.compression_combo, True, True, 0)
+        option_box.pack_start(box, False, True, 0)
+        self.use_compression_check.bind_property(
+            'active', box, 'sensitive', GObject.BindingFlags.SYNC_CREATE)
         return option_box
 
     def parse_options(self):
         super().parse_options()
         if self.use_compression_check:
             self.use_compression = self.use_compression_check.get_active()
+            index = self.compression_combo.get_active()
+            self.compression_level = self.COMPRESSION_LEVELS[index][0]
+            if self.use_compression:
+                config.set('export.xml-compression-level',
+                           self.compression_level)
@@ -195,7 +195,7 @@ class PeopleBaseModel(BaseModel):
             return ''
 
     def _get_spouse_data(self, data):
-        spouses_names = ""
+        spouse_handles = []
         for family_handle in data[COLUMN_FAMILY]:
             family = self.db.get_family_from_handle(family_handle)
             for spouse_id in [family.get_father_handle(),
@@ -204,11 +204,9 @@ class PeopleBaseModel(BaseModel):
                     continue
                 if spouse_id == data[0]:
                     continue
-                spouse = self.db.get_person_from_handle(spouse_id)
-                if spouses_names:
-                    spouses_names += ", "
-                spouses_names += name_displayer.display(spouse)
-        return spouses_names
+                spouse_handles.append(spouse_id)
+        return ", ".join(name_displayer.display_handles(self.db,
+                                                        spouse_handles))
 
     def column_id(self, data):
         return data[COLUMN_ID]
@@ -39,24 +39,285 @@ from gramps.gen.db.dbconst import (DBLOGNAME, DBBACKEND, KEY_TO_NAME_MAP,
                                    PERSON_KEY, FAMILY_KEY, SOURCE_KEY,
                                    EVENT_KEY, MEDIA_KEY, PLACE_KEY, NOTE_KEY,
                                    TAG_KEY, CITATION_KEY, REPOSITORY_KEY,
-                                   REFERENCE_KEY)
+                                   REFERENCE_KEY, CLASS_TO_KEY_MAP, ARRAYSIZE)
 from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.codec import BlobCodec
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.lib import (Tag, Media, Person, Family, Source,
                             Citation, Event, Place, Repository, Note)
 from gramps.gen.lib.genderstats import GenderStats
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.utils.grampslocale import HAVE_ICU
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+BULK_SIZE = 10000           # The number of rows buffered by a bulk load
+
+#------------------------------------------------------------------------
+#
+# Bulk load
+#
+#------------------------------------------------------------------------
+class BulkLoad:
+    """
+    The state of a bulk load into a DB-API database.
+
+    Committed objects are buffered as rows until BULK_SIZE rows are pending,
+    so that repeated commits of the same object during an import write a
+    single row.  The handles and Gramps IDs of all objects written during
+    the load are kept, so that lookups by handle or ID need not query
+    tables that were empty when the load started.
+    """
+    def __init__(self, empty):
+        self.empty = empty
+        self.rows = {}
+        self.gramps_ids = {}
+        self.handles = {}
+        self.count = 0
+
+    def get_row(self, obj_key, handle):
+        """
+        Return the pending row of an object, or None.
+        """
+        rows = self.rows.get(obj_key)
+        if rows:
+            return rows.get(handle)
+        return None
+
+    def add_row(self, obj_key, handle, row):
+        """
+        Buffer a row.  The row is a (blob, gramps_id, values, in_db) tuple.
+        """
+        rows = self.rows.setdefault(obj_key, {})
+        if handle not in rows:
+            self.count += 1
+        rows[handle] = row
+        self.track(obj_key, handle, row[1])
+
+    def track(self, obj_key, handle, gramps_id):
+        """
+        Record the Gramps ID of an object written during the load.
+        """
+        gramps_ids = self.gramps_ids.setdefault(obj_key, {})
+        handles = self.handles.setdefault(obj_key, {})
+        old_id = gramps_ids.get(handle)
+        if old_id != gramps_id and handles.get(old_id) == handle:
+            del handles[old_id]
+        gramps_ids[handle] = gramps_id
+        handles[gramps_id] = handle
+
+    def untrack(self, obj_key, handle):
+        """
+        Forget an object removed during the load.
+        """
+        gramps_id = self.gramps_ids.get(obj_key, {}).pop(handle, None)
+        handles = self.handles.get(obj_key, {})
+        if handles.get(gramps_id) == handle:
+            del handles[gramps_id]
+
+    def is_written(self, obj_key, handle):
+        """
+        Return True if the object was written during the load.
+        """
+        return handle in self.gramps_ids.get(obj_key, ())
+
+    def get_handle(self, obj_key, gramps_id):
+        """
+        Return the handle of the object with the given Gramps ID written
+        during the load, or None.
+        """
+        return self.handles.get(obj_key, {}).get(gramps_id)
+
+#------------------------------------------------------------------------
+#
+# Ancestry index
+#
+#------------------------------------------------------------------------
+def _ancestry_parents(person_data, get_family):
+    """
+    Return the parents of a person in the ancestry index.
+
+    These are the fathers and mothers of all parent families.  A family
+    without parents stands for the unknown parents of its children.
+
+    :param person_data: serialized person.
+    :type person_data: tuple
+    :param get_family: function returning the (father handle, mother handle)
+                       of a family, or None.
+    :type get_family: callable
+    """
+    parents = []
+    for family_handle in person_data[9]:        # parent family list
+        family = get_family(family_handle)
+        if family is None:
+            continue
+        if family[0] or family[1]:
+            parents.extend(handle for handle in family if handle)
+        else:
+            parents.append(family_handle)
+    return parents
+
+def _ancestry_closures(parents, get_closure, get_parents):
+    """
+    Compute the ancestors of a group of people.
+
+    People are processed after their parents in the group, so that their
+    ancestors are derived from those of their parents.  People in a loop
+    of ancestry are processed last, by walking up their ancestors.
+
+    :param parents: dictionary mapping the handles of the people to their
+                    parents, or to None if there is no such person.
+    :type parents: dict
+    :param get_closure: function returning the ancestors of a parent who
+                        is not in the group.
+    :type get_closure: callable
+    :param get_parents: function returning the parents of any person, or
+                        None.
+    :type get_parents: callable
+    :returns: iterator over (handle, {ancestor handle: depth}) pairs.
+    """
+    inner_parents = {}
+    children = {}
+    for handle, handle_parents in parents.items():
+        if handle_parents is None:
+            continue
+        inner = set(parent for parent in handle_parents
+                    if parents.get(parent) is not None)
+        inner.discard(handle)
+        inner_parents[handle] = inner
+        for parent in inner:
+            children.setdefault(parent, []).append(handle)
+
+    # The ancestors of a person are kept until all their children are done
+    waiting = {handle: len(inner) for handle, inner in inner_parents.items()}
+    unfinished = {handle: len(handle_children)
+                  for handle, handle_children in children.items()}
+    closures = {}
+    ready = [handle for handle, count in waiting.items() if count == 0]
+    while ready:
+        handle = ready.pop()
+        del waiting[handle]
+        closure = {handle: 0}
+        for parent in parents[handle]:
+            if parent in closures:
+                parent_closure = closures[parent]
+            elif parent in parents:
+                parent_closure = {parent: 0}
+            else:
+                parent_closure = get_closure(parent)
+            for ancestor, depth in parent_closure.items():
+                if closure.get(ancestor, depth + 2) > depth + 1:
+                    closure[ancestor] = depth + 1
+        yield handle, closure
+        for parent in inner_parents[handle]:
+            unfinished[parent] -= 1
+            if unfinished[parent] == 0:
+                del closures[parent]
+        if handle in children:
+            closures[handle] = closure
+            for child in children[handle]:
+                waiting[child] -= 1
+                if waiting[child] == 0:
+                    ready.append(child)
+
+    for handle in waiting:
+        closure = {handle: 0}
+        generation = [handle]
+        depth = 0
+        while generation:
+            depth += 1
+            next_generation = []
+            for person_handle in generation:
+                for parent in get_parents(person_handle) or ():
+                    if parent not in closure:
+                        closure[parent] = depth
+                        next_generation.append(parent)
+            generation = next_generation
+        yield handle, closure
+
+#------------------------------------------------------------------------
+#
+# Sort keys
+#
+#------------------------------------------------------------------------
+# The (column, sort key column) pairs of the sorted secondary columns
+SORT_KEY_COLUMNS = {
+    'person': (('surname', 'surname_key'), ('given_name', 'given_name_key')),
+    'source': (('title', 'title_key'), ),
+    'citation': (('page', 'page_key'), ),
+    'place': (('title', 'title_key'), ),
+    'media': (('desc', 'desc_key'), ),
+    'tag': (('name', 'name_key'), ),
+}
+
+def _sort_key(value):
+    """
+    Return the sort key of a text in the collation of the locale.
+
+    The key is encoded in UTF-32BE, so that the database compares the bytes
+    of two keys like Python compares the keys, and like the locale compares
+    the texts.
+    """
+    if value is None:
+        return None
+    return glocale.sort_key(value).encode('utf-32-be', 'surrogatepass')
+
+def _sort_key_collation():
+    """
+    Return the collation of the sort keys.
+    """
+    return (glocale.get_collation(),
+            bool(HAVE_ICU and glocale.collator is not None))
+
 class DBAPI(DbGeneric):
     """
     Database backends class for DB-API 2.0 databases
     """
+    def __init__(self, directory=None):
+        self.codec = BlobCodec(compress=config.get('database.compress-blobs'))
+        self._ancestry_exists = None
+        self._sort_keys_exist = None
+        self._sort_keys_current = False
+        self._bulk = None
+        self.__secondary_fields = {}
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
+    def _is_reader(self):
+        return self.dbapi.is_reader()
+
+    @property
+    def _bulk(self):
+        """
+        The running bulk load, see :class:`BulkLoad`.  Its buffered rows are
+        not committed, so they are only seen, and written, by the writer.
+        """
+        if self.__bulk is None or self._is_reader():
+            return None
+        return self.__bulk
+
+    @_bulk.setter
+    def _bulk(self, bulk):
+        self.__bulk = bulk
+
+    def load(self, *args, **kwargs):
+        """
+        Open the database.
+
+        The sort keys of a database last written in another collation are
+        rebuilt, unless the database is read-only.  Until then, and in a
+        read-only database, the secondary columns are sorted by the collation
+        function.
+        """
+        super().load(*args, **kwargs)
+        self._sort_keys_exist = None
+        if self._has_sort_keys() and not self._sort_keys_current:
+            self.reindex_sort_keys()
+
     def _schema_exists(self):
         """
         Check to see if the schema exists.
@@ -181,8 +442,6 @@ class DBAPI(DbGeneric):
                            'ON place(gramps_id)')
         self.dbapi.execute('CREATE INDEX tag_name '
                            'ON tag(name)')
-        self.dbapi.execute('CREATE INDEX reference_ref_handle '
-                           'ON reference(ref_handle)')
         self.dbapi.execute('CREATE INDEX family_gramps_id '
                            'ON family(gramps_id)')
         self.dbapi.execute('CREATE INDEX event_gramps_id '
@@ -191,13 +450,23 @@ class DBAPI(DbGeneric):
                            'ON repository(gramps_id)')
         self.dbapi.execute('CREATE INDEX note_gramps_id '
                            'ON note(gramps_id)')
-        self.dbapi.execute('CREATE INDEX reference_obj_handle '
-                           'ON reference(obj_handle)')
+        self._create_reference_indexes()
+        self._create_ancestry_schema()
+        self._create_sort_key_columns()
+        self.dbapi.execute("INSERT INTO metadata (setting, value) "
+                           "VALUES (?, ?)",
+                           ['sort_key_collation',
+                            pickle.dumps(_sort_key_collation())])
+        self._sort_keys_current = True
 
         self.dbapi.commit()
 
     def _close(self):
         self.dbapi.close()
+        self._ancestry_exists = None
+        self._sort_keys_exist = None
+        self._sort_keys_current = False
+        self._bulk = None
 
     def _txn_begin(self):
         """
@@ -224,16 +493,28 @@ class DBAPI(DbGeneric):
         """
         if self.transaction == None:
             self.dbapi.rollback()
+            self.clear_cache()
 
     def transaction_begin(self, transaction):
         """
         Transactions are handled automatically by the db layer.
+
+        A batch transaction created with bulk=True starts a bulk load:
+        committed objects are buffered and written in batches, see
+        :class:`BulkLoad`.
         """
         _LOG.debug("    %sDBAPI %s transaction begin for '%s'",
                    "Batch " if transaction.batch else "",
                    hex(id(self)), transaction.get_description())
         self.transaction = transaction
         self.dbapi.begin()
+        if transaction.batch and getattr(transaction, 'bulk', False):
+            empty = set()
+            for obj_key, table in KEY_TO_NAME_MAP.items():
+                self.dbapi.execute("SELECT 1 FROM %s LIMIT 1" % table)
+                if self.dbapi.fetchone() is None:
+                    empty.add(obj_key)
+            self._bulk = BulkLoad(empty)
         return transaction
 
     def transaction_commit(self, txn):
@@ -249,8 +530,11 @@ class DBAPI(DbGeneric):
                   TXNDEL: "-delete",
                   None: "-delete"}
         if txn.batch:
+            self._flush_bulk()
+            self._bulk = None
             # FIXME: need a User GUI update callback here:
             self.reindex_reference_map(lambda percent: percent)
+            self.reindex_ancestry()
         self.dbapi.commit()
         if not txn.batch:
             # Now, emit signals:
@@ -283,6 +567,9 @@ class DBAPI(DbGeneric):
         Executed after a batch operation abort.
         """
         self.dbapi.rollback()
+        # The cache may hold data written during the transaction
+        self.clear_cache()
+        self._bulk = None
         self.transaction = None
         txn.clear()
         txn.first = None
@@ -360,7 +647,11 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM person '
+                               'ORDER BY surname_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -382,7 +673,23 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT family.handle '
+                               'FROM family '
+                               'LEFT JOIN person AS father '
+                               'ON family.father_handle = father.handle '
+                               'LEFT JOIN person AS mother '
+                               'ON family.mother_handle = mother.handle '
+                               'ORDER BY (CASE WHEN father.handle IS NULL '
+                               'THEN mother.surname_key '
+                               'ELSE father.surname_key '
+                               'END), '
+                               '(CASE WHEN father.handle IS NULL '
+                               'THEN mother.given_name_key '
+                               'ELSE father.given_name_key '
+                               'END)')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -412,6 +719,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Event in the
         database.
         """
+        self._flush_bulk()
         self.dbapi.execute("SELECT handle FROM event")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -426,7 +734,11 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM citation '
+                               'ORDER BY page_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -448,7 +760,11 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM source '
+                               'ORDER BY title_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -470,7 +786,11 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM place '
+                               'ORDER BY title_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -487,6 +807,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Repository in
         the database.
         """
+        self._flush_bulk()
         self.dbapi.execute("SELECT handle FROM repository")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -501,7 +822,11 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM media '
+                               'ORDER BY desc_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -518,6 +843,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Note in the
         database.
         """
+        self._flush_bulk()
         self.dbapi.execute("SELECT handle FROM note")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -532,7 +858,11 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        self._flush_bulk()
+        if sort_handles and self._can_use_sort_keys(locale):
+            self.dbapi.execute('SELECT handle FROM tag '
+                               'ORDER BY name_key')
+        elif sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
 
@@ -550,13 +880,15 @@ class DBAPI(DbGeneric):
 
         If no such Tag exists, None is returned.
         """
+        self._flush_bulk()
         self.dbapi.execute("SELECT blob_data FROM tag WHERE name = ?", [name])
         row = self.dbapi.fetchone()
         if row:
-            return Tag.create(pickle.loads(row[0]))
+            return Tag.create(self.codec.decode(row[0]))
         return None
 
     def _get_number_of(self, obj_key):
+        self._flush_bulk()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT count(1) FROM %s" % table
         self.dbapi.execute(sql)
@@ -602,21 +934,24 @@ class DBAPI(DbGeneric):
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
 
-        if self._has_handle(obj_key, obj.handle):
-            old_data = self._get_raw_data(obj_key, obj.handle)
+        blob = self.codec.encode(obj.serialize())
+        if self._bulk is not None:
+            return self._commit_bulk(obj, obj_key, blob)
+        old_data = self._get_cached_raw_data(obj_key, obj.handle)
+        if old_data:
             # update the object:
             sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-            self.dbapi.execute(sql,
-                               [pickle.dumps(obj.serialize()),
-                                obj.handle])
+            self.dbapi.execute(sql, [blob, obj.handle])
         else:
             # Insert the object:
             sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
-            self.dbapi.execute(sql,
-                               [obj.handle,
-                                pickle.dumps(obj.serialize())])
+            self.dbapi.execute(sql, [obj.handle, blob])
+        # Write through with a copy that is not shared with the object
+        self._cache_raw_data(obj_key, obj.handle, self.codec.decode(blob))
         self._update_secondary_values(obj)
         if not trans.batch:
+            if obj_key in (PERSON_KEY, FAMILY_KEY):
+                self._update_ancestry(obj_key, old_data, obj.serialize())
             self._update_backlinks(obj, trans)
             if old_data:
                 trans.add(obj_key, TXNUPD, obj.handle,
@@ -629,6 +964,58 @@ class DBAPI(DbGeneric):
 
         return old_data
 
+    def _commit_bulk(self, obj, obj_key, blob):
+        """
+        Buffer a committed object during a bulk load.
+        """
+        row = self._bulk.get_row(obj_key, obj.handle)
+        if row:
+            old_data = self.codec.decode(row[0])
+            in_db = row[3]
+        else:
+            old_data = self._get_cached_raw_data(obj_key, obj.handle)
+            in_db = old_data is not None
+        self._bulk.add_row(obj_key, obj.handle,
+                           (blob, obj.gramps_id if obj_key != TAG_KEY else
+                            None, self._get_secondary_values(obj)[1], in_db))
+        self._cache_raw_data(obj_key, obj.handle, self.codec.decode(blob))
+        if self._bulk.count >= BULK_SIZE:
+            self._flush_bulk()
+        return old_data
+
+    def _flush_bulk(self):
+        """
+        Write the rows buffered by a bulk load to the database.
+        """
+        if self._bulk is None or not self._bulk.count:
+            return
+        for obj_key, rows in self._bulk.rows.items():
+            if not rows:
+                continue
+            table = KEY_TO_NAME_MAP[obj_key]
+            obj_class = self._get_table_func(KEY_TO_CLASS_MAP[obj_key],
+                                             "class_func")
+            columns = self._get_secondary_columns(obj_class)
+            inserts = []
+            updates = []
+            for handle, (blob, gramps_id, values, in_db) in rows.items():
+                if in_db:
+                    updates.append([blob] + values + [handle])
+                else:
+                    inserts.append([handle, blob] + values)
+            if inserts:
+                self.dbapi.executemany(
+                    "INSERT INTO %s (handle, blob_data%s) VALUES (?, ?%s)"
+                    % (table, "".join(", " + column for column in columns),
+                       ", ?" * len(columns)), inserts)
+            if updates:
+                self.dbapi.executemany(
+                    "UPDATE %s SET blob_data = ?%s WHERE handle = ?"
+                    % (table, "".join(", %s = ?" % column
+                                      for column in columns)), updates)
+            rows.clear()
+        self._bulk.count = 0
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
@@ -636,21 +1023,24 @@ class DBAPI(DbGeneric):
         """
         table = KEY_TO_NAME_MAP[obj_key]
         handle = data[0]
+        self._flush_bulk()
 
         if self._has_handle(obj_key, handle):
             # update the object:
             sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
             self.dbapi.execute(sql,
-                               [pickle.dumps(data),
+                               [self.codec.encode(data),
                                 handle])
         else:
             # Insert the object:
             sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
             self.dbapi.execute(sql,
                                [handle,
-                                pickle.dumps(data)])
-
-        return
+                                self.codec.encode(data)])
+        self._uncache_raw_data(obj_key, handle)
+        if self._bulk is not None:
+            self._bulk.track(obj_key, handle,
+                             data[1] if obj_key != TAG_KEY else None)
 
     def _update_backlinks(self, obj, transaction):
 
@@ -668,17 +1058,16 @@ class DBAPI(DbGeneric):
                                                             current_references)
         new_references = current_references.difference(existing_references)
 
-        # Delete the existing references
-        self.dbapi.execute("DELETE FROM reference WHERE obj_handle = ?",
-                           [obj.handle])
-
-        # Now, add the current ones
-        for (ref_class_name, ref_handle) in current_references:
-            sql = ("INSERT INTO reference " +
-                   "(obj_handle, obj_class, ref_handle, ref_class)" +
-                   "VALUES(?, ?, ?, ?)")
-            self.dbapi.execute(sql, [obj.handle, obj.__class__.__name__,
-                                     ref_handle, ref_class_name])
+        # Only touch the rows that actually changed
+        if no_longer_required_references:
+            self.dbapi.executemany(
+                "DELETE FROM reference "
+                "WHERE obj_handle = ? AND ref_handle = ?",
+                [(obj.handle, ref_handle) for (ref_class_name, ref_handle)
+                 in no_longer_required_references])
+        self._insert_references(
+            [(obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
+             for (ref_class_name, ref_handle) in new_references])
 
         if not transaction.batch:
             # Add new references to the transaction
@@ -695,17 +1084,54 @@ class DBAPI(DbGeneric):
                             ref_handle, ref_class_name)
                 transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
 
+    def _insert_references(self, rows):
+        """
+        Insert a batch of reference map rows.
+
+        :param rows: (obj_handle, obj_class, ref_handle, ref_class) tuples.
+        :type rows: list
+        """
+        if rows:
+            self.dbapi.executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)", rows)
+
+    def _create_reference_indexes(self):
+        """
+        Create the indexes on the reference map.
+        """
+        self.dbapi.execute('CREATE INDEX reference_ref_handle '
+                           'ON reference(ref_handle)')
+        self.dbapi.execute('CREATE INDEX reference_obj_handle '
+                           'ON reference(obj_handle)')
+
+    def _drop_reference_indexes(self):
+        """
+        Drop the indexes on the reference map.
+        """
+        self.dbapi.execute('DROP INDEX IF EXISTS reference_ref_handle')
+        self.dbapi.execute('DROP INDEX IF EXISTS reference_obj_handle')
+
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
-        if self._has_handle(obj_key, handle):
+        self._flush_bulk()
+        # Checked before the object is forgotten by the bulk load, which
+        # would then not look for it in a table that was empty
+        exists = self._has_handle(obj_key, handle)
+        if self._bulk is not None:
+            self._bulk.untrack(obj_key, handle)
+        if exists:
             data = self._get_raw_data(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
             self._remove_backlinks(obj_class, handle, transaction)
             table = KEY_TO_NAME_MAP[obj_key]
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            self._uncache_raw_data(obj_key, handle)
             if not transaction.batch:
+                self._update_ancestry(obj_key, data, None)
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
     def _remove_backlinks(self, obj_class, obj_handle, transaction):
@@ -756,6 +1182,7 @@ class DBAPI(DbGeneric):
         """
         Returns first person in the database
         """
+        self._flush_bulk()
         handle = self.get_default_handle()
         person = None
         if handle:
@@ -771,46 +1198,63 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over handles in the database
         """
+        self._flush_bulk()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT handle FROM %s" % table
-        self.dbapi.execute(sql)
-        rows = self.dbapi.fetchall()
-        for row in rows:
+        for row in self._iter_rows(sql):
             yield row[0]
 
     def _iter_raw_data(self, obj_key):
         """
         Return an iterator over raw data in the database.
         """
+        self._flush_bulk()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT handle, blob_data FROM %s" % table
-        with self.dbapi.cursor() as cursor:
-            cursor.execute(sql)
-            rows = cursor.fetchmany()
-            while rows:
-                for row in rows:
-                    yield (row[0], pickle.loads(row[1]))
-                rows = cursor.fetchmany()
+        for row in self._iter_rows(sql):
+            yield (row[0], self.codec.decode(row[1]))
 
     def _iter_raw_place_tree_data(self):
         """
         Return an iterator over raw data in the place hierarchy.
+
+        A place is always returned after the place that encloses it.
         """
-        to_do = ['']
-        sql = 'SELECT handle, blob_data FROM place WHERE enclosed_by = ?'
-        while to_do:
-            handle = to_do.pop()
-            self.dbapi.execute(sql, [handle])
-            rows = self.dbapi.fetchall()
-            for row in rows:
-                to_do.append(row[0])
-                yield (row[0], pickle.loads(row[1]))
+        self._flush_bulk()
+        sql = ('WITH RECURSIVE place_tree(handle, blob_data) AS ('
+               'SELECT handle, blob_data FROM place WHERE enclosed_by = ? '
+               'UNION ALL '
+               'SELECT place.handle, place.blob_data '
+               'FROM place JOIN place_tree '
+               'ON place.enclosed_by = place_tree.handle) '
+               'SELECT handle, blob_data FROM place_tree')
+        for row in self._iter_rows(sql, ['']):
+            yield (row[0], self.codec.decode(row[1]))
+
+    def _iter_rows(self, sql, args=None):
+        """
+        Execute a query on a separate cursor and return an iterator over the
+        resulting rows, fetched in batches of ARRAYSIZE rows.
+        """
+        with self.dbapi.cursor() as cursor:
+            if args is None:
+                cursor.execute(sql)
+            else:
+                cursor.execute(sql, args)
+            rows = cursor.fetchmany()
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany()
 
     def reindex_reference_map(self, callback):
         """
         Reindex all primary records in the database.
         """
+        self._flush_bulk()
         self._txn_begin()
+        # Loading into an unindexed table and indexing once at the end is
+        # much cheaper than maintaining the indexes row by row.
+        self._drop_reference_indexes()
         self.dbapi.execute("DELETE FROM reference")
         total = 0
         for tbl in ('people', 'families', 'events', 'places', 'sources',
@@ -832,25 +1276,262 @@ class DBAPI(DbGeneric):
         )
         # Now we use the functions and classes defined above
         # to loop through each of the primary object tables.
+        rows = []
         for cursor_func, class_func in primary_table:
             logging.info("Rebuilding %s reference map", class_func.__name__)
+            class_name = class_func.__name__
             with cursor_func() as cursor:
                 for found_handle, val in cursor:
                     obj = class_func.create(val)
                     references = set(obj.get_referenced_handles_recursively())
-                    # handle addition of new references
-                    for (ref_class_name, ref_handle) in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [obj.handle,
-                             obj.__class__.__name__,
-                             ref_handle,
-                             ref_class_name])
+                    rows.extend((obj.handle, class_name,
+                                 ref_handle, ref_class_name)
+                                for (ref_class_name, ref_handle) in references)
+                    if len(rows) >= ARRAYSIZE:
+                        self._insert_references(rows)
+                        rows = []
                     self.update()
+        self._insert_references(rows)
+        self._create_reference_indexes()
+        self._txn_commit()
+
+    def _create_ancestry_schema(self):
+        """
+        Create the ancestry index.
+
+        Each row links a person to one of their ancestors, with the number
+        of generations between them.  See :meth:`get_ancestors`.
+        """
+        self.dbapi.execute('CREATE TABLE ancestry '
+                           '('
+                           'handle VARCHAR(50), '
+                           'ancestor_handle VARCHAR(50), '
+                           'depth INTEGER'
+                           ')')
+        self.dbapi.execute('CREATE INDEX ancestry_handle '
+                           'ON ancestry(handle, ancestor_handle)')
+        self.dbapi.execute('CREATE INDEX ancestry_ancestor_handle '
+                           'ON ancestry(ancestor_handle)')
+        self._ancestry_exists = True
+
+    def _has_ancestry(self):
+        """
+        Return True if the database has an ancestry index.
+
+        The index is missing from a database of an older schema opened
+        read-only.
+        """
+        if self._ancestry_exists is None:
+            self._ancestry_exists = self.dbapi.table_exists("ancestry")
+        return self._ancestry_exists
+
+    def _can_use_ancestry(self):
+        """
+        Return True if the ancestry index is up to date.
+
+        The index is only rebuilt at the end of a batch transaction.
+        """
+        return (self._has_ancestry() and
+                not (self.transaction is not None and self.transaction.batch))
+
+    def _get_ancestry_parents(self, handle):
+        """
+        Return the parents of a person in the ancestry index, or None if
+        there is no such person.
+        """
+        data = self._get_cached_raw_data(PERSON_KEY, handle)
+        if data is None:
+            return None
+        return _ancestry_parents(data, self._get_ancestry_family)
+
+    def _get_ancestry_family(self, handle):
+        """
+        Return the father and mother handles of a family, or None.
+        """
+        data = self._get_cached_raw_data(FAMILY_KEY, handle)
+        if data is None:
+            return None
+        return data[2], data[3]
+
+    def _get_ancestry_closure(self, handle):
+        """
+        Return the stored ancestors of a person, or of a family without
+        parents.
+        """
+        self.dbapi.execute("SELECT ancestor_handle, depth FROM ancestry "
+                           "WHERE handle = ?", [handle])
+        return dict(self.dbapi.fetchall()) or {handle: 0}
+
+    def _update_ancestry(self, obj_key, old_data, new_data):
+        """
+        Update the ancestry index after a person or family has changed.
+
+        The ancestors of the people whose parents depend on the object are
+        recomputed, along with those of all their descendants.
+        """
+        if obj_key == PERSON_KEY:
+            if (old_data is not None and new_data is not None and
+                    old_data[9] == new_data[9]):  # parent family list
+                return
+            roots = {(old_data or new_data)[0]}
+        elif obj_key == FAMILY_KEY:
+            children = [[child_ref[3] for child_ref in data[4]]
+                        for data in (old_data, new_data) if data is not None]
+            if (old_data is not None and new_data is not None and
+                    old_data[2:4] == new_data[2:4] and
+                    children[0] == children[1]):
+                return
+            roots = set()
+            for child_list in children:
+                roots.update(child_list)
+        else:
+            return
+        if not roots or not self._has_ancestry():
+            return
+
+        affected = set(roots)
+        for handle in roots:
+            self.dbapi.execute("SELECT handle FROM ancestry "
+                               "WHERE ancestor_handle = ?", [handle])
+            affected.update(row[0] for row in self.dbapi.fetchall())
+        self.dbapi.executemany("DELETE FROM ancestry WHERE handle = ?",
+                               [(handle, ) for handle in affected])
+        parents = {handle: self._get_ancestry_parents(handle)
+                   for handle in affected}
+        self._insert_ancestry(_ancestry_closures(
+            parents, self._get_ancestry_closure, self._get_ancestry_parents))
+
+    def _insert_ancestry(self, closures):
+        """
+        Insert the ancestors of people into the ancestry index.
+
+        :param closures: (handle, {ancestor handle: depth}) pairs.
+        :type closures: iterator
+        """
+        rows = []
+        for handle, closure in closures:
+            rows.extend((handle, ancestor, depth)
+                        for ancestor, depth in closure.items())
+            if len(rows) >= ARRAYSIZE:
+                self.dbapi.executemany(
+                    "INSERT INTO ancestry (handle, ancestor_handle, depth) "
+                    "VALUES (?, ?, ?)", rows)
+                rows = []
+        if rows:
+            self.dbapi.executemany(
+                "INSERT INTO ancestry (handle, ancestor_handle, depth) "
+                "VALUES (?, ?, ?)", rows)
+
+    def reindex_ancestry(self):
+        """
+        Rebuild the ancestry index of all people.
+        """
+        if self.readonly or not self._has_ancestry():
+            return
+        self._txn_begin()
+        families = {handle: (data[2], data[3])
+                    for handle, data in self._iter_raw_data(FAMILY_KEY)}
+        parents = {handle: _ancestry_parents(data, families.get)
+                   for handle, data in self._iter_raw_data(PERSON_KEY)}
+        del families
+        self.dbapi.execute("DELETE FROM ancestry")
+        self._insert_ancestry(_ancestry_closures(
+            parents, lambda handle: {handle: 0}, parents.get))
         self._txn_commit()
 
+    def get_ancestors(self, handle):
+        """
+        Return the ancestors of a person, from the ancestry index.
+        """
+        if not self._can_use_ancestry():
+            return None
+        self.dbapi.execute("SELECT ancestor_handle, depth FROM ancestry "
+                           "WHERE handle = ?", [handle])
+        return dict(self.dbapi.fetchall())
+
+    def get_ancestry_lines(self, handle1, handle2):
+        """
+        Return the people on the lines of ancestry joining two people to
+        their common ancestors, from the ancestry index.
+        """
+        if not self._can_use_ancestry():
+            return None
+        self.dbapi.execute("SELECT DISTINCT line.ancestor_handle "
+                           "FROM ancestry AS line "
+                           "WHERE line.handle IN (?, ?) AND EXISTS ("
+                           "SELECT 1 FROM ancestry AS up "
+                           "WHERE up.handle = line.ancestor_handle "
+                           "AND up.ancestor_handle IN ("
+                           "SELECT first.ancestor_handle "
+                           "FROM ancestry AS first JOIN ancestry AS second "
+                           "ON second.ancestor_handle = first.ancestor_handle "
+                           "WHERE first.handle = ? AND second.handle = ?))",
+                           [handle1, handle2, handle1, handle2])
+        return set(row[0] for row in self.dbapi.fetchall())
+
+    def _create_sort_key_columns(self):
+        """
+        Create the sort key columns.
+
+        Each sorted secondary column has a column holding the sort keys of
+        its values in the collation of the locale, so that sorting needs no
+        collation function.  See :data:`SORT_KEY_COLUMNS`.
+        """
+        for table, columns in SORT_KEY_COLUMNS.items():
+            for column, key_column in columns:
+                self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s BLOB"
+                                   % (table, key_column))
+            key_column = columns[0][1]
+            self.dbapi.execute('CREATE INDEX %s_%s ON %s(%s)'
+                               % (table, key_column, table, key_column))
+        self._sort_keys_exist = True
+
+    def _has_sort_keys(self):
+        """
+        Return True if the database has sort key columns.
+
+        The columns are missing from a database of an older schema opened
+        read-only.
+        """
+        if self._sort_keys_exist is None:
+            collation = self._get_metadata('sort_key_collation', None)
+            self._sort_keys_exist = collation is not None
+            self._sort_keys_current = collation == _sort_key_collation()
+        return self._sort_keys_exist
+
+    def _can_use_sort_keys(self, locale):
+        """
+        Return True if the sort key columns sort in the collation of a
+        locale.
+
+        Only the keys of the locale of Gramps are stored.
+        """
+        return (locale == glocale and self._has_sort_keys() and
+                self._sort_keys_current)
+
+    def reindex_sort_keys(self):
+        """
+        Rebuild the sort keys of all objects in the collation of the locale.
+        """
+        if self.readonly or not self._has_sort_keys():
+            return
+        self._flush_bulk()
+        self._txn_begin()
+        for table, columns in SORT_KEY_COLUMNS.items():
+            self.dbapi.execute("SELECT handle, %s FROM %s"
+                               % (", ".join(column for column, key_column
+                                            in columns), table))
+            rows = [[_sort_key(value) for value in row[1:]] + [row[0]]
+                    for row in self.dbapi.fetchall()]
+            self.dbapi.executemany(
+                "UPDATE %s SET %s WHERE handle = ?"
+                % (table, ", ".join("%s = ?" % key_column
+                                    for column, key_column in columns)),
+                rows)
+        self._txn_commit()
+        self._set_metadata('sort_key_collation', _sort_key_collation())
+        self._sort_keys_current = True
+
     def rebuild_secondary(self, callback=None):
         """
         Rebuild secondary indices
@@ -874,45 +1555,99 @@ class DBAPI(DbGeneric):
                 self._update_secondary_values(obj)
                 self.update()
         self._txn_commit()
+        if self._has_sort_keys():
+            self._set_metadata('sort_key_collation', _sort_key_collation())
+            self._sort_keys_current = True
+
+        self.reindex_ancestry()
 
         # Next, rebuild stats:
         gstats = self.get_gender_stats()
         self.genderStats = GenderStats(gstats)
 
     def _has_handle(self, obj_key, handle):
+        if self._bulk is not None:
+            if self._bulk.is_written(obj_key, handle):
+                return True
+            if obj_key in self._bulk.empty:
+                return False
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT 1 FROM %s WHERE handle = ?" % table
         self.dbapi.execute(sql, [handle])
         return self.dbapi.fetchone() is not None
 
     def _has_gramps_id(self, obj_key, gramps_id):
+        if self._bulk is not None:
+            return self._get_bulk_handle(obj_key, gramps_id) is not None
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT 1 FROM %s WHERE gramps_id = ?" % table
         self.dbapi.execute(sql, [gramps_id])
         return self.dbapi.fetchone() != None
 
+    def _get_bulk_handle(self, obj_key, gramps_id):
+        """
+        Return the handle of the object with the given Gramps ID during a
+        bulk load, or None.
+        """
+        handle = self._bulk.get_handle(obj_key, gramps_id)
+        if handle is not None or obj_key in self._bulk.empty:
+            return handle
+        # Objects written during the load may have had this ID before
+        table = KEY_TO_NAME_MAP[obj_key]
+        sql = "SELECT handle FROM %s WHERE gramps_id = ?" % table
+        self.dbapi.execute(sql, [gramps_id])
+        for (handle, ) in self.dbapi.fetchall():
+            if not self._bulk.is_written(obj_key, handle):
+                return handle
+        return None
+
     def _get_gramps_ids(self, obj_key):
+        self._flush_bulk()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT gramps_id FROM %s" % table
         self.dbapi.execute(sql)
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
 
+    def select_handles(self, obj_class, where, args):
+        """
+        Return the handles of the objects of the given class that satisfy an
+        SQL WHERE clause over the secondary columns of its table.
+        """
+        self._flush_bulk()
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[obj_class]]
+        sql = "SELECT handle FROM %s WHERE %s" % (table, where)
+        self.dbapi.execute(sql, args)
+        rows = self.dbapi.fetchall()
+        return [row[0] for row in rows]
+
     def _get_raw_data(self, obj_key, handle):
+        if self._bulk is not None:
+            row = self._bulk.get_row(obj_key, handle)
+            if row:
+                return self.codec.decode(row[0])
+            if (obj_key in self._bulk.empty and
+                    not self._bulk.is_written(obj_key, handle)):
+                return None
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT blob_data FROM %s WHERE handle = ?" % table
         self.dbapi.execute(sql, [handle])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return self.codec.decode(row[0])
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
+        if self._bulk is not None:
+            handle = self._get_bulk_handle(obj_key, gramps_id)
+            if handle is None:
+                return None
+            return self._get_cached_raw_data(obj_key, handle)
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT blob_data FROM %s WHERE gramps_id = ?" % table
         self.dbapi.execute(sql, [gramps_id])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return self.codec.decode(row[0])
 
     def get_gender_stats(self):
         """
@@ -957,26 +1692,36 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        old_data = self._get_cached_raw_data(obj_key, handle)
+        self._uncache_raw_data(obj_key, handle)
         if data is None:
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
         else:
-            if self._has_handle(obj_key, handle):
+            if old_data is not None:
                 sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-                self.dbapi.execute(sql, [pickle.dumps(data), handle])
+                self.dbapi.execute(sql, [self.codec.encode(data), handle])
             else:
                 sql = "INSERT INTO %s (handle, blob_data) VALUES (?, ?)" % table
-                self.dbapi.execute(sql, [handle, pickle.dumps(data)])
+                self.dbapi.execute(sql, [handle, self.codec.encode(data)])
             obj = self._get_table_func(cls)["class_func"].create(data)
             self._update_secondary_values(obj)
+        self._update_ancestry(obj_key, old_data, data)
 
     def get_surname_list(self):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
-        self.dbapi.execute("SELECT DISTINCT surname "
-                           "FROM person "
-                           "ORDER BY surname")
+        self._flush_bulk()
+        if self._can_use_sort_keys(glocale):
+            self.dbapi.execute("SELECT surname "
+                               "FROM person "
+                               "GROUP BY surname "
+                               "ORDER BY MIN(surname_key)")
+        else:
+            self.dbapi.execute("SELECT DISTINCT surname "
+                               "FROM person "
+                               "ORDER BY surname")
         surname_list = []
         for row in self.dbapi.fetchall():
             surname_list.append(row[0])
@@ -1013,38 +1758,64 @@ class DBAPI(DbGeneric):
                     self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s %s"
                                        % (table_name, field, sql_type))
 
+    def _get_secondary_fields(self, obj_class):
+        """
+        Return the names of the secondary fields of a primary object class.
+        """
+        table = obj_class.__name__
+        if table not in self.__secondary_fields:
+            self.__secondary_fields[table] = [
+                field[0] for field in obj_class.get_secondary_fields()
+                if field[0] != 'handle']
+        return self.__secondary_fields[table]
+
+    def _get_secondary_columns(self, obj_class):
+        """
+        Return the names of the secondary columns of a primary object class.
+        """
+        columns = list(self._get_secondary_fields(obj_class))
+        # Derived fields
+        if obj_class.__name__ == 'Person':
+            columns += ['given_name', 'surname']
+        if obj_class.__name__ == 'Place':
+            columns.append('enclosed_by')
+        if self._has_sort_keys():
+            columns += [key_column for column, key_column
+                        in SORT_KEY_COLUMNS.get(obj_class.__name__.lower(), ())]
+        return columns
+
+    def _get_secondary_values(self, obj):
+        """
+        Given a primary object return the names and values of its secondary
+        columns.
+        """
+        values = [getattr(obj, field)
+                  for field in self._get_secondary_fields(obj.__class__)]
+        # Derived fields
+        if obj.__class__.__name__ == 'Person':
+            values.extend(self._get_person_data(obj))
+        if obj.__class__.__name__ == 'Place':
+            values.append(self._get_place_data(obj))
+        columns = self._get_secondary_columns(obj.__class__)
+        if self._has_sort_keys():
+            for column, key_column in SORT_KEY_COLUMNS.get(
+                    obj.__class__.__name__.lower(), ()):
+                values.append(_sort_key(values[columns.index(column)]))
+        return (columns, self._sql_cast_list(values))
+
     def _update_secondary_values(self, obj):
         """
         Given a primary object update its secondary field values
         in the database.
         Does not commit.
         """
-        table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append("%s = ?" % field)
-            values.append(getattr(obj, field))
-
-        # Derived fields
-        if table == 'Person':
-            given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
-        if table == 'Place':
-            handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
-            values.append(handle)
-
+        columns, values = self._get_secondary_values(obj)
         if len(values) > 0:
-            table_name = table.lower()
+            table_name = obj.__class__.__name__.lower()
             self.dbapi.execute("UPDATE %s SET %s where handle = ?"
-                               % (table_name, ", ".join(sets)),
-                               self._sql_cast_list(values)
-                               + [obj.handle])
+                               % (table_name, ", ".join(
+                                   "%s = ?" % column for column in columns)),
+                               values + [obj.handle])
 
     def _sql_cast_list(self, values):
         """
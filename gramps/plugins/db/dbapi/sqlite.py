@@ -32,6 +32,8 @@ import sqlite3
 import os
 import re
 import logging
+import threading
+from urllib.request import pathname2url
 
 #-------------------------------------------------------------------------
 #
@@ -40,6 +42,7 @@ import logging
 #-------------------------------------------------------------------------
 from gramps.plugins.db.dbapi.dbapi import DBAPI
 from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
@@ -81,6 +84,12 @@ class Connection:
     """
     The Sqlite class is an interface between the DBAPI class which is the Gramps
     backend for the DBAPI interface and the sqlite3 python module.
+
+    The thread which creates the connection reads and writes through it.
+    Other threads read through a pool of read-only connections, one for each
+    thread, so that they can read concurrently with each other and with the
+    writer.  The database is in WAL journal mode while it is open, so that
+    readers do not block the writer.  Readers only see committed changes.
     """
 
     def __init__(self, *args, **kwargs):
@@ -100,9 +109,95 @@ class Connection:
         self.__connection = sqlite3.connect(*args, **kwargs)
         self.__cursor = self.__connection.cursor()
         self.__connection.create_function("regexp", 2, regexp)
-        self.__collations = []
+        self.__collations = {}
+        self.__registered = {}
+        self.__writer = threading.get_ident()
+        self.__readers = []     # [(thread, connection)]
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        path = args[0] if args else kwargs.get('database')
+        self.__path = None
+        self.__set_pragmas(self.__connection)
+        if path != ':memory:' and os.access(os.path.dirname(path) or '.',
+                                            os.W_OK):
+            try:
+                self.__cursor.execute("PRAGMA journal_mode = WAL")
+                if self.__cursor.fetchone()[0].lower() == 'wal':
+                    self.__path = path
+            except sqlite3.OperationalError:
+                # A read-only database file
+                pass
         self.check_collation(glocale)
 
+    def __set_pragmas(self, connection):
+        """
+        Set the cache and memory map sizes of a connection.
+        """
+        connection.execute("PRAGMA cache_size = %d" %
+                           -(config.get('database.sqlite-cache-size') * 1024))
+        connection.execute("PRAGMA mmap_size = %d" %
+                           (config.get('database.sqlite-mmap-size') << 20))
+
+    def __get_connection(self):
+        """
+        Return the connection of the current thread.
+
+        Threads other than the writer are given a read-only connection from
+        the pool.  The connections of finished threads are reused.  Without
+        WAL, as for a database in memory, all the threads share the writer.
+        """
+        if threading.get_ident() == self.__writer or self.__path is None:
+            return self.__connection
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            thread = threading.current_thread()
+            with self.__lock:
+                for index, (reader_thread, reader) in enumerate(
+                        self.__readers):
+                    if not reader_thread.is_alive():
+                        self.__readers[index] = (thread, reader)
+                        connection = reader
+                        break
+                else:
+                    connection = sqlite3.connect(
+                        'file:%s?mode=ro' % pathname2url(self.__path),
+                        uri=True, check_same_thread=False)
+                    connection.create_function("regexp", 2, regexp)
+                    self.__set_pragmas(connection)
+                    self.__readers.append((thread, connection))
+                for collation, strcoll in self.__collations.items():
+                    self.__create_collation(connection, collation, strcoll)
+            self.__local.connection = connection
+            self.__local.cursor = connection.cursor()
+        return connection
+
+    def is_reader(self):
+        """
+        Return True if the current thread reads through a read-only
+        connection, and so only sees committed changes.
+        """
+        return (threading.get_ident() != self.__writer and
+                self.__path is not None)
+
+    def __get_cursor(self):
+        """
+        Return the shared cursor of the current thread.
+        """
+        if threading.get_ident() == self.__writer or self.__path is None:
+            return self.__cursor
+        if getattr(self.__local, 'cursor', None) is None:
+            self.__get_connection()
+        return self.__local.cursor
+
+    def __create_collation(self, connection, collation, strcoll):
+        """
+        Create a collation in a connection, unless it already exists.
+        """
+        registered = self.__registered.setdefault(connection, set())
+        if collation not in registered:
+            connection.create_collation(collation, strcoll)
+            registered.add(collation)
+
     def check_collation(self, locale):
         """
         Checks that a collation exists and if not creates it.
@@ -111,8 +206,9 @@ class Connection:
         :param type: A GrampsLocale object.
         """
         collation = locale.get_collation()
-        if collation not in self.__collations:
-            self.__connection.create_collation(collation, locale.strcoll)
+        self.__collations.setdefault(collation, locale.strcoll)
+        self.__create_collation(self.__get_connection(), collation,
+                                self.__collations[collation])
 
     def execute(self, *args, **kwargs):
         """
@@ -124,21 +220,35 @@ class Connection:
         :type kwargs: list
         """
         self.log.debug(args)
-        self.__cursor.execute(*args, **kwargs)
+        self.__get_cursor().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement once for each set of parameters.
+
+        :param args: arguments to be passed to the sqlite3 executemany
+                     statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany
+                       statement
+        :type kwargs: list
+        """
+        self.log.debug(args[0])
+        self.__get_cursor().executemany(*args, **kwargs)
 
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
         or None when no more data is available.
         """
-        return self.__cursor.fetchone()
+        return self.__get_cursor().fetchone()
 
     def fetchall(self):
         """
         Fetches the next set of rows of a query result, returning a list. An
         empty list is returned when no more rows are available.
         """
-        return self.__cursor.fetchall()
+        return self.__get_cursor().fetchall()
 
     def begin(self):
         """
@@ -179,15 +289,31 @@ class Connection:
     def close(self):
         """
         Close the current database.
+
+        The database is left in the rollback journal mode, so that it can
+        be read where the WAL files cannot be created.
         """
         self.log.debug("closing database...")
+        with self.__lock:
+            for thread, reader in self.__readers:
+                reader.close()
+            self.__readers = []
+        self.__registered = {}
+        # Finish the last statement, which holds a read transaction
+        self.__cursor.close()
+        if self.__path is not None:
+            try:
+                self.__connection.execute("PRAGMA journal_mode = DELETE")
+            except sqlite3.OperationalError:
+                # Still open in another process
+                pass
         self.__connection.close()
 
     def cursor(self):
         """
         Return a new cursor.
         """
-        return Cursor(self.__connection)
+        return Cursor(self.__get_connection())
 
 
 #-------------------------------------------------------------------------
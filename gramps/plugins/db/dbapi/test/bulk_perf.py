@@ -0,0 +1,169 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of GEDCOM imports into a SQLite database, with and without a
+bulk load.
+
+The GEDCOM file is generated from a fixed random seed, FAMILIES families
+give about 50 lines each.  Run with::
+
+    python3 -m unittest gramps.plugins.db.dbapi.test.bulk_perf
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.lib import libgedcom
+from gramps.plugins.lib.libmixin import DbMixin
+
+FAMILIES = 3000
+SEED = 1
+
+def write_gedcom(filename, families):
+    """
+    Write a GEDCOM file with the given number of families, their children
+    and their events.  Return the number of lines.
+    """
+    rand = random.Random(SEED)
+    given_names = ['John', 'Mary', 'Anna', 'Peter', 'Joseph', 'Ellen']
+    surnames = ['Smith', 'Garner', 'Zieliński', 'Warner', 'Page', 'Reeves']
+    places = ['Springfield, IL, USA', 'Boston, MA, USA', 'Lyon, France',
+              'Gent, Belgium', 'Oslo, Norway']
+    people = {}
+    family_lines = []
+    bachelors = []
+
+    def add_person(sex):
+        gid = 'I%d' % (len(people) + 1)
+        year = rand.randint(1700, 1950)
+        people[gid] = [
+            '0 @%s@ INDI' % gid,
+            '1 NAME %s /%s/' % (rand.choice(given_names),
+                                rand.choice(surnames)),
+            '1 SEX %s' % sex,
+            '1 BIRT',
+            '2 DATE %d JAN %d' % (rand.randint(1, 28), year),
+            '2 PLAC %s' % rand.choice(places),
+            '2 SOUR @S1@',
+            '3 PAGE p. %d' % rand.randint(1, 500),
+            '1 DEAT',
+            '2 DATE %d' % (year + rand.randint(1, 90)),
+            '1 NOTE Person %s' % gid]
+        return gid
+
+    for index in range(families):
+        fid = 'F%d' % index
+        if bachelors and rand.random() < 0.5:
+            father = bachelors.pop(rand.randrange(len(bachelors)))
+        else:
+            father = add_person('M')
+        mother = add_person('F')
+        for gid in (father, mother):
+            people[gid].append('1 FAMS @%s@' % fid)
+        family_lines += ['0 @%s@ FAM' % fid,
+                         '1 HUSB @%s@' % father,
+                         '1 WIFE @%s@' % mother,
+                         '1 MARR',
+                         '2 DATE %d' % rand.randint(1720, 1970)]
+        for dummy in range(rand.randint(0, 4)):
+            sex = rand.choice('MF')
+            child = add_person(sex)
+            people[child].append('1 FAMC @%s@' % fid)
+            family_lines.append('1 CHIL @%s@' % child)
+            if sex == 'M':
+                bachelors.append(child)
+
+    lines = ['0 HEAD', '1 SOUR Benchmark', '1 GEDC', '2 VERS 5.5.1',
+             '2 FORM LINEAGE-LINKED', '1 CHAR UTF-8',
+             '0 @S1@ SOUR', '1 TITL Census']
+    for person_lines in people.values():
+        lines += person_lines
+    lines += family_lines
+    lines.append('0 TRLR')
+    with open(filename, 'w', encoding='utf-8') as ged:
+        ged.write('\n'.join(lines) + '\n')
+    return len(lines)
+
+def import_gedcom(db, filename):
+    """
+    Import a GEDCOM file without the GUI parts of the GEDCOM importer.
+    """
+    if DbMixin not in db.__class__.__bases__:
+        db.__class__.__bases__ = (DbMixin,) + db.__class__.__bases__
+    with open(filename, 'rb') as ifile:
+        stage_one = libgedcom.GedcomStageOne(ifile)
+        stage_one.parse()
+        ifile.seek(0)
+        parser = libgedcom.GedcomParser(db, ifile, filename, User(),
+                                        stage_one, None, None)
+        parser.parse_gedcom_file(False)
+
+def row_txn(msg, db, batch=False, bulk=False, **kwargs):
+    """
+    Create a transaction that writes row by row.
+    """
+    return DbTxn(msg, db, batch, **kwargs)
+
+class BulkPerfTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.filename = os.path.join(cls.tmpdir, 'bench.ged')
+        cls.lines = write_gedcom(cls.filename, FAMILIES)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def __measure(self, name):
+        path = os.path.join(self.tmpdir, name)
+        os.mkdir(path)
+        db = make_database('sqlite')
+        db.load(path)
+        start = time.perf_counter()
+        import_gedcom(db, self.filename)
+        elapsed = time.perf_counter() - start
+        counts = (db.get_number_of_people(), db.get_number_of_families(),
+                  db.get_number_of_events())
+        db.close()
+        print("%-12s %8.2f s  %8.0f lines/s" %
+              (name, elapsed, self.lines / elapsed))
+        return elapsed, counts
+
+    def test_gedcom_import(self):
+        print("\n%d GEDCOM lines" % self.lines)
+        with patch('gramps.plugins.lib.libgedcom.DbTxn', row_txn):
+            row_time, row_counts = self.__measure('row-by-row')
+        bulk_time, bulk_counts = self.__measure('bulk')
+        self.assertEqual(bulk_counts, row_counts)
+        print("speedup      %8.2f x" % (row_time / bulk_time))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,17 +23,34 @@
 # Standard python modules
 #
 #-------------------------------------------------------------------------
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 #-------------------------------------------------------------------------
 #
 # Gramps modules
 #
 #-------------------------------------------------------------------------
+from gramps.gen.const import DATA_DIR, GRAMPS_LOCALE as glocale
 from gramps.gen.db import DbTxn
-from gramps.gen.db.utils import make_database
+from gramps.gen.db.dbconst import (KEY_TO_NAME_MAP, DBBACKEND, DBMODE_R,
+                                   PERSON_KEY)
+from gramps.gen.db.utils import make_database, import_as_dict
+from gramps.gen.errors import HandleError
 from gramps.gen.lib import (Person, Family, Event, Place, Repository, Source,
-                            Citation, Media, Note, Tag, Researcher, Surname)
+                            Citation, Media, Note, Tag, Researcher, Surname,
+                            PlaceRef, ChildRef)
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi.dbapi import _sort_key_collation
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
 
 #-------------------------------------------------------------------------
 #
@@ -562,6 +579,23 @@ class DbRandomTest(unittest.TestCase):
         self.__get_cursor_test(self.db.get_tag_cursor,
                                self.db.get_raw_tag_data)
 
+    def test_get_place_tree_cursor(self):
+        handles = self.handles['Place']
+        enclosing = {handles[1]: handles[0], handles[2]: handles[1],
+                     handles[3]: handles[2], handles[4]: handles[0]}
+        with DbTxn('Build place tree', self.db) as trans:
+            for handle in (handles[3], handles[2], handles[1], handles[4]):
+                place = self.db.get_place_from_handle(handle)
+                placeref = PlaceRef()
+                placeref.ref = enclosing[handle]
+                place.add_placeref(placeref)
+                self.db.commit_place(place, trans)
+        with self.db.get_place_tree_cursor() as cursor:
+            tree = [handle for handle, data in cursor]
+        self.assertCountEqual(tree, handles)
+        for handle, parent in enclosing.items():
+            self.assertLess(tree.index(parent), tree.index(handle))
+
     ################################################################
     #
     # Test iter_*_handles methods
@@ -697,6 +731,570 @@ class DbRandomTest(unittest.TestCase):
                      for obj_type in self.handles.keys()])
         self.assertEqual(self.db.get_total(), total)
 
+    ################################################################
+    #
+    # Test reference map methods
+    #
+    ################################################################
+
+    def __backlinks(self, handle):
+        return list(self.db.find_backlink_handles(handle))
+
+    def test_reference_map(self):
+        person_handle = self.handles['Person'][0]
+        note1, note2 = self.handles['Note'][:2]
+        person = self.db.get_person_from_handle(person_handle)
+        person.add_note(note1)
+        with DbTxn('Add note reference', self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.__backlinks(note1), [('Person', person_handle)])
+
+        person.set_note_list([note2])
+        with DbTxn('Change note reference', self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.__backlinks(note1), [])
+        self.assertEqual(self.__backlinks(note2), [('Person', person_handle)])
+
+        self.db.reindex_reference_map(lambda percent: percent)
+        self.assertEqual(self.__backlinks(note1), [])
+        self.assertEqual(self.__backlinks(note2), [('Person', person_handle)])
+
+        self.db.undo()
+        self.assertEqual(self.__backlinks(note1), [('Person', person_handle)])
+        self.assertEqual(self.__backlinks(note2), [])
+
+    ################################################################
+    #
+    # Test object cache
+    #
+    ################################################################
+
+    def test_cache_hits(self):
+        handle = self.handles['Event'][0]
+        self.db.clear_cache()
+        before = self.db.get_cache_stats()
+        self.db.get_event_from_handle(handle)
+        self.db.get_event_from_handle(handle)
+        self.db.get_raw_event_data(handle)
+        after = self.db.get_cache_stats()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 2)
+        self.assertEqual(after['size'], 1)
+
+    def test_cache_not_shared(self):
+        handle = self.handles['Person'][0]
+        family_handle = self.handles['Family'][0]
+        person = self.db.get_person_from_handle(handle)
+        person.add_family_handle(family_handle)
+        person.add_tag(self.handles['Tag'][0])
+        person = self.db.get_person_from_handle(handle)
+        self.assertEqual(person.get_family_handle_list(), [])
+        self.assertEqual(person.get_tag_list(), [])
+
+    def test_cache_commit(self):
+        handle = self.handles['Note'][0]
+        note = self.db.get_note_from_handle(handle)
+        note.set('cached text')
+        with DbTxn('Edit note', self.db) as trans:
+            self.db.commit_note(note, trans)
+        note.set('uncommitted text')
+        self.assertEqual(self.db.get_note_from_handle(handle).get(),
+                         'cached text')
+        self.db.undo()
+        self.assertEqual(self.db.get_note_from_handle(handle).get(), '')
+        self.db.redo()
+        self.assertEqual(self.db.get_note_from_handle(handle).get(),
+                         'cached text')
+
+    def test_cache_abort(self):
+        handle = self.handles['Note'][0]
+        note = self.db.get_note_from_handle(handle)
+        note.set('aborted text')
+        with self.assertRaises(RuntimeError):
+            with DbTxn('Edit note', self.db) as trans:
+                self.db.commit_note(note, trans)
+                raise RuntimeError
+        self.assertEqual(self.db.get_note_from_handle(handle).get(), '')
+
+    def test_cache_remove(self):
+        handle = self.handles['Repository'][0]
+        self.db.get_repository_from_handle(handle)
+        with DbTxn('Remove repository', self.db) as trans:
+            self.db.remove_repository(handle, trans)
+        self.assertRaises(HandleError, self.db.get_repository_from_handle,
+                          handle)
+        self.db.undo()
+        self.assertEqual(self.db.get_repository_from_handle(handle).handle,
+                         handle)
+
+#-------------------------------------------------------------------------
+#
+# DbAncestryTest class
+#
+#-------------------------------------------------------------------------
+class DbAncestryTest(unittest.TestCase):
+    '''
+    Tests of the ancestry index.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def __add_person(self, trans):
+        person = Person()
+        return self.db.add_person(person, trans)
+
+    def __add_family(self, father, mother, children, trans):
+        family = Family()
+        family.set_father_handle(father)
+        family.set_mother_handle(mother)
+        for child in children:
+            child_ref = ChildRef()
+            child_ref.set_reference_handle(child)
+            family.add_child_ref(child_ref)
+        handle = self.db.add_family(family, trans)
+        for parent in (father, mother):
+            if parent:
+                person = self.db.get_person_from_handle(parent)
+                person.add_family_handle(handle)
+                self.db.commit_person(person, trans)
+        for child in children:
+            person = self.db.get_person_from_handle(child)
+            person.add_parent_family_handle(handle)
+            self.db.commit_person(person, trans)
+        return handle
+
+    def setUp(self):
+        # grandfather + grandmother -> father
+        # father + mother -> child1, child2
+        # parentless family -> sibling1, sibling2
+        with DbTxn('Add test objects', self.db) as trans:
+            (self.grandfather, self.grandmother, self.father, self.mother,
+             self.child1, self.child2, self.sibling1,
+             self.sibling2) = [self.__add_person(trans) for i in range(8)]
+            self.family1 = self.__add_family(
+                self.grandfather, self.grandmother, [self.father], trans)
+            self.family2 = self.__add_family(
+                self.father, self.mother, [self.child1, self.child2], trans)
+            self.family3 = self.__add_family(
+                None, None, [self.sibling1, self.sibling2], trans)
+
+    def tearDown(self):
+        with DbTxn('Remove test objects', self.db) as trans:
+            for handle in self.db.get_family_handles():
+                self.db.remove_family(handle, trans)
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+
+    def test_ancestors(self):
+        self.assertEqual(self.db.get_ancestors(self.child1),
+                         {self.child1: 0, self.father: 1, self.mother: 1,
+                          self.grandfather: 2, self.grandmother: 2})
+        self.assertEqual(self.db.get_ancestors(self.sibling1),
+                         {self.sibling1: 0, self.family3: 1})
+
+    def test_ancestry_lines(self):
+        self.assertEqual(
+            self.db.get_ancestry_lines(self.child1, self.child2),
+            {self.child1, self.child2, self.father, self.mother,
+             self.grandfather, self.grandmother})
+        self.assertEqual(
+            self.db.get_ancestry_lines(self.mother, self.child1),
+            {self.mother, self.child1})
+        self.assertEqual(
+            self.db.get_ancestry_lines(self.child1, self.sibling1), set())
+
+    def test_commit_family(self):
+        family = self.db.get_family_from_handle(self.family3)
+        family.set_mother_handle(self.child1)
+        with DbTxn('Edit family', self.db) as trans:
+            self.db.commit_family(family, trans)
+        self.assertEqual(self.db.get_ancestors(self.sibling2),
+                         {self.sibling2: 0, self.child1: 1, self.father: 2,
+                          self.mother: 2, self.grandfather: 3,
+                          self.grandmother: 3})
+        self.db.undo()
+        self.assertEqual(self.db.get_ancestors(self.sibling2),
+                         {self.sibling2: 0, self.family3: 1})
+        self.db.redo()
+        self.assertEqual(self.db.get_ancestors(self.sibling2)[self.child1],
+                         1)
+
+    def test_commit_person(self):
+        person = self.db.get_person_from_handle(self.grandfather)
+        person.add_parent_family_handle(self.family3)
+        with DbTxn('Edit person', self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.db.get_ancestors(self.child2)[self.family3], 3)
+        for handle, depth in ((self.sibling1, 1), (self.grandfather, 1),
+                              (self.father, 2), (self.child1, 3)):
+            self.assertEqual(self.db.get_ancestors(handle)[self.family3],
+                             depth)
+
+    def test_remove_person(self):
+        person = self.db.get_person_from_handle(self.father)
+        with DbTxn('Remove person', self.db) as trans:
+            self.db.delete_person_from_database(person, trans)
+        self.assertEqual(self.db.get_ancestors(self.father), {})
+        self.assertEqual(self.db.get_ancestors(self.child1),
+                         {self.child1: 0, self.mother: 1})
+        self.db.undo()
+        self.assertEqual(self.db.get_ancestors(self.child1)[self.grandfather],
+                         2)
+
+    def test_loop(self):
+        person = self.db.get_person_from_handle(self.grandfather)
+        person.add_parent_family_handle(self.family2)
+        with DbTxn('Edit person', self.db) as trans:
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.db.get_ancestors(self.grandfather),
+                         {self.grandfather: 0, self.father: 1,
+                          self.mother: 1, self.grandmother: 2})
+        self.db.undo()
+        self.assertEqual(self.db.get_ancestors(self.grandfather),
+                         {self.grandfather: 0})
+
+    def test_batch(self):
+        with DbTxn('Batch', self.db, batch=True) as trans:
+            child = self.__add_person(trans)
+            self.__add_family(self.child1, None, [child], trans)
+            self.assertIsNone(self.db.get_ancestors(child))
+        self.assertEqual(self.db.get_ancestors(child)[self.father], 2)
+
+#-------------------------------------------------------------------------
+#
+# DbBulkTest class
+#
+#-------------------------------------------------------------------------
+class DbBulkTest(unittest.TestCase):
+    '''
+    Tests of bulk loads.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.source = import_as_dict(EXAMPLE, User())
+
+    def __load(self, bulk):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        with DbTxn('Load', db, batch=True, bulk=bulk) as trans:
+            for obj_type in ('Person', 'Family', 'Event', 'Place',
+                             'Repository', 'Source', 'Citation', 'Media',
+                             'Note', 'Tag'):
+                commit = db.method('commit_%s', obj_type)
+                get_object = self.source.method('get_%s_from_handle',
+                                                obj_type)
+                for handle in self.source.method('get_%s_handles',
+                                                 obj_type)():
+                    obj = get_object(handle)
+                    # The second commit updates the pending row
+                    gramps_id = getattr(obj, 'gramps_id', None)
+                    if gramps_id:
+                        obj.gramps_id = 'X'
+                        commit(obj, trans, obj.change)
+                        obj.gramps_id = gramps_id
+                    commit(obj, trans, obj.change)
+        return db
+
+    def __dump(self, db):
+        tables = {}
+        for table in list(KEY_TO_NAME_MAP.values()) + ['reference',
+                                                       'ancestry']:
+            db.dbapi.execute("SELECT * FROM %s" % table)
+            tables[table] = sorted(db.dbapi.fetchall(), key=repr)
+        return tables
+
+    def test_same_tables(self):
+        expected = self.__dump(self.__load(False))
+        self.assertEqual(self.__dump(self.__load(True)), expected)
+        # Rows are also updated after they have been written
+        with patch('gramps.plugins.db.dbapi.dbapi.BULK_SIZE', 7):
+            self.assertEqual(self.__dump(self.__load(True)), expected)
+
+    def test_lookups(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        old = Person()
+        old.set_gramps_id('I0')
+        with DbTxn('Add', db) as trans:
+            db.add_person(old, trans)
+        with DbTxn('Load', db, batch=True, bulk=True) as trans:
+            person = Person()
+            person.set_gramps_id('I1')
+            db.add_person(person, trans)
+            self.assertTrue(db.has_person_handle(person.handle))
+            self.assertTrue(db.has_person_gramps_id('I0'))
+            self.assertTrue(db.has_person_gramps_id('I1'))
+            self.assertEqual(db.get_person_from_gramps_id('I1').handle,
+                             person.handle)
+            old.set_gramps_id('I2')
+            db.commit_person(old, trans)
+            self.assertFalse(db.has_person_gramps_id('I0'))
+            self.assertEqual(db.get_person_from_gramps_id('I2').handle,
+                             old.handle)
+            db.clear_cache()
+            self.assertEqual(db.get_raw_person_data(person.handle)[1], 'I1')
+            self.assertEqual(db.get_number_of_people(), 2)
+            self.assertEqual(db.get_person_from_gramps_id('I1').handle,
+                             person.handle)
+            db.remove_person(person.handle, trans)
+            self.assertFalse(db.has_person_handle(person.handle))
+            self.assertFalse(db.has_person_gramps_id('I1'))
+        self.assertEqual(db.get_person_gramps_ids(), ['I2'])
+
+    def test_add_remove(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        with DbTxn('Load', db, batch=True, bulk=True) as trans:
+            note = Note("text")
+            db.add_note(note, trans)
+            db.remove_note(note.handle, trans)
+            self.assertEqual(db.get_number_of_notes(), 0)
+            self.assertFalse(db.has_note_handle(note.handle))
+        self.assertEqual(db.get_number_of_notes(), 0)
+        self.assertFalse(db.has_note_handle(note.handle))
+
+    def test_abort(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        with self.assertRaises(ValueError):
+            with DbTxn('Load', db, batch=True, bulk=True) as trans:
+                db.add_person(Person(), trans)
+                raise ValueError
+        self.assertEqual(db.get_number_of_people(), 0)
+        self.assertIsNone(db._bulk)
+
+#-------------------------------------------------------------------------
+#
+# DbSortKeyTest class
+#
+#-------------------------------------------------------------------------
+class DbSortKeyTest(unittest.TestCase):
+    '''
+    Tests of the sort key columns.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+
+    def __values(self, table, column, handles):
+        values = []
+        for handle in handles:
+            self.db.dbapi.execute("SELECT %s FROM %s WHERE handle = ?"
+                                  % (column, table), [handle])
+            values.append(self.db.dbapi.fetchone()[0])
+        return values
+
+    def test_sorted_handles(self):
+        for obj_type, table, column in (('person', 'person', 'surname'),
+                                        ('source', 'source', 'title'),
+                                        ('citation', 'citation', 'page'),
+                                        ('place', 'place', 'title'),
+                                        ('media', 'media', 'desc'),
+                                        ('tag', 'tag', 'name')):
+            get_handles = self.db.method('get_%s_handles', obj_type)
+            self.assertTrue(self.db._can_use_sort_keys(glocale))
+            values = self.__values(table, column,
+                                   get_handles(sort_handles=True))
+            self.assertEqual(values, sorted(values, key=glocale.sort_key))
+            # The same order as the collation function
+            self.db._sort_keys_current = False
+            try:
+                collated = self.__values(table, column,
+                                         get_handles(sort_handles=True))
+            finally:
+                self.db._sort_keys_current = True
+            self.assertEqual(values, collated)
+
+    def test_sorted_families(self):
+        handles = self.db.get_family_handles(sort_handles=True)
+        self.assertEqual(len(handles), self.db.get_number_of_families())
+        keys = []
+        for handle in handles:
+            family = self.db.get_family_from_handle(handle)
+            parent = self.db.get_person_from_handle(
+                family.get_father_handle() or family.get_mother_handle())
+            if parent is None:
+                keys.append(None)
+            else:
+                name = parent.get_primary_name()
+                keys.append((glocale.sort_key(name.get_primary_surname()
+                                              .get_surname()),
+                             glocale.sort_key(name.get_first_name())))
+        keys = [key for key in keys if key is not None]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_surname_list(self):
+        surnames = self.db.get_surname_list()
+        self.assertEqual(surnames, sorted(set(surnames), key=glocale.sort_key))
+        self.db.dbapi.execute("SELECT COUNT(DISTINCT surname) FROM person")
+        self.assertEqual(len(surnames), self.db.dbapi.fetchone()[0])
+
+    @staticmethod
+    def __surnames(db):
+        return [db.get_person_from_handle(handle).get_primary_name()
+                .get_surname() for handle
+                in db.get_person_handles(sort_handles=True)]
+
+    def test_collation_change(self):
+        path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(path, DBBACKEND), "w") as backend_file:
+                backend_file.write("sqlite")
+            db = make_database("sqlite")
+            db.load(path)
+            with DbTxn('Add', db) as trans:
+                for surname in ('Zeta', 'alpha', 'Beta', 'gamma'):
+                    person = Person()
+                    name = person.get_primary_name()
+                    name.get_primary_surname().set_surname(surname)
+                    db.add_person(person, trans)
+            # As written by another locale
+            db.dbapi.begin()
+            db.dbapi.execute("UPDATE person SET surname_key = NULL")
+            db.dbapi.commit()
+            db._set_metadata('sort_key_collation', ('xx_XX', False))
+            db.close()
+            # Reading does not rebuild the keys
+            db.load(path, mode=DBMODE_R)
+            self.assertFalse(db._can_use_sort_keys(glocale))
+            self.assertEqual(self.__surnames(db),
+                             sorted(self.__surnames(db), key=glocale.sort_key))
+            self.assertEqual(db._get_metadata('sort_key_collation'),
+                             ('xx_XX', False))
+            db.close()
+            # Opening the database to write does
+            db.load(path)
+            self.assertEqual(db._get_metadata('sort_key_collation'),
+                             _sort_key_collation())
+            self.assertTrue(db._can_use_sort_keys(glocale))
+            surnames = self.__surnames(db)
+            self.assertEqual(surnames, sorted(surnames, key=glocale.sort_key))
+            # Sorting never writes
+            db._set_metadata('sort_key_collation', ('xx_XX', False))
+            db._sort_keys_exist = None
+            self.assertEqual(self.__surnames(db), surnames)
+            self.assertFalse(db._can_use_sort_keys(glocale))
+            self.assertEqual(db._get_metadata('sort_key_collation'),
+                             ('xx_XX', False))
+            db.close()
+        finally:
+            shutil.rmtree(path)
+
+#-------------------------------------------------------------------------
+#
+# DbReaderTest class
+#
+#-------------------------------------------------------------------------
+class DbReaderTest(unittest.TestCase):
+    '''
+    Tests of the read connections of other threads.
+    '''
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        with open(os.path.join(self.path, DBBACKEND), "w") as backend_file:
+            backend_file.write("sqlite")
+        self.db = make_database("sqlite")
+        self.db.load(self.path)
+        self.handles = []
+        with DbTxn('Add', self.db) as trans:
+            for surname in ('Smith', 'Allen', 'Baker'):
+                person = Person()
+                name = person.get_primary_name()
+                name.get_primary_surname().set_surname(surname)
+                self.handles.append(self.db.add_person(person, trans))
+
+    def tearDown(self):
+        if self.db.is_open():
+            self.db.close()
+        shutil.rmtree(self.path)
+
+    def __journal_mode(self):
+        connection = sqlite3.connect(os.path.join(self.path, 'sqlite.db'))
+        try:
+            return connection.execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            connection.close()
+
+    def test_threads(self):
+        expected = self.db.get_person_handles(sort_handles=True)
+        self.db.clear_cache()
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(
+                lambda handle: (self.db.get_person_from_handle(handle).handle,
+                                self.db.get_person_handles(sort_handles=True)),
+                self.handles * 4))
+        self.assertEqual([result[0] for result in results], self.handles * 4)
+        for result in results:
+            self.assertEqual(result[1], expected)
+
+    def test_committed(self):
+        with DbTxn('Add', self.db) as trans:
+            handle = self.db.add_person(Person(), trans)
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(executor.submit(self.db.get_number_of_people)
+                             .result(), 4)
+        self.assertTrue(self.db.has_person_handle(handle))
+
+    def __read(self, func, *args):
+        with ThreadPoolExecutor(1) as executor:
+            return executor.submit(func, *args).result()
+
+    def __surname(self, handle):
+        return (self.db.get_person_from_handle(handle).get_primary_name()
+                .get_surname())
+
+    def test_uncommitted(self):
+        handle = self.handles[0]
+        with DbTxn('Edit', self.db) as trans:
+            person = self.db.get_person_from_handle(handle)
+            person.get_primary_name().get_primary_surname().set_surname('Jones')
+            self.db.commit_person(person, trans)
+            # The change is in the cache of the writer
+            self.assertEqual(self.__surname(handle), 'Jones')
+            self.assertEqual(self.__read(self.__surname, handle), 'Smith')
+        self.assertEqual(self.__read(self.__surname, handle), 'Jones')
+
+    def test_reader_cache(self):
+        handle = self.handles[0]
+        self.db.clear_cache()
+        stats = self.db.get_cache_stats()
+        self.assertEqual(self.__read(self.__surname, handle), 'Smith')
+        # Readers neither fill the cache nor count in it
+        self.assertEqual(self.db.get_cache_stats(), stats)
+        self.assertNotIn((PERSON_KEY, handle), self.db._raw_cache)
+
+    def test_bulk(self):
+        with DbTxn('Load', self.db, batch=True, bulk=True) as trans:
+            person = Person()
+            person.get_primary_name().get_primary_surname().set_surname('Dunn')
+            handle = self.db.add_person(person, trans)
+            count = self.db._bulk.count
+            # The rows buffered by the writer are neither seen nor written
+            self.assertCountEqual(self.__read(self.db.get_person_handles),
+                                  self.handles)
+            self.assertEqual(self.db._bulk.count, count)
+            self.assertFalse(self.__read(self.db.has_person_handle, handle))
+            self.assertIsNone(self.__read(self.db.get_raw_person_data,
+                                          handle))
+        self.assertTrue(self.__read(self.db.has_person_handle, handle))
+
+    def test_journal_mode(self):
+        self.assertEqual(self.__journal_mode(), 'wal')
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(self.db.get_person_handles).result()
+        self.db.close()
+        self.assertEqual(self.__journal_mode(), 'delete')
+
 #-------------------------------------------------------------------------
 #
 # DbEmptyTest class
@@ -723,6 +1321,16 @@ class DbEmptyTest(unittest.TestCase):
         value = self.db._get_metadata('test-key')
         self.assertEqual(value, 'test-value')
 
+    def test_metadata_pickle(self):
+        # metadata holds objects, such as the researcher, so it is not
+        # stored with the blob codec of the primary objects
+        self.db._set_metadata('test-key', {'test-value'})
+        self.db.dbapi.execute("SELECT value FROM metadata WHERE setting = ?",
+                              ['test-key'])
+        self.assertEqual(pickle.loads(self.db.dbapi.fetchone()[0]),
+                         {'test-value'})
+        self.assertEqual(self.db._get_metadata('test-key'), {'test-value'})
+
     def test_metadata_missing(self):
         value = self.db._get_metadata('missing-key')
         self.assertEqual(value, [])
@@ -866,5 +1474,9 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved['Mary'], (1, 4, 0))
 
 
+def perfSuite():
+    from gramps.plugins.db.dbapi.test.bulk_perf import BulkPerfTest
+    return unittest.defaultTestLoader.loadTestsFromTestCase(BulkPerfTest)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the read throughput of a SQLite database, from the writer
+thread alone and from several threads with their own read connections.
+
+Run with::
+
+    python3 -m unittest gramps.plugins.db.dbapi.test.reader_perf
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import DBBACKEND
+from gramps.gen.db.utils import make_database, import_as_dict
+from gramps.gen.user import User
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+TASKS = 64
+
+def read_task(db):
+    """
+    A read of the kind done by views and filters.
+    """
+    return (db.get_person_handles(sort_handles=True),
+            db.get_family_handles(sort_handles=True),
+            db.get_place_handles(sort_handles=True),
+            db.get_surname_list())
+
+class ReaderPerfTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.path = tempfile.mkdtemp()
+        with open(os.path.join(cls.path, DBBACKEND), "w") as backend_file:
+            backend_file.write("sqlite")
+        source = import_as_dict(EXAMPLE, User())
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.path)
+        with DbTxn('Load', cls.db, batch=True) as trans:
+            for obj_type in ('Person', 'Family', 'Event', 'Place',
+                             'Repository', 'Source', 'Citation', 'Media',
+                             'Note', 'Tag'):
+                commit = cls.db.method('commit_%s', obj_type)
+                get_object = source.method('get_%s_from_handle', obj_type)
+                for handle in source.method('get_%s_handles', obj_type)():
+                    obj = get_object(handle)
+                    commit(obj, trans, obj.change)
+        source.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.path)
+
+    def __measure(self, threads):
+        start = time.perf_counter()
+        if threads:
+            with ThreadPoolExecutor(threads) as executor:
+                results = list(executor.map(read_task, [self.db] * TASKS))
+        else:
+            results = [read_task(self.db) for dummy in range(TASKS)]
+        elapsed = time.perf_counter() - start
+        print("%-10s %8.2f s  %8.1f reads/s" %
+              ("%d threads" % threads if threads else "writer",
+               elapsed, TASKS / elapsed))
+        return results
+
+    def test_read_throughput(self):
+        print()
+        expected = self.__measure(0)
+        for threads in (1, 2, 4, 8):
+            self.assertEqual(self.__measure(threads), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,7 +38,8 @@ Gramps' XML file format.
 import time
 import shutil
 import os
-import codecs
+import io
+from collections import deque
 from xml.sax.saxutils import escape
 
 #------------------------------------------------------------------------
@@ -62,6 +63,8 @@ from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
 from gramps.version import VERSION
 from gramps.gen.constfunc import win
+from gramps.gen.config import config
+from gramps.gen.utils.pool import get_worker_processes, start_pool, stop_pool
 from gramps.gui.plug.export import WriterOptionBox, WriterOptionBoxWithCompression
 import gramps.plugins.lib.libgrampsxml as libgrampsxml
 
@@ -80,6 +83,11 @@ except:
 # table for skipping control chars from XML except 09, 0A, 0D
 strip_dict = dict.fromkeys(list(range(9))+list(range(11,13))+list(range(14, 32)))
 
+# tables with fewer objects are always written in the main process
+MIN_PARALLEL_OBJECTS = 5000
+# number of objects a worker process writes at a time
+CHUNK_SIZE = 500
+
 def escxml(d):
     return escape(d,
                   {'"' : '&quot;',
@@ -98,7 +106,7 @@ class GrampsXmlWriter(UpdateCallback):
     """
 
     def __init__(self, db, strip_photos=0, compress=1, version="unknown",
-                 user=None):
+                 user=None, compresslevel=None):
         """
         Initialize, but does not write, an XML file.
 
@@ -108,12 +116,20 @@ class GrampsXmlWriter(UpdateCallback):
         >              1: remove everything expect the filename (eg gpkg)
         >              2: remove leading slash (quick write)
         compress - attempt to compress the database
+        compresslevel - gzip compression level, from 1 (fast) to 9 (best),
+        >              0 is no compression.  The default is the
+        >              export.xml-compression-level option.
         """
-        UpdateCallback.__init__(self, user.callback)
+        UpdateCallback.__init__(self, user.callback if user else None)
         self.user = user
-        self.compress = compress
+        if compresslevel is None:
+            compresslevel = config.get('export.xml-compression-level')
+        self.compresslevel = compresslevel
+        self.compress = compress and compresslevel > 0
         if not _gzip_ok:
             self.compress = False
+        self.processes = get_worker_processes()
+        self.pool = None
         self.db = db
         self.strip_photos = strip_photos
         self.version = version
@@ -163,7 +179,8 @@ class GrampsXmlWriter(UpdateCallback):
             try:
                 if self.compress and _gzip_ok:
                     try:
-                        g = gzip.open(filename,"wb")
+                        g = gzip.open(filename, "wb",
+                                      compresslevel=self.compresslevel)
                     except:
                         g = open(filename,"wb")
                 else:
@@ -174,9 +191,7 @@ class GrampsXmlWriter(UpdateCallback):
                                         str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.write_stream(g)
         if filename != '-':
             g.close()
         return 1
@@ -188,18 +203,30 @@ class GrampsXmlWriter(UpdateCallback):
 
         if self.compress and _gzip_ok:
             try:
-                g = gzip.GzipFile(mode="wb", fileobj=handle)
+                g = gzip.GzipFile(mode="wb", fileobj=handle,
+                                  compresslevel=self.compresslevel)
             except:
                 g = handle
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.write_stream(g)
         g.close()
         return 1
 
+    def write_stream(self, g):
+        """
+        Write the database to a binary stream, which is left open.
+        """
+        # Buffer the many small writes, rather than encoding and
+        # compressing them one by one
+        self.g = io.TextIOWrapper(g, encoding='utf-8', newline='\n')
+        try:
+            self.write_xml_data()
+        finally:
+            self.g.detach()
+            self.close_pool()
+
     def write_xml_data(self):
 
         date = time.localtime(time.time())
@@ -256,21 +283,16 @@ class GrampsXmlWriter(UpdateCallback):
         # Write table objects
         if tag_len > 0:
             self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
-                self.update()
+            self.write_objects(self.db.get_tag_handles(),
+                               self.db.get_tag_from_handle, 'write_tag')
             self.g.write("  </tags>\n")
 
         # Write primary objects
         if event_len > 0:
             self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event,2)
-                self.update()
+            self.write_objects(self.db.get_event_handles(),
+                               self.db.get_event_from_handle,
+                               'write_event')
             self.g.write("  </events>\n")
 
         if person_len > 0:
@@ -280,75 +302,58 @@ class GrampsXmlWriter(UpdateCallback):
                 self.g.write(' home="_%s"' % person.handle)
             self.g.write('>\n')
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
-                self.update()
+            self.write_objects(self.db.get_person_handles(),
+                               self.db.get_person_from_handle,
+                               'write_person')
             self.g.write("  </people>\n")
 
         if family_len > 0:
             self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family,2)
-                self.update()
+            self.write_objects(self.db.iter_family_handles(),
+                               self.db.get_family_from_handle,
+                               'write_family')
             self.g.write("  </families>\n")
 
         if citation_len > 0:
             self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation,2)
-                self.update()
+            self.write_objects(self.db.get_citation_handles(),
+                               self.db.get_citation_from_handle,
+                               'write_citation')
             self.g.write("  </citations>\n")
 
         if source_len > 0:
             self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source,2)
-                self.update()
+            self.write_objects(self.db.get_source_handles(),
+                               self.db.get_source_from_handle,
+                               'write_source')
             self.g.write("  </sources>\n")
 
         if place_len > 0:
             self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place,2)
-                self.update()
+            self.write_objects(self.db.get_place_handles(),
+                               self.db.get_place_from_handle,
+                               'write_place_obj')
             self.g.write("  </places>\n")
 
         if obj_len > 0:
             self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj,2)
-                self.update()
+            self.write_objects(self.db.get_media_handles(),
+                               self.db.get_media_from_handle,
+                               'write_object')
             self.g.write("  </objects>\n")
 
         if repo_len > 0:
             self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo,2)
-                self.update()
+            self.write_objects(self.db.get_repository_handles(),
+                               self.db.get_repository_from_handle,
+                               'write_repository')
             self.g.write("  </repositories>\n")
 
         if note_len > 0:
             self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
+            self.write_objects(self.db.get_note_handles(),
+                               self.db.get_note_from_handle,
+                               'write_note')
             self.g.write("  </notes>\n")
 
         # Data is written, now write bookmarks.
@@ -360,6 +365,51 @@ class GrampsXmlWriter(UpdateCallback):
 #        self.status.end()
 #        self.status = None
 
+    def write_objects(self, handles, get_object, method):
+        """
+        Write the objects of a table, sorted by handle, with the given
+        write method.
+
+        If the behavior.worker-processes option is greater than one, the
+        objects of large tables are written in chunks by worker processes,
+        and the chunks are copied to the output in order.
+        """
+        handles = sorted(handles)
+        if self.processes < 2 or len(handles) < MIN_PARALLEL_OBJECTS:
+            write_object = getattr(self, method)
+            for handle in handles:
+                obj = get_object(handle)
+                if obj:
+                    write_object(obj, 2)
+                self.update()
+            return
+
+        if self.pool is None:
+            self.pool = start_pool(self.processes, _init_worker,
+                                   (self.strip_photos,))
+        results = deque()
+        for start in range(0, len(handles), CHUNK_SIZE):
+            chunk = []
+            for handle in handles[start:start + CHUNK_SIZE]:
+                obj = get_object(handle)
+                if obj:
+                    chunk.append((obj.__class__, obj.serialize()))
+                self.update()
+            results.append(self.pool.apply_async(_write_chunk,
+                                                 (method, chunk)))
+            if len(results) > 2 * self.processes:
+                self.g.write(results.popleft().get())
+        while results:
+            self.g.write(results.popleft().get())
+
+    def close_pool(self):
+        """
+        Stop the worker processes.
+        """
+        if self.pool is not None:
+            stop_pool(self.pool)
+            self.pool = None
+
     def write_metadata(self):
         """ Method to write out metadata of the database
         """
@@ -1340,15 +1390,33 @@ def export_data(database, filename, user, option_box=None):
             pass
 
     compress = _gzip_ok == 1
+    compresslevel = None
 
     if option_box:
         option_box.parse_options()
         database = option_box.get_filtered_database(database)
         compress = compress and option_box.get_use_compression()
+        compresslevel = option_box.get_compression_level()
 
-    g = XmlWriter(database, user, 0, compress)
+    g = XmlWriter(database, user, 0, compress, compresslevel)
     return g.write(filename)
 
+#-------------------------------------------------------------------------
+#
+# Worker process
+#
+#-------------------------------------------------------------------------
+def _init_worker(strip_photos):
+    global _WRITER
+    _WRITER = GrampsXmlWriter(None, strip_photos)
+
+def _write_chunk(method, chunk):
+    _WRITER.g = io.StringIO()
+    write_object = getattr(_WRITER, method)
+    for obj_class, data in chunk:
+        write_object(obj_class.create(data), 2)
+    return _WRITER.g.getvalue()
+
 #-------------------------------------------------------------------------
 #
 # XmlWriter
@@ -1359,9 +1427,11 @@ class XmlWriter(GrampsXmlWriter):
     Writes a database to the XML file.
     """
 
-    def __init__(self, dbase, user, strip_photos, compress=1):
+    def __init__(self, dbase, user, strip_photos, compress=1,
+                 compresslevel=None):
         GrampsXmlWriter.__init__(
-            self, dbase, strip_photos, compress, VERSION, user)
+            self, dbase, strip_photos, compress, VERSION, user,
+            compresslevel)
         self.user = user
 
     def write(self, filename):
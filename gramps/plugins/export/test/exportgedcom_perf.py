@@ -0,0 +1,87 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of a GEDCOM export through a chain of proxies, with and without
+the chain materialized first.
+
+Run with::
+
+    python3 -m unittest gramps.plugins.export.test.exportgedcom_perf
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.proxy import (PrivateProxyDb, LivingProxyDb,
+                              ReferencedBySelectionProxyDb,
+                              MaterializedProxyDb)
+from gramps.gen.user import User
+from gramps.plugins.export.exportgedcom import GedcomWriter
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class ExportGedcomPerfTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.path = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.path)
+
+    def chain(self):
+        """
+        The proxies of the default export options, with living people
+        restricted to their last names.
+        """
+        dbase = PrivateProxyDb(self.db)
+        dbase = LivingProxyDb(dbase, LivingProxyDb.MODE_INCLUDE_LAST_NAME_ONLY)
+        return ReferencedBySelectionProxyDb(dbase, all_people=True)
+
+    def __measure(self, name, materialize):
+        dbase = self.chain()
+        filename = os.path.join(self.path, name + ".ged")
+        start = time.perf_counter()
+        if materialize:
+            dbase = MaterializedProxyDb(dbase)
+        GedcomWriter(dbase, User()).write_gedcom_file(filename)
+        print("%-12s %6.2f s" % (name, time.perf_counter() - start))
+        with open(filename, encoding='utf-8') as gedcom:
+            # without the header, which has the time of the export
+            return gedcom.read().split("0 @SUBM@", 1)[1]
+
+    def test_export(self):
+        print()
+        stacked = self.__measure('stacked', False)
+        materialized = self.__measure('materialized', True)
+        self.assertEqual(materialized, stacked)
+
+if __name__ == "__main__":
+    unittest.main()
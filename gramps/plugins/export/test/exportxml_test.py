@@ -0,0 +1,92 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the Gramps XML export """
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from ..exportxml import XmlWriter
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class ExportXmlTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.path = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.path)
+
+    def setUp(self):
+        self.processes = config.get('behavior.worker-processes')
+
+    def tearDown(self):
+        config.set('behavior.worker-processes', self.processes)
+
+    def __write(self, name, compresslevel, processes=0):
+        """
+        Export the example database and return the bytes of the file.
+        """
+        config.set('behavior.worker-processes', processes)
+        filename = os.path.join(self.path, name)
+        writer = XmlWriter(self.db, User(), 0, 1, compresslevel)
+        self.assertTrue(writer.write(filename))
+        with open(filename, 'rb') as xml_file:
+            return xml_file.read()
+
+    def test_parallel(self):
+        serial = self.__write('serial.gramps', 0)
+        # small tables are written by the workers too
+        with patch('gramps.plugins.export.exportxml.MIN_PARALLEL_OBJECTS',
+                   10), \
+                patch('gramps.plugins.export.exportxml.CHUNK_SIZE', 7):
+            parallel = self.__write('parallel.gramps', 0, 2)
+        self.assertEqual(parallel, serial)
+
+    def test_compresslevel(self):
+        plain = self.__write('plain.gramps', 0)
+        self.assertTrue(plain.startswith(b'<?xml'))
+        fast = self.__write('fast.gramps', 1)
+        best = self.__write('best.gramps', 9)
+        # the extra flags of the gzip header give the level used
+        self.assertEqual(fast[:2], b'\x1f\x8b')
+        self.assertEqual(fast[8], 4)
+        self.assertEqual(best[8], 2)
+        self.assertLess(len(best), len(fast))
+        self.assertEqual(gzip.decompress(fast), plain)
+        self.assertEqual(gzip.decompress(best), plain)
+
+
+if __name__ == "__main__":
+    unittest.main()
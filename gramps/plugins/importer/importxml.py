@@ -87,8 +87,10 @@ try:
     GZIP_OK = True
 except:
     GZIP_OK = False
+GZIP_MAGIC = b'\x1f\x8b'
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+# The number of bytes given to the XML parser at a time
+BUFFER_SIZE = 1 << 16
 
 CHILD_REL_MAP = {
     "Birth"     : ChildRefType(ChildRefType.BIRTH),
@@ -119,8 +121,7 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 1
-    person_cnt = 0
+    file_size = 0
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -138,15 +139,13 @@ def importData(database, filename, user):
                                    config.get('preferences.tag-on-import') else None))
 
         if filename != '-':
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
+            file_size = os.path.getsize(filename)
 
         read_only = database.readonly
         database.readonly = False
 
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            info = parser.parse(xml_file, file_size)
         except GrampsImportError as err: # version error
             user.notify_error(*err.messages())
             return
@@ -330,59 +329,6 @@ class ImportInfo:
 
         return txt
 
-class LineParser:
-    def __init__(self, filename):
-
-        self.count = 0
-        self.person_count = 0
-
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                with gzip.open(filename, "r") as f:
-                    f.read(1)
-            except IOError as msg:
-                use_gzip = 0
-            except ValueError as msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
-
-        try:
-            if use_gzip:
-                import io
-                # Bug 6255. TextIOWrapper is required for python3 to
-                #           present file contents as text, otherwise they
-                #           are read as binary. However due to a missing
-                #           method (read1) in early python3 versions this
-                #           try block will fail.
-                #           Gramps will still import XML files using python
-                #           versions < 3.3.0 but the file progress meter
-                #           will not work properly, going immediately to
-                #           100%.
-                #           It should work correctly from version 3.3.
-                ofile = io.TextIOWrapper(gzip.open(filename, "rb"),
-                                         encoding='utf8', errors='replace')
-            else:
-                ofile = open(filename, "r", encoding='utf8', errors='replace')
-
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-        except:
-            self.count = 0
-            self.person_count = 0
-        finally:
-            # Ensure the file handle is always closed
-            ofile.close()
-
-    def get_count(self):
-        return self.count
-
-    def get_person_count(self):
-        return self.person_count
-
 #-------------------------------------------------------------------------
 #
 # ImportOpenFileContextManager
@@ -395,6 +341,7 @@ class ImportOpenFileContextManager:
     def __init__(self, filename, user):
         self.filename = filename
         self.filehandle = None
+        self.rawfile = None
         self.user = user
 
     def __enter__(self):
@@ -411,6 +358,8 @@ class ImportOpenFileContextManager:
         if self.filename != '-':
             if self.filehandle:
                 self.filehandle.close()
+            if self.rawfile:
+                self.rawfile.close()
         return False
 
     def open_file(self, filename):
@@ -418,24 +367,17 @@ class ImportOpenFileContextManager:
         Open the xml file.
         Return a valid file handle if the file opened sucessfully.
         Return None if the file was not able to be opened.
-        """
-        if GZIP_OK:
-            use_gzip = True
-            try:
-                with gzip.open(filename, "r") as ofile:
-                    ofile.read(1)
-            except IOError as msg:
-                use_gzip = False
-            except ValueError as msg:
-                use_gzip = True
-        else:
-            use_gzip = False
 
+        A gzip compressed file is recognized by its magic number, its file
+        handle has the compressed file in its fileobj attribute.
+        """
         try:
-            if use_gzip:
-                xml_file = gzip.open(filename, "rb")
+            self.rawfile = open(filename, "rb")
+            if GZIP_OK and self.rawfile.peek(2)[:2] == GZIP_MAGIC:
+                xml_file = gzip.GzipFile(filename, "rb", fileobj=self.rawfile)
             else:
-                xml_file = open(filename, "rb")
+                xml_file = self.rawfile
+                self.rawfile = None
         except IOError as msg:
             self.user.notify_error(_("%s could not be opened") % filename, str(msg))
             xml_file = None
@@ -910,19 +852,20 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=1, personcount=0):
+    def parse(self, ifile, file_size=0):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
+        :param file_size: the size of the file, for the progress.  The
+                          position in a gzip compressed file is taken from
+                          its fileobj attribute.
         """
-        if personcount < 1000:
-            no_magic = True
-        else:
-            no_magic = False
         with DbTxn(_("Gramps XML import"), self.db, batch=True,
-                   no_magic=no_magic) as self.trans:
-            self.set_total(linecount)
+                   bulk=True) as self.trans:
+            if file_size:
+                self.set_total(file_size)
+                tell = getattr(ifile, 'fileobj', ifile).tell
 
             self.db.disable_signals()
 
@@ -933,7 +876,17 @@ class GrampsParser(UpdateCallback):
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            self.p.buffer_text = True
+            data = ifile.read(BUFFER_SIZE)
+            while data:
+                self.p.Parse(data, False)
+                if file_size:
+                    self.update(tell())
+                data = ifile.read(BUFFER_SIZE)
+            self.p.Parse(b'', True)
+            # The people are counted while parsing
+            self.trans.no_magic = self.info.data_newobject[
+                ImportInfo.key2data[PERSON_KEY]] < 1000
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1149,7 +1102,6 @@ class GrampsParser(UpdateCallback):
         # Gramps LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get('title', '')
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
         if self.default_tag:
             self.placeobj.add_tag(self.default_tag.handle)
         return self.placeobj
@@ -1258,7 +1210,6 @@ class GrampsParser(UpdateCallback):
             self.info.add('new-object', EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.event = Event()
             if 'handle' in attrs:
                 orig_handle = attrs['handle'].replace('_', '')
@@ -1456,7 +1407,6 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.person = Person()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -1591,7 +1541,6 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.family = Family()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -1872,7 +1821,6 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if 'handle' in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.note = Note()
             if 'handle' in attrs:
                 orig_handle = attrs['handle'].replace('_', '')
@@ -2071,7 +2019,6 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs['handle'].replace('_', '')
         is_merge_candidate = (self.replace_import_handle and
@@ -2127,7 +2074,6 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.source = Source()
         if 'handle' in attrs:
             orig_handle = attrs['handle'].replace('_', '')
@@ -2276,7 +2222,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        pass
 
     def stop_media(self, *tag):
         self.db.commit_media(self.object, self.trans,
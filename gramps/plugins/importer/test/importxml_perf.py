@@ -0,0 +1,99 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the import of the example trees, plain and gzip compressed.
+
+The counting pass that the import made before parsing is timed separately,
+as the time saved by the single pass.  Run with::
+
+    python3 -m unittest gramps.plugins.importer.test.importxml_perf
+"""
+
+import os
+import io
+import re
+import gzip
+import shutil
+import tempfile
+import time
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.importer.importxml import importData
+
+EXAMPLE = os.path.join(DATA_DIR, os.pardir, "example", "gramps",
+                       "example.gramps")
+PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+
+def count_lines(filename, use_gzip):
+    """
+    The counting pass of the previous import: count the lines and people.
+    """
+    if use_gzip:
+        ofile = io.TextIOWrapper(gzip.open(filename, "rb"),
+                                 encoding='utf8', errors='replace')
+    else:
+        ofile = open(filename, "r", encoding='utf8', errors='replace')
+    count = person_count = 0
+    with ofile:
+        for line in ofile:
+            count += 1
+            if PERSON_RE.match(line):
+                person_count += 1
+    return count, person_count
+
+class ImportXmlPerfTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.gzipped = os.path.join(cls.tmpdir, "example.gramps")
+        with open(EXAMPLE, 'rb') as ifile:
+            with gzip.open(cls.gzipped, 'wb') as ofile:
+                shutil.copyfileobj(ifile, ofile)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def __measure(self, name, filename, use_gzip):
+        start = time.perf_counter()
+        count_lines(filename, use_gzip)
+        count_time = time.perf_counter() - start
+        db = make_database("sqlite")
+        db.load(":memory:")
+        start = time.perf_counter()
+        importData(db, filename, User())
+        import_time = time.perf_counter() - start
+        self.assertEqual(db.get_number_of_people(), 2157)
+        db.close()
+        print("%-8s import %6.2f s  counting pass %6.2f s  two passes %6.2f s"
+              % (name, import_time, count_time, import_time + count_time))
+
+    def test_import(self):
+        print()
+        self.__measure('plain', EXAMPLE, False)
+        self.__measure('gzip', self.gzipped, True)
+
+if __name__ == "__main__":
+    unittest.main()
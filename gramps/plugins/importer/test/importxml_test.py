@@ -0,0 +1,95 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the import of Gramps XML
+"""
+
+import os
+import gzip
+import shutil
+import tempfile
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.importer.importxml import (
+    GrampsParser, ImportOpenFileContextManager, importData)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "data.gramps")
+
+class ImportXmlTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.gzipped = os.path.join(cls.tmpdir, "data.gramps")
+        with open(EXAMPLE, 'rb') as ifile:
+            with gzip.open(cls.gzipped, 'wb') as ofile:
+                shutil.copyfileobj(ifile, ofile)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def import_file(self, filename):
+        """
+        Import a file and return the positions reported for the progress,
+        and the number of objects.
+        """
+        db = make_database("sqlite")
+        db.load(":memory:")
+        user = User()
+        positions = []
+        with ImportOpenFileContextManager(filename, user) as xml_file:
+            parser = GrampsParser(db, user, 0)
+            parser.update = positions.append
+            parser.parse(xml_file, os.path.getsize(filename))
+        counts = (db.get_number_of_people(), db.get_number_of_families(),
+                  db.get_number_of_events(), db.get_number_of_notes())
+        db.close()
+        return positions, counts
+
+    def test_single_pass(self):
+        positions, counts = self.import_file(EXAMPLE)
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(positions[-1], os.path.getsize(EXAMPLE))
+        gz_positions, gz_counts = self.import_file(self.gzipped)
+        self.assertEqual(gz_counts, counts)
+        self.assertEqual(gz_positions, sorted(gz_positions))
+        self.assertEqual(gz_positions[-1], os.path.getsize(self.gzipped))
+
+    def test_import_data(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        importData(db, self.gzipped, User())
+        self.assertEqual(db.get_number_of_people(), 60)
+        self.assertFalse(db.readonly)
+        db.close()
+
+
+def perfSuite():
+    from gramps.plugins.importer.test.importxml_perf import ImportXmlPerfTest
+    return unittest.defaultTestLoader.loadTestsFromTestCase(ImportXmlPerfTest)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,610 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Search for people who may be duplicates of each other.
+
+The search runs in three steps:
+
+1. The data used to compare two people is extracted once per person into
+   a compact :class:`PersonRecord`.
+2. A blocking index groups the people by surname key, gender, birth year
+   and birth place keys.  Only people who share a block can possibly
+   score above zero, so only those pairs are compared.
+3. The candidate pairs are scored, in a pool of worker processes when
+   there are enough of them.
+
+The scores are the same as those of a full pairwise comparison.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Standard python modules
+#
+#-------------------------------------------------------------------------
+from collections import namedtuple
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.lib import Event, Person
+from gramps.gen.soundex import soundex, compare
+from gramps.gen.utils.pool import get_worker_processes, worker_pool
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.sgettext
+
+#-------------------------------------------------------------------------
+#
+# Constants
+#
+#-------------------------------------------------------------------------
+WILDCARD = None
+MIN_PAIRS_PER_PROCESS = 5000
+
+PersonRecord = namedtuple('PersonRecord', [
+    'handle',
+    'gender',
+    'name',         # NameRecord of the primary name
+    'birth',        # Date
+    'death',        # Date
+    'birth_place',  # (place handle, place title)
+    'death_place',  # (place handle, place title)
+    'parents',      # (father NameRecord, mother NameRecord) or None
+    'spouses',      # [(father handle, father NameRecord,
+                    #   mother handle, mother NameRecord)]
+    ])
+
+NameRecord = namedtuple('NameRecord', ['surnames', 'suffix', 'first_name'])
+
+# State of a worker process
+_FINDER = None
+
+#-------------------------------------------------------------------------
+#
+# Helper functions
+#
+#-------------------------------------------------------------------------
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return ' '.join([surn.get_surname() for surn in name.get_surname_list()])
+
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == '.':
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+def name_record(name):
+    """
+    Return the NameRecord of a Name, or None.
+    """
+    if not name:
+        return None
+    return NameRecord(get_surnames(name), name.get_suffix(),
+                      name.get_first_name())
+
+#-------------------------------------------------------------------------
+#
+# DuplicateFinder
+#
+#-------------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Find people who may be duplicates of each other.
+    """
+
+    def __init__(self, db, use_soundex=True, processes=None):
+        """
+        :param db: the database to search.
+        :param use_soundex: compare names by their SoundEx codes.
+        :type use_soundex: bool
+        :param processes: number of worker processes used to score the
+                          candidate pairs, below two to score them in this
+                          process; None for the behavior.worker-processes
+                          option.
+        :type processes: int
+        """
+        self.db = db
+        self.use_soundex = use_soundex
+        if processes is None:
+            processes = get_worker_processes()
+        self.processes = processes
+        self.records = {}
+        self.main_parents = {}
+        self.ancestor_cache = {}
+
+    def gen_key(self, val):
+        if self.use_soundex:
+            try:
+                return soundex(val)
+            except UnicodeEncodeError:
+                return val
+        else:
+            return val
+
+    def name_compare(self, s1, s2):
+        if self.use_soundex:
+            try:
+                return compare(s1, s2)
+            except UnicodeEncodeError:
+                return s1 == s2
+        else:
+            return s1 == s2
+
+    #---------------------------------------------------------------------
+    #
+    # Feature extraction
+    #
+    #---------------------------------------------------------------------
+    def __get_name(self, person_handle):
+        if not person_handle:
+            return None
+        person = self.db.get_person_from_handle(person_handle)
+        if person:
+            return name_record(person.get_primary_name())
+        return None
+
+    def __get_event(self, event_ref):
+        if event_ref:
+            return self.db.get_event_from_handle(event_ref.ref)
+        return Event()
+
+    def __get_place(self, place_handle):
+        if not place_handle:
+            return (place_handle, "")
+        return (place_handle,
+                self.db.get_place_from_handle(place_handle).get_title())
+
+    def make_record(self, person):
+        """
+        Extract the data used to compare a person with others.
+        """
+        birth = self.__get_event(person.get_birth_ref())
+        death = self.__get_event(person.get_death_ref())
+
+        parents = None
+        family_handle = person.get_main_parents_family_handle()
+        if family_handle:
+            family = self.db.get_family_from_handle(family_handle)
+            parents = (self.__get_name(family.get_father_handle()),
+                       self.__get_name(family.get_mother_handle()))
+
+        spouses = []
+        for family_handle in person.get_family_handle_list():
+            family = self.db.get_family_from_handle(family_handle)
+            father_handle = family.get_father_handle()
+            mother_handle = family.get_mother_handle()
+            spouses.append((father_handle, self.__get_name(father_handle),
+                            mother_handle, self.__get_name(mother_handle)))
+
+        return PersonRecord(person.get_handle(), person.get_gender(),
+                            name_record(person.get_primary_name()),
+                            birth.get_date_object(), death.get_date_object(),
+                            self.__get_place(birth.get_place_handle()),
+                            self.__get_place(death.get_place_handle()),
+                            parents, spouses)
+
+    #---------------------------------------------------------------------
+    #
+    # Blocking index
+    #
+    #---------------------------------------------------------------------
+    def year_band(self, date):
+        """
+        Return the birth year band of a date.
+
+        Two regular dates can only match if they are in the same year.
+        Empty and compound dates can match any year.
+        """
+        if date.is_empty() or date.is_compound():
+            return WILDCARD
+        return date.get_year()
+
+    def place_keys(self, place):
+        """
+        Return the keys of a birth place.
+
+        Two places can only match if they share a word with the same key,
+        or have the same title.  Unknown places match any place.
+        """
+        title = place[1]
+        if not title:
+            return (WILDCARD,)
+        keys = set(self.gen_key(word)
+                   for word in title.replace(",", " ").split())
+        keys.add(('title', title))
+        return tuple(keys)
+
+    def build_index(self, user=None):
+        """
+        Extract the records of all people and build the blocking index.
+
+        The index maps the surname key and gender of a block to a dictionary
+        mapping a birth year band to a dictionary mapping a birth place key
+        to the positions of the people with those keys.  Also returns the
+        handles of all people, in the order in which they are compared.
+        """
+        handles = []
+        index = {}
+        if user:
+            user.begin_progress(_('Find Duplicates'),
+                                _('Pass 1: Building preliminary lists'),
+                                self.db.get_number_of_people())
+        for handle in self.db.iter_person_handles():
+            if user:
+                user.step_progress()
+            person = self.db.get_person_from_handle(handle)
+            record = self.make_record(person)
+            self.records[handle] = record
+            family_handle = person.get_main_parents_family_handle()
+            if family_handle:
+                family = self.db.get_family_from_handle(family_handle)
+                self.main_parents[handle] = (family.get_father_handle(),
+                                             family.get_mother_handle())
+
+            band = index.setdefault(self.block_key(record), {}).setdefault(
+                self.year_band(record.birth), {})
+            for place_key in self.place_keys(record.birth_place):
+                band.setdefault(place_key, []).append(len(handles))
+            handles.append(handle)
+        if user:
+            user.end_progress()
+        return index, handles
+
+    def block_key(self, record):
+        """
+        Return the surname key and gender of a person.
+        """
+        return (self.gen_key(record.name.surnames),
+                record.gender == Person.MALE)
+
+    def candidates(self, index, record):
+        """
+        Return the positions of the people who could match the person, in
+        the order in which they are compared.
+        """
+        block = index[self.block_key(record)]
+        band = self.year_band(record.birth)
+        if band is WILDCARD:
+            bands = block.values()
+        else:
+            bands = [block[band]]
+            if WILDCARD in block:
+                bands.append(block[WILDCARD])
+        place_keys = self.place_keys(record.birth_place)
+        found = set()
+        for places in bands:
+            if place_keys[0] is WILDCARD:
+                for positions in places.values():
+                    found.update(positions)
+            else:
+                for place_key in place_keys + (WILDCARD,):
+                    found.update(places.get(place_key, ()))
+        return sorted(found)
+
+    #---------------------------------------------------------------------
+    #
+    # Scoring
+    #
+    #---------------------------------------------------------------------
+    def ancestors(self, handle):
+        """
+        Return the set of a person and their ancestors through the main
+        parent families.
+        """
+        if handle in self.ancestor_cache:
+            return self.ancestor_cache[handle]
+        result = set()
+        todo = [handle]
+        while todo:
+            person_handle = todo.pop()
+            if not person_handle or person_handle in result:
+                continue
+            result.add(person_handle)
+            todo.extend(self.main_parents.get(person_handle, ()))
+        self.ancestor_cache[handle] = result
+        return result
+
+    def compare_people(self, p1, p2):
+        """
+        Return the likelihood that two people are the same, or -1 if they
+        cannot be.
+        """
+        chance = self.name_match(p1.name, p2.name)
+        if chance == -1:
+            return -1
+
+        value = self.date_match(p1.birth, p2.birth)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.date_match(p1.death, p2.death)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(p1.birth_place, p2.birth_place)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(p1.death_place, p2.death_place)
+        if value == -1:
+            return -1
+        chance += value
+
+        if p2.handle in self.ancestors(p1.handle):
+            return -1
+        if p1.handle in self.ancestors(p2.handle):
+            return -1
+
+        if p1.parents and p2.parents:
+            value = self.name_match(p1.parents[0], p2.parents[0])
+            if value == -1:
+                return -1
+            chance += value
+
+            value = self.name_match(p1.parents[1], p2.parents[1])
+            if value == -1:
+                return -1
+            chance += value
+
+        if p1.gender == Person.FEMALE:
+            # Compare the husbands
+            offset = 0
+        else:
+            # Compare the wives
+            offset = 2
+        for spouses1 in p1.spouses:
+            for spouses2 in p2.spouses:
+                spouse1_id, spouse1 = spouses1[offset:offset + 2]
+                spouse2_id, spouse2 = spouses2[offset:offset + 2]
+                if spouse1_id and spouse2_id:
+                    if spouse1_id == spouse2_id:
+                        chance += 1
+                    else:
+                        value = self.name_match(spouse1, spouse2)
+                        if value != -1:
+                            chance += value
+        return chance
+
+    def date_match(self, date1, date2):
+        if date1.is_empty() or date2.is_empty():
+            return 0
+        if date1.is_equal(date2):
+            return 1
+
+        if date1.is_compound() or date2.is_compound():
+            return self.range_compare(date1, date2)
+
+        if date1.get_year() == date2.get_year():
+            if date1.get_month() == date2.get_month():
+                return 0.75
+            if not date1.get_month_valid() or not date2.get_month_valid():
+                return 0.75
+            else:
+                return -1
+        else:
+            return -1
+
+    def range_compare(self, date1, date2):
+        start_date_1 = date1.get_start_date()[0:3]
+        start_date_2 = date2.get_start_date()[0:3]
+        stop_date_1 = date1.get_stop_date()[0:3]
+        stop_date_2 = date2.get_stop_date()[0:3]
+        if date1.is_compound() and date2.is_compound():
+            if (start_date_2 <= start_date_1 <= stop_date_2 or
+                    start_date_1 <= start_date_2 <= stop_date_1 or
+                    start_date_2 <= stop_date_1 <= stop_date_2 or
+                    start_date_1 <= stop_date_2 <= stop_date_1):
+                return 0.5
+            else:
+                return -1
+        elif date2.is_compound():
+            if start_date_2 <= start_date_1 <= stop_date_2:
+                return 0.5
+            else:
+                return -1
+        else:
+            if start_date_1 <= start_date_2 <= stop_date_1:
+                return 0.5
+            else:
+                return -1
+
+    def name_match(self, name, name1):
+        if not name1 or not name:
+            return 0
+
+        if not self.name_compare(name.surnames, name1.surnames):
+            return -1
+        if name.suffix != name1.suffix:
+            if name.suffix != "" and name1.suffix != "":
+                return -1
+
+        if name.first_name == name1.first_name:
+            return 1
+        else:
+            list1 = name.first_name.split()
+            list2 = name1.first_name.split()
+
+            if len(list1) < len(list2):
+                return self.list_reduce(list1, list2)
+            else:
+                return self.list_reduce(list2, list1)
+
+    def place_match(self, place1, place2):
+        if place1[0] == place2[0]:
+            return 1
+
+        name1 = place1[1]
+        name2 = place2[1]
+        if not (name1 and name2):
+            return 0
+        if name1 == name2:
+            return 1
+
+        list1 = name1.replace(",", " ").split()
+        list2 = name2.replace(",", " ").split()
+
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def list_reduce(self, list1, list2):
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if is_initial(name) and name[0] == name2[0]:
+                    value += 0.25
+                elif is_initial(name2) and name2[0] == name[0]:
+                    value += 0.25
+                elif name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def score(self, pairs):
+        """
+        Return the scores of a list of (handle, handle) pairs.
+        """
+        return [self.compare_people(self.records[handle1],
+                                    self.records[handle2])
+                for handle1, handle2 in pairs]
+
+    #---------------------------------------------------------------------
+    #
+    # Search
+    #
+    #---------------------------------------------------------------------
+    def pair_key(self, handle1, handle2):
+        """
+        Return the key under which the score of a pair is stored.
+
+        The score does not depend on the order of two people of the same
+        gender, so such pairs are only scored once.
+        """
+        if (self.records[handle1].gender == self.records[handle2].gender
+                and handle2 < handle1):
+            return (handle2, handle1)
+        return (handle1, handle2)
+
+    def find(self, threshold, user=None):
+        """
+        Return a dictionary mapping the handle of a person to a tuple of
+        the handle of a possible duplicate and the likelihood of the match.
+        """
+        index, handles = self.build_index(user)
+
+        if user:
+            user.begin_progress(_('Find Duplicates'),
+                                _('Pass 2: Calculating potential matches'),
+                                len(handles))
+        comparisons = []
+        pairs = set()
+        for handle1 in handles:
+            if user:
+                user.step_progress()
+            others = [handles[position] for position in
+                      self.candidates(index, self.records[handle1])
+                      if handles[position] != handle1]
+            comparisons.append((handle1, others))
+            pairs.update(self.pair_key(handle1, handle2)
+                         for handle2 in others)
+        if user:
+            user.end_progress()
+
+        scores = self.score_pairs(sorted(pairs), user)
+
+        the_map = {}
+        for handle1, others in comparisons:
+            for handle2 in others:
+                if handle2 in the_map and the_map[handle2][0] == handle1:
+                    continue
+                chance = scores[self.pair_key(handle1, handle2)]
+                if chance >= threshold:
+                    if handle1 in the_map:
+                        if the_map[handle1][1] > chance:
+                            the_map[handle1] = (handle2, chance)
+                    else:
+                        the_map[handle1] = (handle2, chance)
+        return the_map
+
+    def score_pairs(self, pairs, user=None):
+        """
+        Return a dictionary of the scores of the pairs.
+        """
+        processes = min(self.processes, len(pairs) // MIN_PAIRS_PER_PROCESS)
+        if processes < 2:
+            return dict(zip(pairs, self.score(pairs)))
+
+        chunk_size = MIN_PAIRS_PER_PROCESS
+        chunks = [pairs[start:start + chunk_size]
+                  for start in range(0, len(pairs), chunk_size)]
+        scores = {}
+        if user:
+            user.begin_progress(_('Find Duplicates'),
+                                _('Pass 3: Scoring potential matches'),
+                                len(chunks))
+        with worker_pool(processes, _init_worker,
+                         (self.use_soundex, self.records,
+                          self.main_parents)) as pool:
+            for chunk, result in zip(chunks, pool.imap(_score_chunk, chunks)):
+                scores.update(zip(chunk, result))
+                if user:
+                    user.step_progress()
+        if user:
+            user.end_progress()
+        return scores
+
+    def ranked(self, the_map):
+        """
+        Return the matches as a list of (chance, handle, handle) tuples,
+        best match first.
+        """
+        return sorted(((chance, handle1, handle2)
+                       for handle1, (handle2, chance) in the_map.items()),
+                      key=lambda match: (-match[0], match[1]))
+
+#-------------------------------------------------------------------------
+#
+# Worker process
+#
+#-------------------------------------------------------------------------
+def _init_worker(use_soundex, records, main_parents):
+    global _FINDER
+    _FINDER = DuplicateFinder(None, use_soundex, 1)
+    _FINDER.records = records
+    _FINDER.main_parents = main_parents
+
+def _score_chunk(pairs):
+    return _FINDER.score(pairs)
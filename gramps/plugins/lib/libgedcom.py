@@ -92,7 +92,7 @@ import os
 import re
 import time
 # from xml.parsers.expat import ParserCreate
-from collections import defaultdict, OrderedDict
+from collections import defaultdict, deque, OrderedDict
 import string
 import mimetypes
 from io import StringIO, TextIOWrapper
@@ -128,6 +128,7 @@ from gramps.gen.utils.file import media_path
 from gramps.gen.utils.id import create_id
 from gramps.gen.utils.lds import TEMPLES
 from gramps.gen.utils.unknown import make_unknown, create_explanation_note
+from gramps.gen.utils.pool import get_worker_processes, start_pool, stop_pool
 from gramps.gen.datehandler._dateparser import DateParser
 from gramps.gen.db.dbconst import EVENT_KEY
 from gramps.gen.lib.const import IDENTICAL
@@ -721,6 +722,10 @@ STRIP_DICT = dict.fromkeys(list(range(9)) + list(range(11, 13)) +
 # undefined, but if they have been used, the file is probably supposed to be
 # cp1252
 DEL_AND_C1 = dict.fromkeys(list(range(0x7F, 0x9F)))
+# number of characters the lexer reads at a time
+BLOCK_SIZE = 1 << 18
+# smallest file that the lexer tokenizes in a process pool
+MIN_PARALLEL_LINES = 200000
 
 #-------------------------------------------------------------------------
 #
@@ -811,6 +816,11 @@ SPAN = re.compile(r"\s*FROM\s+@#D?([^@]+)@\s*(.*)\s+TO\s+@#D?([^@]+)@\s*(.*)$")
 SPAN1 = re.compile(r"\s*FROM\s+\s*(.*)\s+TO\s+@#D?([^@]+)@\s*(.*)$")
 SPAN2 = re.compile(r"\s*FROM\s+@#D?([^@]+)@\s*(.*)\s+TO\s+\s*(.*)$")
 NAME_RE = re.compile(r"/?([^/]*)(/([^/]*)(/([^/]*))?)?")
+# A line with a plain tag, or any other line for the slow path
+LINE_RE = re.compile(r"^ *(\d+) +([^@ \n][^ \n]*)(?: (.*))?$|^(.*)$", re.M)
+# The start of a level 0 record
+LEVEL0_RE = re.compile(r"^ *0 +(?!CON[CT]\b)", re.M)
+ANSEL_ASCII_RE = re.compile(rb"[\n\r\x1b\x1d-\x7e]*")
 SURNAME_RE = re.compile(r"/([^/]*)/([^/]*)")
 
 
@@ -838,126 +848,250 @@ class GedcomDateParser(DateParser):
 # Lexer - serves as the lexical analysis engine
 #
 #-------------------------------------------------------------------------
-class Lexer:
-    """ low level line reading and early parsing """
-    def __init__(self, ifile, __add_msg):
-        self.ifile = ifile
-        self.current_list = []
-        self.eof = False
-        self.cnv = None
-        self.cnt = 0
-        self.index = 0
-        self.func_map = {TOKEN_CONT : self.__fix_token_cont,
-                         TOKEN_CONC : self.__fix_token_conc}
-        self.__add_msg = __add_msg
+def _tokenize_line(line):
+    """
+    Split a GEDCOM line into level, tag and line_value.  Raise an exception
+    if the line is not a valid GEDCOM line.
+    """
+    # According to the GEDCOM 5.5 standard,
+    # Chapter 1 subsection Grammar "leading whitespace preceeding
+    # a GEDCOM line should be ignored"
+    line = line.lstrip(' ')
+    # split into level+delim+rest
+    line = line.partition(' ')
+    level = int(line[0])
+    # there should only be one space after the level,
+    # but we can ignore more,
+    line = line[2].lstrip(' ')
+    # then split into tag+delim+line_value
+    # or xfef_id+delim+rest
+    # the xref_id can have spaces in it
+    if line.startswith('@'):
+        line = line.split('@', 2)
+        # line is now [None, alphanum+pointer_string, rest]
+        tag = '@' + line[1] + '@'
+        line_value = line[2].lstrip()
+        # Ignore meaningless @IDENT@ on CONT or CONC line
+        # as noted at http://www.tamurajones.net/IdentCONT.xhtml
+        if (line_value.lstrip().startswith("CONT ") or
+                line_value.lstrip().startswith("CONC ")):
+            line = line_value.lstrip().partition(' ')
+            tag = line[0]
+            line_value = line[2]
+    else:
+        line = line.partition(' ')
+        tag = line[0]
+        line_value = line[2]
+    return level, tag, line_value
 
-    def readline(self):
-        """ read a line from file with possibility of putting it back """
-        if len(self.current_list) <= 1 and not self.eof:
-            self.__readahead()
-        try:
-            return GedLine(self.current_list.pop())
-        except:
-            LOG.debug('Error in reading Gedcom line', exc_info=True)
-            return None
+def _tokenize(text, index):
+    """
+    Split a block of GEDCOM lines, without line terminators after the last
+    line, into (level, token, line_value, tag, line number) tuples.  CONT
+    and CONC lines are joined to the line before them.  The first line has
+    the number index + 1.
 
-    def __fix_token_cont(self, data):
-        line = self.current_list[0]
-        new_value = line[2] + '\n' + data[2]
-        self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
-
-    def __fix_token_conc(self, data):
-        line = self.current_list[0]
-        if len(line[2]) == 4:
-            # This deals with lines of the form
-            # 0 @<XREF:NOTE>@ NOTE
-            #   1 CONC <SUBMITTER TEXT>
-            # The previous line contains only a tag and no data so concat a
-            # space to separate the new line from the tag. This prevents the
-            # first letter of the new line being lost later
-            # in _GedcomParse.__parse_record
-            new_value = line[2] + ' ' + data[2]
+    Return the tuples and the messages for the lines that were ignored.
+    """
+    tokens = []
+    messages = []
+    for level, tag, line_value, other in LINE_RE.findall(text):
+        index += 1
+        if level:
+            level = int(level)
         else:
-            new_value = line[2] + data[2]
-        self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
-
-    def __readahead(self):
-        while len(self.current_list) < 5:
-            line = self.ifile.readline()
-            self.index += 1
-            if not line:
-                self.eof = True
-                return
-
-            original_line = line
             try:
-                # According to the GEDCOM 5.5 standard,
-                # Chapter 1 subsection Grammar "leading whitespace preceeding
-                # a GEDCOM line should be ignored"
-                # We will also strip the terminator which is any combination
-                # of carriage_return and line_feed
-                line = line.lstrip(' ').rstrip('\n\r')
-                # split into level+delim+rest
-                line = line.partition(' ')
-                level = int(line[0])
-                # there should only be one space after the level,
-                # but we can ignore more,
-                line = line[2].lstrip(' ')
-                # then split into tag+delim+line_value
-                # or xfef_id+delim+rest
-                # the xref_id can have spaces in it
-                if line.startswith('@'):
-                    line = line.split('@', 2)
-                    # line is now [None, alphanum+pointer_string, rest]
-                    tag = '@' + line[1] + '@'
-                    line_value = line[2].lstrip()
-                    # Ignore meaningless @IDENT@ on CONT or CONC line
-                    # as noted at http://www.tamurajones.net/IdentCONT.xhtml
-                    if (line_value.lstrip().startswith("CONT ") or
-                            line_value.lstrip().startswith("CONC ")):
-                        line = line_value.lstrip().partition(' ')
-                        tag = line[0]
-                        line_value = line[2]
-                else:
-                    line = line.partition(' ')
-                    tag = line[0]
-                    line_value = line[2]
+                level, tag, line_value = _tokenize_line(other)
             except:
                 problem = _("Line ignored ")
-                text = original_line.rstrip('\n\r')
                 prob_width = 66
                 problem = problem.ljust(prob_width)[0:(prob_width - 1)]
-                text = text.replace("\n", "\n".ljust(prob_width + 22))
-                message = "%s              %s" % (problem, text)
-                self.__add_msg(message)
+                line = other.replace("\n", "\n".ljust(prob_width + 22))
+                messages.append("%s              %s" % (problem, line))
                 continue
 
-            # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
-            line_value = line_value.replace('@@', '@')
-            token = TOKENS.get(tag, TOKEN_UNKNOWN)
-            data = (level, token, line_value, tag, self.index)
-
-            func = self.func_map.get(data[1])
-            if func:
-                func(data)
+        # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
+        line_value = line_value.replace('@@', '@')
+        token = TOKENS.get(tag, TOKEN_UNKNOWN)
+        if token == TOKEN_CONT and tokens:
+            line = tokens[-1]
+            tokens[-1] = (line[0], line[1], line[2] + '\n' + line_value,
+                          line[3], line[4])
+        elif token == TOKEN_CONC and tokens:
+            line = tokens[-1]
+            if len(line[2]) == 4:
+                # This deals with lines of the form
+                # 0 @<XREF:NOTE>@ NOTE
+                #   1 CONC <SUBMITTER TEXT>
+                # The previous line contains only a tag and no data so concat
+                # a space to separate the new line from the tag. This prevents
+                # the first letter of the new line being lost later
+                # in _GedcomParse.__parse_record
+                new_value = line[2] + ' ' + line_value
             else:
-                # There will normally only be one space between tag and
-                # line_value, but in case there is more then one, remove extra
-                # spaces after CONC/CONT processing
-                # Also, Gedcom spec says there should be no spaces at end of
-                # line, however some programs put them there (FTM), so let's
-                # leave them in place.
-                data = data[:2] + (data[2].lstrip(),) + data[3:]
-                self.current_list.insert(0, data)
+                new_value = line[2] + line_value
+            tokens[-1] = (line[0], line[1], new_value, line[3], line[4])
+        else:
+            # There will normally only be one space between tag and
+            # line_value, but in case there is more then one, remove extra
+            # spaces after CONC/CONT processing
+            # Also, Gedcom spec says there should be no spaces at end of
+            # line, however some programs put them there (FTM), so let's
+            # leave them in place.
+            tokens.append((level, token, line_value.lstrip(), tag, index))
+    return tokens, messages
+
+def _make_line(data):
+    """ Return the GedLine of a token tuple, or None if it is invalid """
+    try:
+        return GedLine(data)
+    except:
+        LOG.debug('Error in reading Gedcom line', exc_info=True)
+        return None
+
+def _parse_block(text, index):
+    """
+    Worker process task: tokenize a block of GEDCOM records and convert the
+    tokens to GedLines.  The GedLines are returned as compact tuples, with
+    dates serialized, which are much faster to pickle.
+    """
+    tokens, messages = _tokenize(text, index)
+    lines = []
+    for data in tokens:
+        line = _make_line(data)
+        if line is None:
+            lines.append(None)
+        elif line.token == TOKEN_DATE:
+            lines.append((line.line, line.level, line.token, line.token_text,
+                          line.data.serialize()))
+        else:
+            lines.append((line.line, line.level, line.token, line.token_text,
+                          line.data))
+    return lines, messages
+
+def _restore_line(data):
+    """ Return the GedLine of a tuple made by _parse_block """
+    if data is None:
+        return None
+    line = GedLine.__new__(GedLine)
+    (line.line, line.level, line.token, line.token_text, line.data) = data
+    if line.token == TOKEN_DATE:
+        line.data = Date().unserialize(line.data)
+    return line
+
+class Lexer:
+    """
+    low level line reading and early parsing
+
+    The file is read in blocks of whole level 0 records, which are split
+    into token tuples at once.  With more than one process, the blocks are
+    tokenized and converted to GedLines in a process pool, a few blocks
+    ahead of the parser, and the lines are returned in file order.
+    """
+    def __init__(self, ifile, __add_msg, processes=0):
+        self.ifile = ifile
+        self.eof = False
+        self.index = 0
+        self.processes = processes
+        self.__add_msg = __add_msg
+        self.__pending = ''
+        self.__lines = []
+        self.__pos = 0
+        self.__pool = None
+        self.__results = deque()
+
+    def readline(self):
+        """ read a line from file """
+        if self.__pos >= len(self.__lines):
+            self.__lines = []
+            self.__pos = 0
+            while not self.__lines:
+                if self.processes > 1:
+                    if not self.__fill_parallel():
+                        return None
+                elif not self.__fill():
+                    return None
+        line = self.__lines[self.__pos]
+        self.__pos += 1
+        if self.processes > 1:
+            return _restore_line(line)
+        return _make_line(line)
+
+    def __read_block(self):
+        """
+        Return the next block of whole level 0 records, with the number of
+        the line before it, or None at the end of the file.
+        """
+        while not self.eof:
+            text = self.ifile.read(BLOCK_SIZE)
+            if not text:
+                self.eof = True
+                break
+            self.__pending += text
+            start = 0
+            for match in LEVEL0_RE.finditer(self.__pending, 1):
+                start = match.start()
+            if start:
+                block = self.__pending[:start]
+                self.__pending = self.__pending[start:]
+                return self.__count_lines(block)
+        if self.__pending:
+            block = self.__pending
+            self.__pending = ''
+            return self.__count_lines(block)
+        return None
+
+    def __count_lines(self, block):
+        """ Strip the last line terminator and advance the line number """
+        index = self.index
+        self.index += block.count('\n')
+        if block.endswith('\n'):
+            block = block[:-1]
+        else:
+            self.index += 1
+        return block, index
+
+    def __fill(self):
+        """ Tokenize the next block """
+        block = self.__read_block()
+        if block is None:
+            return False
+        self.__lines, messages = _tokenize(*block)
+        for message in messages:
+            self.__add_msg(message)
+        return True
+
+    def __fill_parallel(self):
+        """ Get the GedLines of the next block from the process pool """
+        if self.__pool is None:
+            self.__pool = start_pool(self.processes)
+        while len(self.__results) < 2 * self.processes:
+            block = self.__read_block()
+            if block is None:
+                break
+            self.__results.append(
+                self.__pool.apply_async(_parse_block, block))
+        if not self.__results:
+            self.close()
+            return False
+        self.__lines, messages = self.__results.popleft().get()
+        for message in messages:
+            self.__add_msg(message)
+        return True
+
+    def close(self):
+        """ Stop the process pool """
+        if self.__pool is not None:
+            stop_pool(self.__pool)
+            self.__pool = None
+        self.__results.clear()
 
     def clean_up(self):
         """
-        Break circular references to parsing methods stored in dictionaries
-        to aid garbage collection
+        Release the process pool and the lines read ahead
         """
-        for key in list(self.func_map.keys()):
-            del self.func_map[key]
-        del self.func_map
+        self.close()
+        self.__lines = []
 
 
 #-----------------------------------------------------------------------
@@ -1212,6 +1346,20 @@ class BaseReader:
         """ Read a single line """
         raise NotImplementedError()
 
+    def read(self, size):
+        """
+        Read a block of whole lines, of about size characters.  Return ''
+        at the end of the file.
+        """
+        raise NotImplementedError()
+
+    def _read_lines(self, size):
+        """ Read about size characters, up to the end of a line """
+        text = self.ifile.read(size)
+        if text and not text.endswith('\n'):
+            text += self.ifile.readline()
+        return text
+
     def report_error(self, problem, line):
         """ Create an error message """
         line = line.rstrip('\n\r')
@@ -1238,6 +1386,9 @@ class UTF8Reader(BaseReader):
         line = self.ifile.readline()
         return line.translate(STRIP_DICT)
 
+    def read(self, size):
+        return self._read_lines(size).translate(STRIP_DICT)
+
 
 class UTF16Reader(BaseReader):
     """ The main UTF-16 reader, uses Python for char handling """
@@ -1251,6 +1402,9 @@ class UTF16Reader(BaseReader):
         line = self.ifile.readline()
         return line.translate(STRIP_DICT)
 
+    def read(self, size):
+        return self._read_lines(size).translate(STRIP_DICT)
+
 
 class AnsiReader(BaseReader):
     """ The main ANSI (latin1) reader, uses Python for char handling """
@@ -1266,6 +1420,15 @@ class AnsiReader(BaseReader):
                               "CHAR cp1252??", line)
         return line.translate(STRIP_DICT)
 
+    def read(self, size):
+        text = self._read_lines(size)
+        if text.translate(DEL_AND_C1) != text:
+            for line in text.split('\n'):
+                if line.translate(DEL_AND_C1) != line:
+                    self.report_error("DEL or C1 control chars in line did "
+                                      "you mean CHAR cp1252??", line)
+        return text.translate(STRIP_DICT)
+
 
 class CP1252Reader(BaseReader):
     """ The extra credit CP1252 reader, uses Python for char handling """
@@ -1278,6 +1441,9 @@ class CP1252Reader(BaseReader):
         line = self.ifile.readline()
         return line.translate(STRIP_DICT)
 
+    def read(self, size):
+        return self._read_lines(size).translate(STRIP_DICT)
+
 
 class AnselReader(BaseReader):
     """
@@ -1554,6 +1720,15 @@ class AnselReader(BaseReader):
                                 errors='surrogateescape')
         return self.__ansel_to_unicode(linebytes)
 
+    def read(self, size):
+        text = self._read_lines(size).encode(encoding='ascii',
+                                             errors='surrogateescape')
+        if ANSEL_ASCII_RE.fullmatch(text):
+            # nothing to convert
+            return text.decode(encoding='ascii')
+        return ''.join(self.__ansel_to_unicode(line)
+                       for line in text.splitlines(keepends=True))
+
 
 #-------------------------------------------------------------------------
 #
@@ -1761,13 +1936,15 @@ class IdMapper:
         self.find_next = find_next
         self.id2user_format = id2user_format
         self.swap = {}
+        # The values of swap, to check new IDs against in constant time
+        self.swapped = set()
 
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
             new_val = self.find_next()
-            while new_val in list(self.swap.values()):
+            while new_val in self.swapped:
                 new_val = self.find_next()
         else:
             # remove any @ signs
@@ -1783,15 +1960,16 @@ class IdMapper:
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
                 if self.has_gid(formatted_gid) or \
-                        (formatted_gid in list(self.swap.values())):
+                        (formatted_gid in self.swapped):
                     new_val = self.find_next()
-                    while new_val in list(self.swap.values()):
+                    while new_val in self.swapped:
                         new_val = self.find_next()
                 else:
                     new_val = formatted_gid
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
+            self.swapped.add(new_val)
         return new_val
 
     def clean(self, gid):
@@ -2713,7 +2891,11 @@ class GedcomParser(UpdateCallback):
         else:
             rdr = AnsiReader(ifile, self.__add_msg)
 
-        self.lexer = Lexer(rdr, self.__add_msg)
+        # Tokenize large files in a process pool, if allowed
+        processes = get_worker_processes()
+        if stage_one.get_line_count() < MIN_PARALLEL_LINES:
+            processes = 0
+        self.lexer = Lexer(rdr, self.__add_msg, processes)
         self.filename = filename
         self.backoff = False
 
@@ -2738,31 +2920,34 @@ class GedcomParser(UpdateCallback):
 
         """
         no_magic = self.maxpeople < 1000
-        with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
-                   no_magic=no_magic) as self.trans:
-
-            self.dbase.disable_signals()
-            self.__parse_header_head()
-            self.want_parse_warnings = False
-            self.__parse_header()
-            self.want_parse_warnings = True
-            if self.use_def_src:
-                self.dbase.add_source(self.def_src, self.trans)
-            if self.default_tag and self.default_tag.handle is None:
-                self.dbase.add_tag(self.default_tag, self.trans)
-            self.__parse_record()
-            self.__parse_trailer()
-            for title, handle in self.inline_srcs.items():
-                src = Source()
-                src.set_handle(handle)
-                src.set_title(title)
-                self.dbase.add_source(src, self.trans)
-            self.__clean_up()
-
-            self.place_import.generate_hierarchy(self.trans)
-
-            if not self.dbase.get_feature("skip-check-xref"):
-                self.__check_xref()
+        try:
+            with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
+                       no_magic=no_magic, bulk=True) as self.trans:
+
+                self.dbase.disable_signals()
+                self.__parse_header_head()
+                self.want_parse_warnings = False
+                self.__parse_header()
+                self.want_parse_warnings = True
+                if self.use_def_src:
+                    self.dbase.add_source(self.def_src, self.trans)
+                if self.default_tag and self.default_tag.handle is None:
+                    self.dbase.add_tag(self.default_tag, self.trans)
+                self.__parse_record()
+                self.__parse_trailer()
+                for title, handle in self.inline_srcs.items():
+                    src = Source()
+                    src.set_handle(handle)
+                    src.set_title(title)
+                    self.dbase.add_source(src, self.trans)
+                self.__clean_up()
+
+                self.place_import.generate_hierarchy(self.trans)
+
+                if not self.dbase.get_feature("skip-check-xref"):
+                    self.__check_xref()
+        finally:
+            self.lexer.close()
         self.dbase.enable_signals()
         self.dbase.request_rebuild()
         if self.number_of_errors == 0:
@@ -0,0 +1,127 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the search for duplicate people """
+
+import os
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import Date
+from gramps.gen.user import User
+from .. import libduplicates
+from ..libduplicates import DuplicateFinder, WILDCARD
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class DuplicateFinderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def full_scan(self, finder, threshold):
+        """
+        Compare every person with all people of the same surname and gender,
+        as the search did before the blocking index was introduced.
+        """
+        blocks = {}
+        handles = list(self.db.iter_person_handles())
+        for handle in handles:
+            record = finder.records[handle]
+            blocks.setdefault(finder.block_key(record), []).append(handle)
+        the_map = {}
+        for handle1 in handles:
+            record1 = finder.records[handle1]
+            for handle2 in blocks[finder.block_key(record1)]:
+                if handle1 == handle2:
+                    continue
+                if handle2 in the_map and the_map[handle2][0] == handle1:
+                    continue
+                chance = finder.compare_people(record1,
+                                               finder.records[handle2])
+                if chance >= threshold:
+                    if handle1 in the_map:
+                        if the_map[handle1][1] > chance:
+                            the_map[handle1] = (handle2, chance)
+                    else:
+                        the_map[handle1] = (handle2, chance)
+        return the_map
+
+    def test_blocking_is_lossless(self):
+        for use_soundex in (False, True):
+            for threshold in (0.25, 1.0, 2.0):
+                finder = DuplicateFinder(self.db, use_soundex, 1)
+                the_map = finder.find(threshold)
+                self.assertEqual(the_map, self.full_scan(finder, threshold))
+        self.assertTrue(the_map)
+
+    def test_symmetric_score(self):
+        finder = DuplicateFinder(self.db, True, 1)
+        index, handles = finder.build_index()
+        for handle1 in handles[:200]:
+            record1 = finder.records[handle1]
+            for position in finder.candidates(index, record1):
+                record2 = finder.records[handles[position]]
+                if record1.gender == record2.gender:
+                    self.assertEqual(finder.compare_people(record1, record2),
+                                     finder.compare_people(record2, record1))
+
+    def test_process_pool(self):
+        finder = DuplicateFinder(self.db, True, 1)
+        expected = finder.find(0.25)
+        min_pairs = libduplicates.MIN_PAIRS_PER_PROCESS
+        libduplicates.MIN_PAIRS_PER_PROCESS = 500
+        try:
+            finder = DuplicateFinder(self.db, True, 2)
+            self.assertEqual(finder.find(0.25), expected)
+        finally:
+            libduplicates.MIN_PAIRS_PER_PROCESS = min_pairs
+
+    def test_ranked(self):
+        finder = DuplicateFinder(self.db, True, 1)
+        the_map = finder.find(1.0)
+        ranked = finder.ranked(the_map)
+        self.assertEqual(len(ranked), len(the_map))
+        chances = [chance for chance, handle1, handle2 in ranked]
+        self.assertEqual(chances, sorted(chances, reverse=True))
+        for chance, handle1, handle2 in ranked:
+            self.assertEqual(the_map[handle1], (handle2, chance))
+
+    def test_year_band(self):
+        finder = DuplicateFinder(self.db, True, 1)
+        self.assertIs(finder.year_band(Date()), WILDCARD)
+        date = Date()
+        date.set(Date.QUAL_NONE, Date.MOD_RANGE, Date.CAL_GREGORIAN,
+                 (1, 1, 1850, False, 1, 1, 1860, False))
+        self.assertIs(finder.year_band(date), WILDCARD)
+        self.assertEqual(finder.year_band(Date(1850, 3, 4)), 1850)
+        self.assertEqual(finder.year_band(Date(1850)), 1850)
+
+    def test_place_keys(self):
+        finder = DuplicateFinder(self.db, False, 1)
+        self.assertEqual(finder.place_keys((None, "")), (WILDCARD,))
+        self.assertCountEqual(finder.place_keys(("P1", "Paris, France")),
+                              ["Paris", "France", ("title", "Paris, France")])
+
+if __name__ == "__main__":
+    unittest.main()
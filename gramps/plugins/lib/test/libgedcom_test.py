@@ -0,0 +1,160 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the GEDCOM lexer """
+
+import os
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from gramps.gen.const import DATA_DIR
+from .. import libgedcom
+from ..libgedcom import (Lexer, GedcomStageOne, UTF8Reader, AnselReader,
+                         AnsiReader, CP1252Reader, UTF16Reader, TOKEN_ID,
+                         TOKEN_NAME, TOKEN_RNOTE, TOKEN_UNKNOWN)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+SAMPLE = os.path.join(DATA_DIR, os.pardir, "example", "gedcom", "sample.ged")
+
+def make_reader(ifile, add_msg):
+    """
+    Return the reader for the encoding of the file, and the stage one
+    parser, which must be kept to keep the file open.
+    """
+    stage_one = GedcomStageOne(ifile)
+    stage_one.parse()
+    ifile.seek(0)
+    enc = stage_one.get_encoding()
+    if enc == "ANSEL":
+        reader = AnselReader(ifile, add_msg)
+    elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
+        reader = UTF8Reader(ifile, add_msg, enc)
+    elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
+        reader = UTF16Reader(ifile, add_msg)
+    elif enc in ("CP1252", "WINDOWS-1252"):
+        reader = CP1252Reader(ifile, add_msg)
+    else:
+        reader = AnsiReader(ifile, add_msg)
+    return reader, stage_one
+
+def read_lines(ifile, processes=0):
+    """ Return the lines of a file as tuples, and the messages """
+    messages = []
+    reader, dummy = make_reader(ifile, messages.append)
+    lexer = Lexer(reader, messages.append, processes)
+    lines = []
+    line = lexer.readline()
+    while line:
+        data = line.data
+        if hasattr(data, 'serialize'):
+            # dates, events and attributes
+            data = data.serialize()
+        lines.append((line.line, line.level, line.token, line.token_text,
+                      str(data)))
+        line = lexer.readline()
+    lexer.clean_up()
+    return lines, messages
+
+class LexerTest(unittest.TestCase):
+
+    def lex(self, text):
+        ifile = BytesIO(("0 HEAD\n1 CHAR UTF-8\n" + text).encode('utf-8'))
+        lines, messages = read_lines(ifile)
+        return lines[2:], messages
+
+    def test_tokens(self):
+        lines, messages = self.lex(
+            "  0 @N1@ NOTE\n"
+            "1 CONC Text\n"
+            "1 CONT line  two\n"
+            "1  @I1@ CONT  three\n"
+            "1 NAME John /Smith/\n"
+            "2 NOTE @N1@\n"
+            "2 _CUST  mail@@host\n"
+            "0 TRLR\n")
+        self.assertEqual(lines, [
+            (3, 0, TOKEN_ID, 'N1', 'NOTE Text\nline  two\n three'),
+            (7, 1, TOKEN_NAME, 'NAME', 'John /Smith/'),
+            (8, 2, TOKEN_RNOTE, 'NOTE', 'N1'),
+            (9, 2, TOKEN_UNKNOWN, '_CUST', 'mail@host'),
+            (10, 0, libgedcom.TOKEN_TRLR, 'TRLR', '')])
+        self.assertEqual(messages, [])
+
+    def test_ignored_lines(self):
+        lines, messages = self.lex(
+            "0 @N1@ NOTE\n"
+            "\n"
+            "x NOTE\n"
+            "1 CONC Text\n"
+            "0 TRLR")
+        self.assertEqual(lines, [(3, 0, TOKEN_ID, 'N1', 'NOTE Text'),
+                                 (7, 0, libgedcom.TOKEN_TRLR, 'TRLR', '')])
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(messages[1].endswith("x NOTE"))
+
+    def test_blocks(self):
+        """ Records and CONT lines split across blocks """
+        text = "".join("0 @N%d@ NOTE\n1 CONT %s\n1 CONC x\n" % (num, num)
+                       for num in range(200)) + "0 TRLR\n"
+        with patch('gramps.plugins.lib.libgedcom.BLOCK_SIZE', 50):
+            lines, messages = self.lex(text)
+        self.assertEqual(len(lines), 201)
+        self.assertEqual(lines[199], (600, 0, TOKEN_ID, 'N199',
+                                      'NOTE\n199x'))
+
+    def test_readers(self):
+        """ A block read is the same as the lines read one by one """
+        for name in sorted(os.listdir(TEST_DIR)):
+            if not name.endswith('.ged'):
+                continue
+            filename = os.path.join(TEST_DIR, name)
+            # the readers close the file when they are released
+            with open(filename, 'rb') as ifile:
+                messages = []
+                reader, dummy = make_reader(ifile, messages.append)
+                text = ''
+                line = reader.readline()
+                while line:
+                    text += line
+                    line = reader.readline()
+            with open(filename, 'rb') as ifile:
+                block_messages = []
+                reader, dummy = make_reader(ifile, block_messages.append)
+                blocks = ''
+                block = reader.read(100)
+                while block:
+                    blocks += block
+                    block = reader.read(100)
+            self.assertEqual(blocks, text, name)
+            self.assertEqual(block_messages, messages, name)
+
+    def test_parallel(self):
+        with open(SAMPLE, 'rb') as ifile:
+            expect = read_lines(ifile)
+        with open(SAMPLE, 'rb') as ifile:
+            with patch('gramps.plugins.lib.libgedcom.BLOCK_SIZE', 2000):
+                result = read_lines(ifile, 2)
+        self.assertEqual(result, expect)
+        self.assertEqual(len(result[0]), 930)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -265,6 +265,14 @@ class BirthdayReport(Report):
         ngettext = self._locale.translation.ngettext # to see "nearby" comments
         rel_calc = get_relationship_calculator(reinit=True,
                                                clocale=self._locale)
+        relations = None
+        if self.relationships:
+            # The relationships of the listed people are generated in one
+            # batch, which is given their handles one at a time.
+            listed = []
+            relations = rel_calc.get_relationships_from(
+                self.database, self.center_person, iter(listed.pop, None),
+                olocale=self._locale)
 
         with self._user.progress(_('Birthday and Anniversary Report'),
                 _('Reading database...'), len(people)) as step:
@@ -315,11 +323,8 @@ class BirthdayReport(Report):
 
                         comment = ""
                         if self.relationships:
-                            relation = rel_calc.get_one_relationship(
-                                                             self.database,
-                                                             self.center_person,
-                                                             person,
-                                                             olocale=self._locale)
+                            listed.append(person_handle)
+                            relation = next(relations)[1]
                             if relation:
                                 # FIXME this won't work for RTL languages
                                 comment = " --- %s" % relation
@@ -427,11 +432,8 @@ class BirthdayReport(Report):
 
                     comment = ""
                     if self.relationships:
-                            relation = rel_calc.get_one_relationship(
-                                                             self.database,
-                                                             self.center_person,
-                                                             person,
-                                                             olocale=self._locale)
+                            listed.append(person_handle)
+                            relation = next(relations)[1]
                             if relation:
                                 # FIXME this won't work for RTL languages
                                 comment = " --- %s" % relation
@@ -448,6 +450,8 @@ class BirthdayReport(Report):
                                                        age=nyears,
                                                        relation=comment)
                     self.add_day_item(text, month, day, person)
+        if relations is not None:
+            relations.close()
 
 #------------------------------------------------------------------------
 #
@@ -0,0 +1,88 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"Build the thumbnails of all media objects"
+
+#-------------------------------------------------------------------------
+#
+# python modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.gettext
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.utils.thumbnails import build_thumbnails
+from gramps.gui.plug import tool
+from gramps.gui.dialog import OkDialog
+
+#-------------------------------------------------------------------------
+#
+# BuildThumbnails
+#
+#-------------------------------------------------------------------------
+class BuildThumbnails(tool.Tool):
+
+    def __init__(self, dbstate, user, options_class, name, callback=None):
+        uistate = user.uistate
+
+        tool.Tool.__init__(self, dbstate, options_class, name)
+
+        if uistate:
+            self.callback = uistate.pulse_progressbar
+            uistate.set_busy_cursor(True)
+            uistate.progress.show()
+            uistate.push_message(dbstate, _("Building thumbnails..."))
+        else:
+            self.callback = None
+            print(_("Building thumbnails..."))
+
+        built, current, missing, failed = build_thumbnails(
+            self.db, callback=self.callback)
+        message = _("Thumbnails built for %(built)d files, "
+                    "%(current)d files were up to date, "
+                    "%(missing)d files are missing, "
+                    "%(failed)d thumbnails could not be built.") % {
+                        'built': built, 'current': current,
+                        'missing': missing, 'failed': failed}
+
+        if uistate:
+            uistate.set_busy_cursor(False)
+            uistate.progress.hide()
+            OkDialog(_("Thumbnails built"), message, parent=uistate.window)
+        else:
+            print(message)
+
+#------------------------------------------------------------------------
+#
+#
+#
+#------------------------------------------------------------------------
+class BuildThumbnailsOptions(tool.ToolOptions):
+    """
+    Defines options and provides handling interface.
+    """
+
+    def __init__(self, name, person_id=None):
+        tool.ToolOptions.__init__(self, name, person_id)
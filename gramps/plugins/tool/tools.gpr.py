@@ -162,7 +162,7 @@ authors_email = ["don@gramps-project.org"],
 category = TOOL_DBPROC,
 toolclass = 'DuplicatePeopleTool',
 optionclass = 'DuplicatePeopleToolOptions',
-tool_modes = [TOOL_MODE_GUI]
+tool_modes = [TOOL_MODE_GUI, TOOL_MODE_CLI]
   )
 
 #------------------------------------------------------------------------
@@ -276,6 +276,28 @@ optionclass = 'RebuildOptions',
 tool_modes = [TOOL_MODE_GUI, TOOL_MODE_CLI]
   )
 
+#------------------------------------------------------------------------
+#
+# Build Thumbnails
+#
+#------------------------------------------------------------------------
+
+register(TOOL,
+id = 'thumbnails',
+name = _("Build Thumbnails"),
+description = _("Builds the thumbnails of all media objects"),
+version = '1.0',
+gramps_target_version = MODULE_VERSION,
+status = STABLE,
+fname = 'buildthumbnails.py',
+authors = ["The Gramps project"],
+authors_email = ["http://gramps-project.org"],
+category = TOOL_UTILS,
+toolclass = 'BuildThumbnails',
+optionclass = 'BuildThumbnailsOptions',
+tool_modes = [TOOL_MODE_GUI, TOOL_MODE_CLI]
+  )
+
 #------------------------------------------------------------------------
 #
 # Rebuild Reference Maps
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Classes:
+    WebArchive - writes the files of the web site to a .tar.gz or .zip file
+"""
+#------------------------------------------------
+# python modules
+#------------------------------------------------
+import os
+import gzip
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+
+#------------------------------------------------
+# Gramps module
+#------------------------------------------------
+from gramps.gen.constfunc import win
+
+#------------------------------------------------
+# constants
+#------------------------------------------------
+# The time of the files of a reproducible archive, if SOURCE_DATE_EPOCH is
+# not set: 1980-01-01, the earliest time a zip file can store.
+REPRODUCIBLE_MTIME = 315532800
+
+#------------------------------------------------
+# WebArchive
+#------------------------------------------------
+class WebArchive:
+    """
+    Writes the files of the web site to an archive, a zip file if the file
+    name ends with .zip, and a .tar.gz file otherwise.
+
+    The names of the files already in the archive are kept in a set, so
+    that the report can check for them in constant time.
+
+    In the reproducible mode, all the files get the same time and owner,
+    and they are written sorted by name when the archive is closed, so
+    that the same web site always gives the same archive.  Until then, the
+    pages are kept in a temporary directory.
+    """
+    def __init__(self, filename, reproducible=False):
+        """
+        @param: filename     -- The name of the archive file
+        @param: reproducible -- Whether to write a reproducible archive
+        """
+        self.names = set()
+        self.reproducible = reproducible
+        self.members = {}   # name -> path of the content, until closed
+        self.spool = None
+        self.mtime = None
+        if reproducible:
+            self.mtime = int(os.environ.get('SOURCE_DATE_EPOCH',
+                                            REPRODUCIBLE_MTIME))
+        self.zip = None
+        self.tar = None
+        self.gzip = None
+        self.file = None
+        if filename.lower().endswith('.zip'):
+            self.zip = zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED)
+        elif reproducible:
+            # Neither the file name nor the time in the gzip header
+            self.file = open(filename, 'wb')
+            self.gzip = gzip.GzipFile(filename='', mode='wb',
+                                      fileobj=self.file, mtime=0)
+            self.tar = tarfile.open(fileobj=self.gzip, mode='w')
+        else:
+            self.tar = tarfile.open(filename, "w:gz")
+        if reproducible:
+            self.spool = tempfile.mkdtemp()
+
+    def __contains__(self, name):
+        """
+        Return True if a file of this name is in the archive.
+        """
+        return name in self.names
+
+    def write_file(self, name, fileobj, mtime):
+        """
+        Add a file with the content of a binary file object.  The content
+        is copied from the start of the file object, without reading it
+        whole.
+
+        @param: name    -- The name of the file in the archive
+        @param: fileobj -- The file object
+        @param: mtime   -- The last modification time of the file
+        """
+        self.names.add(name)
+        size = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(0)
+        if self.spool:
+            path = os.path.join(self.spool, str(len(self.members)))
+            with open(path, 'wb') as spool_file:
+                shutil.copyfileobj(fileobj, spool_file)
+            self.members[name] = path
+        else:
+            self.__write(name, fileobj, size, mtime)
+
+    def copy_file(self, path, name):
+        """
+        Add a file from the disk, with its last modification time.
+
+        @param: path -- The path of the file to copy
+        @param: name -- The name of the file in the archive
+        """
+        self.names.add(name)
+        if self.spool:
+            self.members[name] = path
+            return
+        with open(path, 'rb') as from_file:
+            stat = os.fstat(from_file.fileno())
+            self.__write(name, from_file, stat.st_size, stat.st_mtime)
+
+    def close(self):
+        """
+        Write the files of a reproducible archive, and close the archive.
+        """
+        try:
+            for name in sorted(self.members):
+                path = self.members[name]
+                with open(path, 'rb') as from_file:
+                    self.__write(name, from_file,
+                                 os.fstat(from_file.fileno()).st_size,
+                                 self.mtime)
+        finally:
+            if self.spool:
+                shutil.rmtree(self.spool, ignore_errors=True)
+                self.spool = None
+            for archive in (self.zip, self.tar, self.gzip, self.file):
+                if archive is not None:
+                    archive.close()
+
+    def __write(self, name, fileobj, size, mtime):
+        """
+        Write a member of the archive.
+        """
+        if self.zip:
+            mtime = max(mtime, REPRODUCIBLE_MTIME)
+            if self.reproducible:
+                date_time = time.gmtime(mtime)[:6]
+            else:
+                date_time = time.localtime(mtime)[:6]
+            zipinfo = zipfile.ZipInfo(name, date_time)
+            zipinfo.compress_type = zipfile.ZIP_DEFLATED
+            zipinfo.external_attr = 0o644 << 16
+            with self.zip.open(zipinfo, 'w') as member:
+                shutil.copyfileobj(fileobj, member)
+        else:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = size
+            tarinfo.mtime = mtime
+            tarinfo.mode = 0o644
+            if not self.reproducible and not win():
+                tarinfo.uid = os.getuid()
+                tarinfo.gid = os.getgid()
+            self.tar.addfile(tarinfo, fileobj)
@@ -2422,6 +2422,8 @@ class BasePage: # pylint: disable=C1001
         @param: url    -- url to be linked
         """
         self.report.fam_link[handle] = url
+        if self.report.manifest:
+            self.report.manifest.add_link(handle, url)
         return Html("a", self._("Family Map"), href=url,
                     title=self._("Family Map"), class_="familymap",
                     inline=True)
@@ -2973,9 +2975,11 @@ class BasePage: # pylint: disable=C1001
                     role = "3"
             return role
 
+        # The name and handle make the order the same on each run, so
+        # that the page only changes when the references change
         for (bkref_class, bkref_handle, role) in sorted(
                 bkref_list, key=lambda x:
-                sort_by_role(x)):
+                (sort_by_role(x), self.report.obj_dict[x[0]][x[1]][1], x[1])):
             list_html = Html("li")
             path = self.report.obj_dict[bkref_class][bkref_handle][0]
             name = self.report.obj_dict[bkref_class][bkref_handle][1]
@@ -118,7 +118,9 @@ class EventPages(BasePage):
             for event_handle in event_handle_list:
                 step()
                 index += 1
-                self.eventpage(self.report, title, event_handle)
+                self.report.build_page(("Event", event_handle),
+                                       self.eventpage,
+                                       self.report, title, event_handle)
             step()
         self.eventlistpage(self.report, title, event_types,
                            event_handle_list)
@@ -113,7 +113,9 @@ class FamilyPages(BasePage):
             for family_handle in self.report.obj_dict[Family]:
                 step()
                 index += 1
-                self.familypage(self.report, title, family_handle)
+                self.report.build_page(("Family", family_handle),
+                                       self.familypage,
+                                       self.report, title, family_handle)
             step()
             self.familylistpage(self.report, title,
                                 self.report.obj_dict[Family].keys())
@@ -390,10 +392,8 @@ class FamilyPages(BasePage):
                 relationshipdetail += Html("h4", _("Family map"), inline=True)
                 mapdetail = Html("br")
                 fhandle = family.get_father_handle()
-                for handle, dummy_url in self.report.fam_link.items():
-                    if fhandle == handle:
-                        father = self.r_db.get_person_from_handle(fhandle)
-                        break
+                if self.report.family_map_url(fhandle):
+                    father = self.r_db.get_person_from_handle(fhandle)
                 if father:
                     primary_name = father.get_primary_name()
                     name = Name(primary_name)
@@ -402,10 +402,8 @@ class FamilyPages(BasePage):
                     mapdetail += self.family_map_link_for_parent(fhandle, fname)
                 mapdetail += Html("br")
                 mhandle = family.get_mother_handle()
-                for handle, dummy_url in self.report.fam_link.items():
-                    if mhandle == handle:
-                        mother = self.r_db.get_person_from_handle(mhandle)
-                        break
+                if self.report.family_map_url(mhandle):
+                    mother = self.r_db.get_person_from_handle(mhandle)
                 if mother:
                     primary_name = mother.get_primary_name()
                     name = Name(primary_name)
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Support for the incremental mode, where only the pages of changed objects
+are written again.
+
+Classes:
+    PageManifest - the manifest of the pages written by the last run
+    RecordingDb - database wrapper which records what the pages read
+"""
+#------------------------------------------------
+# python modules
+#------------------------------------------------
+import os
+import json
+import logging
+from hashlib import md5
+from types import GeneratorType
+
+#------------------------------------------------
+# Gramps module
+#------------------------------------------------
+from gramps.version import VERSION
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+#------------------------------------------------
+# constants
+#------------------------------------------------
+MANIFEST_NAME = ".narrativeweb.json"
+MANIFEST_VERSION = 1
+
+#------------------------------------------------
+# PageManifest
+#------------------------------------------------
+class PageManifest:
+    """
+    The manifest of the files written by the report, and of the inputs of
+    each page.
+
+    The pages of an object, for instance a person page and its family map,
+    are a unit.  While a unit is written, each database call and its result
+    are recorded as an input of the unit.  The result of a call returning
+    an object is its handle and change time, whether it is in the report
+    and its back references.  A unit is current, and not written again,
+    if all of its inputs give the same results as when it was written, and
+    its files are still there.
+
+    Files are only written when their content changed, and the files of
+    the last run which are not written by this run are removed.
+    """
+    def __init__(self, report):
+        """
+        @param: report -- The instance of the main report class
+        """
+        self.report = report
+        self.filename = None
+        self.options = self.__digest(json.dumps(
+            [VERSION, sorted(report.options.items())], default=str))
+        self.old_calls = []
+        self.old_units = {}
+        self.old_files = {}
+        self.results = {}   # call -> result of this run
+        self.units = {}     # unit key -> (inputs, files, links)
+        self.files = {}     # file name -> content digest
+        self.unit = None
+        self.written = 0
+        self.skipped = 0
+
+    def load(self, html_dir):
+        """
+        Read the manifest of the last run from the web site directory.
+
+        @param: html_dir -- The web site directory
+        """
+        self.filename = os.path.join(html_dir, MANIFEST_NAME)
+        try:
+            with open(self.filename, encoding='utf-8') as manifest:
+                data = json.load(manifest)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as err:
+            LOG.warning("Ignoring the manifest %s: %s", self.filename, err)
+            return
+        if data.get('version') != MANIFEST_VERSION:
+            return
+        self.old_files = data['files']
+        if data['options'] == self.options:
+            self.old_calls = data['calls']
+            self.old_units = data['units']
+
+    def save(self):
+        """
+        Remove the files of the last run which were not written again, and
+        write the manifest.
+        """
+        html_dir = os.path.dirname(self.filename)
+        for fname in set(self.old_files) - set(self.files):
+            try:
+                os.remove(os.path.join(html_dir, fname))
+            except FileNotFoundError:
+                pass
+            except OSError as err:
+                LOG.warning("Could not remove %s: %s", fname, err)
+
+        calls = []
+        index = {}
+        units = {}
+        for key, (inputs, files, links) in self.units.items():
+            numbers = []
+            for call in inputs:
+                if call not in index:
+                    index[call] = len(calls)
+                    calls.append([call, self.results[call]])
+                numbers.append(index[call])
+            units[key] = [numbers, files, links]
+        data = {'version': MANIFEST_VERSION,
+                'options': self.options,
+                'calls': calls,
+                'units': units,
+                'files': self.files}
+        with open(self.filename, 'w', encoding='utf-8') as manifest:
+            json.dump(data, manifest, separators=(',', ':'))
+        LOG.debug("%d units written, %d units current",
+                  self.written, self.skipped)
+
+    def is_current(self, key):
+        """
+        Return True if the files of a unit written by the last run are
+        still current.  The unit is then kept in the manifest.
+
+        @param: key -- The key of the unit
+        """
+        key = json.dumps(key)
+        unit = self.old_units.get(key)
+        if unit is None:
+            return False
+        numbers, files, links = unit
+        html_dir = os.path.dirname(self.filename)
+        for fname in files:
+            if (fname not in self.old_files or
+                    not os.path.isfile(os.path.join(html_dir, fname))):
+                return False
+        inputs = []
+        for number in numbers:
+            call, result = self.old_calls[number]
+            if self.__evaluate(call) != result:
+                return False
+            inputs.append(call)
+        for fname in files:
+            self.files[fname] = self.old_files[fname]
+        self.units[key] = (inputs, files, links)
+        self.report.fam_link.update(links)
+        self.skipped += 1
+        return True
+
+    def begin(self, key):
+        """
+        Start recording the inputs and files of a unit.
+
+        @param: key -- The key of the unit
+        """
+        self.unit = (json.dumps(key), set(), [], {})
+
+    def end(self, complete=True):
+        """
+        Stop recording, and keep the unit in the manifest if its pages were
+        written completely.
+        """
+        if complete and self.unit is not None:
+            key, inputs, files, links = self.unit
+            self.units[key] = (sorted(inputs), files, links)
+            self.written += 1
+        self.unit = None
+
+    def record(self, name, args, kwargs, result):
+        """
+        Record a call made while writing a unit, and return its result.
+        A generator result is returned as a list.
+
+        @param: name   -- The name of the method
+        @param: args   -- The positional arguments
+        @param: kwargs -- The keyword arguments
+        @param: result -- The result of the call
+        """
+        if isinstance(result, GeneratorType):
+            result = list(result)
+        if self.unit is not None:
+            try:
+                call = json.dumps([name, args, kwargs], sort_keys=True)
+            except TypeError:
+                # Not an input which can be checked again
+                self.unit = None
+                return result
+            if call not in self.results:
+                self.results[call] = self.__signature(result)
+            self.unit[1].add(call)
+        return result
+
+    def record_input(self, name, *args):
+        """
+        Record an input of the report itself, see __evaluate.
+        """
+        if self.unit is not None:
+            self.record(name, args, {}, self.__call(name, args, {}))
+
+    def add_link(self, handle, url):
+        """
+        Keep a family map link created by the unit, for the family pages.
+        """
+        if self.unit is not None:
+            self.unit[3][handle] = url
+
+    def add_file(self, fname, data):
+        """
+        Add a file to the manifest.  Return True if it must be written,
+        because it is new or its content changed.
+
+        @param: fname -- The file name, relative to the web site directory
+        @param: data  -- The content of the file
+        """
+        digest = self.__digest(data)
+        self.files[fname] = digest
+        if self.unit is not None:
+            self.unit[2].append(fname)
+        return not (self.old_files.get(fname) == digest and
+                    os.path.isfile(os.path.join(
+                        os.path.dirname(self.filename), fname)))
+
+    def __evaluate(self, call):
+        """
+        Return the signature of the result of a recorded call for this run.
+        """
+        if call not in self.results:
+            name, args, kwargs = json.loads(call)
+            self.results[call] = self.__signature(
+                self.__call(name, args, kwargs))
+        return self.results[call]
+
+    def __call(self, name, args, kwargs):
+        """
+        Make a call, which is a database method or an input of the report:
+
+            fam_link -- the url of the family map of a person
+            stat     -- the modification time and size of a file
+        """
+        if name == 'fam_link':
+            return self.report.fam_link.get(args[0])
+        if name == 'stat':
+            try:
+                stat = os.stat(args[0])
+            except OSError:
+                return None
+            return (int(stat.st_mtime), stat.st_size)
+        return getattr(self.report.database.db, name)(*args, **kwargs)
+
+    def __signature(self, result):
+        """
+        Return a short digest of the result of a call.
+        """
+        if hasattr(result, 'handle') and hasattr(result, 'change'):
+            # a primary object, with its place in the report
+            obj_class = result.__class__
+            handle = result.handle
+            bkrefs = self.report.bkref_dict[obj_class].get(handle, ())
+            value = (handle, result.change,
+                     handle in self.report.obj_dict[obj_class],
+                     sorted(str(bkref) for bkref in bkrefs))
+        elif isinstance(result, (list, tuple, set, GeneratorType)):
+            value = sorted(repr(item) for item in result)
+        else:
+            value = result
+        return self.__digest(repr(value))
+
+    @staticmethod
+    def __digest(data):
+        """
+        Return the digest of a string or bytes.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return md5(data).hexdigest()[:16]
+
+#------------------------------------------------
+# RecordingDb
+#------------------------------------------------
+class RecordingDb:
+    """
+    A wrapper of the report database which records the calls made while
+    the pages of a unit are written.
+    """
+    def __init__(self, database, manifest):
+        """
+        @param: database -- The database to wrap
+        @param: manifest -- The PageManifest recording the calls
+        """
+        self.db = database
+        self.manifest = manifest
+
+    def __getattr__(self, attr):
+        """
+        Wrap the methods of the database, and cache the wrapper.
+        """
+        value = getattr(self.db, attr)
+        if not callable(value):
+            return value
+        record = self.manifest.record
+
+        def method(*args, **kwargs):
+            return record(attr, args, kwargs, value(*args, **kwargs))
+        setattr(self, attr, method)
+        return method
+
+    def method(self, fmt, *args):
+        """
+        Return a wrapped database method, see DbReadBase.method.
+        """
+        return getattr(self, fmt % tuple([arg.lower() for arg in args]), None)
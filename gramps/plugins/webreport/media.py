@@ -153,8 +153,10 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(self.report, title,
-                               handle, (prev, next_, index, media_count))
+                info = (prev, next_, index, media_count)
+                self.report.build_page(("Media", handle) + info,
+                                       self.mediapage,
+                                       self.report, title, handle, info)
                 prev = handle
                 step()
                 index += 1
@@ -170,8 +172,10 @@ class MediaPages(BasePage):
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(self.report, title, media_handle,
-                                   (prev, next_, index, media_count))
+                    info = (prev, next_, index, media_count)
+                    self.report.build_page(("Media", media_handle) + info,
+                                           self.mediapage, self.report,
+                                           title, media_handle, info)
                     prev = media_handle
                     step()
                     index += 1
@@ -652,13 +656,12 @@ class MediaPages(BasePage):
         try:
             mtime = os.stat(fullpath).st_mtime
             if self.report.archive:
-                if str(newpath) not in self.report.archive.getnames():
+                if str(newpath) not in self.report.archive:
                     # The current file not already archived.
-                    self.report.archive.add(fullpath, str(newpath))
+                    self.report.archive.copy_file(fullpath, str(newpath))
             else:
                 to_dir = os.path.join(self.html_dir, to_dir)
-                if not os.path.isdir(to_dir):
-                    os.makedirs(to_dir)
+                os.makedirs(to_dir, exist_ok=True)
                 new_file = os.path.join(self.html_dir, newpath)
                 shutil.copyfile(fullpath, new_file)
                 os.utime(new_file, (mtime, mtime))
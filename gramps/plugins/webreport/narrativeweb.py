@@ -52,7 +52,6 @@ import os
 import sys
 import time
 import shutil
-import tarfile
 from io import BytesIO, TextIOWrapper
 from collections import defaultdict
 from decimal import getcontext
@@ -78,6 +77,7 @@ from gramps.gen.config import config
 from gramps.gen.display.name import displayer as _nd
 from gramps.gen.display.place import displayer as _pd
 from gramps.gen.proxy import CacheProxyDb
+from gramps.gen.utils.pool import get_worker_processes
 from gramps.plugins.lib.libhtmlconst import _CHARACTER_SETS, _CC, _COPY_OPTIONS
 from gramps.gen.relationship import get_relationship_calculator
 
@@ -104,6 +104,9 @@ from gramps.plugins.webreport.download import DownloadPage
 from gramps.plugins.webreport.introduction import IntroductionPage
 from gramps.plugins.webreport.addressbook import AddressBookPage
 from gramps.plugins.webreport.addressbooklist import AddressBookListPage
+from gramps.plugins.webreport.archive import WebArchive
+from gramps.plugins.webreport.incremental import PageManifest, RecordingDb
+from gramps.plugins.webreport.scheduler import PageScheduler, can_schedule
 
 from gramps.plugins.webreport.common import (get_gendex_data,
                                              HTTP, HTTPS, _WEB_EXT, CSS,
@@ -205,6 +208,20 @@ class NavWebReport(Report):
         self.encoding = self.options['encoding']
 
         self.use_archive = self.options['archive']
+
+        # Only write the pages of changed objects again?
+        self.manifest = None
+        self.page_files = {}
+        if self.options['incremental'] and not self.use_archive:
+            self.manifest = PageManifest(self)
+            self.database = RecordingDb(self.database, self.manifest)
+            self._db = self.database
+
+        # Write the pages of the objects in worker processes?
+        self.scheduler = None
+        processes = get_worker_processes()
+        if processes > 1 and self.manifest is None and can_schedule(database):
+            self.scheduler = PageScheduler(self, database, processes)
         self.use_intro = self.options['intronote'] or self.options['introimg']
         self.use_home = self.options['homenote'] or self.options['homeimg']
         self.use_contact = self.opts['contactnote'] or self.opts['contactimg']
@@ -339,7 +356,8 @@ class NavWebReport(Report):
                     _('The archive file must be a file, not a directory'))
                 return
             try:
-                self.archive = tarfile.open(self.target_path, "w:gz")
+                self.archive = WebArchive(self.target_path,
+                                          self.options['reproducible'])
             except (OSError, IOError) as value:
                 self.user.notify_error(
                     _("Could not create %s") % self.target_path,
@@ -354,10 +372,8 @@ class NavWebReport(Report):
             config.set('paths.website-cal-uri',
                        os.path.dirname(self.target_cal_uri))
 
-        # for use with discovering biological, half, and step siblings for use
-        # in display_ind_parents()...
-        self.rel_class = get_relationship_calculator(reinit=True,
-                                                     clocale=self.rlocale)
+        if self.manifest:
+            self.manifest.load(self.html_dir)
 
         #################################################
         #
@@ -365,44 +381,7 @@ class NavWebReport(Report):
         #
         #################################################
 
-        # FIXME: The whole of this section of code should be implemented by the
-        # registration process for the Web Page plugins.
-
-        # Note that by use of a dictionary we ensure that at most one Web Page
-        # plugin is provided for any object class
-
-        self.tab = {}
-        # FIXME: Initialising self.tab in this way means that this code has to
-        # run before the Web Page registration - I am not sure whether this is
-        # possible, in which case an alternative approach to providing the
-        # mapping of object class to Web Page plugin will be needed.
-        for obj_class in ("Person", "Family", "Source", "Citation", "Place",
-                          "Event", "Media", "Repository"):
-            # FIXME: Would it be better if the Web Page plugins used a different
-            # base class rather than BasePage, which is really just for each web
-            # page
-            self.tab[obj_class] = BasePage(report=self, title="")
-
-        # Note that by not initialising any Web Page plugins that are not going
-        # to generate pages, we ensure that there is not performance implication
-        # for such plugins.
-        self.tab["Person"] = PersonPages(self)
-        if self.inc_families:
-            self.tab["Family"] = FamilyPages(self)
-        if self.inc_events:
-            self.tab["Event"] = EventPages(self)
-        if self.inc_gallery:
-            self.tab["Media"] = MediaPages(self)
-        self.tab["Place"] = PlacePages(self)
-        self.tab["Source"] = SourcePages(self)
-        self.tab["Repository"] = RepositoryPages(self)
-        self.tab["Citation"] = CitationPages(self)
-
-        # FIXME: The following routines that are not run in two passes have not
-        # yet been converted to a form suitable for separation into Web Page
-        # plugins: SurnamePage, SurnameListPage, IntroductionPage, HomePage,
-        # ThumbnailPreviewPage, DownloadPage, ContactPage,AddressBookListPage,
-        # AddressBookPage
+        self.init_pages()
 
         #################################################
         #
@@ -495,6 +474,13 @@ class NavWebReport(Report):
         # copy all of the necessary files
         self.copy_narrated_files()
 
+        if self.scheduler:
+            self.scheduler.close()
+
+        # remove the pages which are gone, and keep the manifest
+        if self.manifest:
+            self.manifest.save()
+
         # if an archive is being used, close it?
         if self.archive:
             self.archive.close()
@@ -509,6 +495,54 @@ class NavWebReport(Report):
             self.user.warn(_("Missing media objects:"), error)
         self.database.clear_cache()
 
+    def init_pages(self):
+        """
+        Create the Web Page plugins, which write the pages of the objects.
+        """
+        # for use with discovering biological, half, and step siblings for use
+        # in display_ind_parents()...
+        self.rel_class = get_relationship_calculator(reinit=True,
+                                                     clocale=self.rlocale)
+
+        # FIXME: The whole of this section of code should be implemented by the
+        # registration process for the Web Page plugins.
+
+        # Note that by use of a dictionary we ensure that at most one Web Page
+        # plugin is provided for any object class
+
+        self.tab = {}
+        # FIXME: Initialising self.tab in this way means that this code has to
+        # run before the Web Page registration - I am not sure whether this is
+        # possible, in which case an alternative approach to providing the
+        # mapping of object class to Web Page plugin will be needed.
+        for obj_class in ("Person", "Family", "Source", "Citation", "Place",
+                          "Event", "Media", "Repository"):
+            # FIXME: Would it be better if the Web Page plugins used a different
+            # base class rather than BasePage, which is really just for each web
+            # page
+            self.tab[obj_class] = BasePage(report=self, title="")
+
+        # Note that by not initialising any Web Page plugins that are not going
+        # to generate pages, we ensure that there is not performance implication
+        # for such plugins.
+        self.tab["Person"] = PersonPages(self)
+        if self.inc_families:
+            self.tab["Family"] = FamilyPages(self)
+        if self.inc_events:
+            self.tab["Event"] = EventPages(self)
+        if self.inc_gallery:
+            self.tab["Media"] = MediaPages(self)
+        self.tab["Place"] = PlacePages(self)
+        self.tab["Source"] = SourcePages(self)
+        self.tab["Repository"] = RepositoryPages(self)
+        self.tab["Citation"] = CitationPages(self)
+
+        # FIXME: The following routines that are not run in two passes have not
+        # yet been converted to a form suitable for separation into Web Page
+        # plugins: SurnamePage, SurnameListPage, IntroductionPage, HomePage,
+        # ThumbnailPreviewPage, DownloadPage, ContactPage,AddressBookListPage,
+        # AddressBookPage
+
     def _build_obj_dict(self):
         """
         Construct the dictionaries of objects to be included in the reports.
@@ -1296,6 +1330,51 @@ class NavWebReport(Report):
                 step()
                 index += 1
 
+    def build_page(self, key, write_page, *args):
+        """
+        Write the pages of an object by calling write_page(*args).
+
+        In the incremental mode, the pages are not written again if the
+        manifest finds that their inputs did not change.
+
+        @param: key        -- The key of the pages in the manifest, a tuple
+                              of the object class name, the object handle
+                              and anything else the pages depend on
+        @param: write_page -- The method writing the pages, its first
+                              argument is the report
+
+        With worker processes, the pages are sent to the workers, and
+        written by the method of the same name of their own report.
+        """
+        if self.scheduler:
+            self.scheduler.submit(key[0], write_page.__name__, args[1:])
+            return
+        if self.manifest is None:
+            write_page(*args)
+            return
+        if self.manifest.is_current(key):
+            return
+        self.manifest.begin(key)
+        complete = False
+        try:
+            # the object of the pages is always one of their inputs
+            self._db.method('get_%s_from_handle', key[0])(key[1])
+            write_page(*args)
+            complete = True
+        finally:
+            self.manifest.end(complete)
+
+    def family_map_url(self, handle):
+        """
+        Return the url of the family map of a person, or None if the
+        person has no family map.
+
+        @param: handle -- The person handle
+        """
+        if self.manifest:
+            self.manifest.record_input('fam_link', handle)
+        return self.fam_link.get(handle)
+
     def base_pages(self):
         """
         creates HomePage, ContactPage, DownloadPage and IntroductionPage
@@ -1474,6 +1553,9 @@ class NavWebReport(Report):
         @param: subdir -- A subdir to be added to filename
         @param: ext    -- An extension to be added to filename
         """
+        if self.scheduler:
+            # Write the pages sent to the workers first, in their order
+            self.scheduler.flush()
         if ext is None:
             ext = self.ext
         if self.usecms and subdir is None:
@@ -1492,11 +1574,17 @@ class NavWebReport(Report):
             string_io = None
             if subdir:
                 subdir = os.path.join(self.html_dir, subdir)
-                if not os.path.isdir(subdir):
-                    os.makedirs(subdir)
-            fname = os.path.join(self.html_dir, self.cur_fname)
-            output_file = open(fname, 'w', encoding=self.encoding,
-                               errors='xmlcharrefreplace')
+                os.makedirs(subdir, exist_ok=True)
+            if self.manifest:
+                # The file is written when it is closed, if it changed
+                string_io = BytesIO()
+                output_file = TextIOWrapper(string_io, encoding=self.encoding,
+                                            errors='xmlcharrefreplace')
+                self.page_files[string_io] = self.cur_fname
+            else:
+                fname = os.path.join(self.html_dir, self.cur_fname)
+                output_file = open(fname, 'w', encoding=self.encoding,
+                                   errors='xmlcharrefreplace')
         return (output_file, string_io)
 
     def close_file(self, output_file, string_io, date):
@@ -1511,18 +1599,23 @@ class NavWebReport(Report):
                                when we use rsync.
         """
         if self.archive:
-            if self.cur_fname not in self.archive.getnames():
+            if self.cur_fname not in self.archive:
                 # The current file not already archived.
                 output_file.flush()
-                tarinfo = tarfile.TarInfo(self.cur_fname)
-                tarinfo.size = len(string_io.getvalue())
-                tarinfo.mtime = date if date != 0 else time.time()
-                if not win():
-                    tarinfo.uid = os.getuid()
-                    tarinfo.gid = os.getgid()
-                string_io.seek(0)
-                self.archive.addfile(tarinfo, string_io)
+                self.archive.write_file(self.cur_fname, string_io,
+                                        date or time.time())
+            output_file.close()
+        elif self.manifest:
+            output_file.flush()
+            fname = self.page_files.pop(string_io)
+            data = string_io.getvalue()
             output_file.close()
+            if self.manifest.add_file(fname, data):
+                fname = os.path.join(self.html_dir, fname)
+                with open(fname, 'wb') as html_file:
+                    html_file.write(data)
+                if date is not None and date > 0:
+                    os.utime(fname, (date, date))
         else:
             output_file.close()
             if date > 0:
@@ -1554,33 +1647,33 @@ class NavWebReport(Report):
         @param: to_dir     -- Is the relative path name in the destination root.
                               It will be prepended before 'to_fname'.
         """
+        if self.scheduler:
+            # Write the pages sent to the workers first, in their order
+            self.scheduler.flush()
         if self.usecms:
             to_dir = "/" + self.target_uri + "/" + to_dir
         LOG.debug("copying '%s' to '%s/%s'", from_fname, to_dir, to_fname)
         mtime = os.stat(from_fname).st_mtime
         if self.archive:
-            def set_mtime(tarinfo):
-                """
-                For each file, we set the last modification time.
-
-                We could also set uid, gid, uname, gname and mode
-                #tarinfo.uid = os.getuid()
-                #tarinfo.mode = 0660
-                #tarinfo.uname = tarinfo.gname = "www-data"
-                """
-                tarinfo.mtime = mtime
-                return tarinfo
-
             dest = os.path.join(to_dir, to_fname)
-            if dest not in self.archive.getnames():
+            if dest not in self.archive:
                 # The current file not already archived.
-                self.archive.add(from_fname, dest, filter=set_mtime)
+                self.archive.copy_file(from_fname, dest)
         else:
             dest = os.path.join(self.html_dir, to_dir, to_fname)
 
             destdir = os.path.dirname(dest)
-            if not os.path.isdir(destdir):
-                os.makedirs(destdir)
+            os.makedirs(destdir, exist_ok=True)
+
+            if self.manifest:
+                # The pages showing the file depend on it, but there is
+                # no need to copy it again if it did not change
+                self.manifest.record_input('stat', from_fname)
+                if (os.path.isfile(dest) and
+                        int(os.stat(dest).st_mtime) == int(mtime) and
+                        os.path.getsize(dest) ==
+                        os.path.getsize(from_fname)):
+                    return
 
             if from_fname != dest:
                 try:
@@ -1625,6 +1718,8 @@ class NavWebOptions(MenuReportOptions):
         """
         self.__db = dbase
         self.__archive = None
+        self.__reproducible = None
+        self.__incremental = None
         self.__target = None
         self.__target_uri = None
         self.__pid = None
@@ -1703,6 +1798,23 @@ class NavWebOptions(MenuReportOptions):
         addopt("archive", self.__archive)
         self.__archive.connect('value-changed', self.__archive_changed)
 
+        self.__reproducible = BooleanOption(
+            _('Make a reproducible archive'), False)
+        self.__reproducible.set_help(
+            _('Whether to give all the files of the archive the same time, '
+              'and to sort them by name, so that the same web site always '
+              'gives the same archive. The archive is a zip file if its '
+              'name ends with .zip'))
+        addopt("reproducible", self.__reproducible)
+
+        self.__incremental = BooleanOption(
+            _('Only write the pages of changed objects'), False)
+        self.__incremental.set_help(
+            _('Whether to keep a manifest of the web pages in the '
+              'destination directory, and only write again the pages '
+              'whose objects changed since the last run'))
+        addopt("incremental", self.__incremental)
+
         dbname = self.__db.get_dbname()
         default_dir = dbname + "_" + "NAVWEB"
         self.__target = DestinationOption(
@@ -2311,8 +2423,12 @@ class NavWebOptions(MenuReportOptions):
         if self.__archive.get_value() is True:
             self.__target.set_extension(".tar.gz")
             self.__target.set_directory_entry(False)
+            self.__reproducible.set_available(True)
+            self.__incremental.set_available(False)
         else:
             self.__target.set_directory_entry(True)
+            self.__reproducible.set_available(False)
+            self.__incremental.set_available(True)
 
     def __update_filters(self):
         """
@@ -148,7 +148,9 @@ class PersonPages(BasePage):
                 step()
                 index += 1
                 person = self.r_db.get_person_from_handle(person_handle)
-                self.individualpage(self.report, title, person)
+                self.report.build_page(("Person", person_handle),
+                                       self.individualpage,
+                                       self.report, title, person)
             step()
             self.individuallistpage(self.report, title,
                                     self.report.obj_dict[Person].keys())
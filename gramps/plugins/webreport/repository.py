@@ -119,7 +119,9 @@ class RepositoryPages(BasePage):
                 (repo, handle) = repos_dict[key]
                 step()
                 idx += 1
-                self.repositorypage(self.report, title, repo, handle)
+                self.report.build_page(("Repository", handle),
+                                       self.repositorypage,
+                                       self.report, title, repo, handle)
 
     def repositorylistpage(self, report, title, repos_dict, keys):
         """
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+Support for writing the pages of the objects in a pool of worker processes.
+
+Each worker opens its own read-only connection to the database, and builds
+a report from the same options as the main report.  The dictionaries of the
+objects in the report are built once by the main process and given to the
+workers as an index of plain dictionaries.  The family map links, which the
+person pages add and the family pages use, are shared through a manager.
+
+The pages are sent to the workers in chunks.  When the report writes to a
+directory, the workers write the pages themselves.  When it writes to an
+archive, the workers return the files of each chunk, and the main process
+adds them to the archive in the order the pages were sent.
+
+Classes:
+    PageScheduler - sends the pages to the worker processes
+    PageArchive - collects the files of the pages in a worker process
+"""
+#------------------------------------------------
+# python modules
+#------------------------------------------------
+from collections import defaultdict, deque
+from io import BytesIO
+
+#------------------------------------------------
+# Gramps module
+#------------------------------------------------
+from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.utils import get_dbid_from_path
+from gramps.gen.user import User
+from gramps.gen.utils.pool import start_manager, start_pool, stop_pool
+
+#------------------------------------------------
+# constants
+#------------------------------------------------
+CHUNK_SIZE = 20
+
+# State of a worker process
+_REPORT = None
+_OUTPUT = []
+
+#------------------------------------------------
+# PageScheduler
+#------------------------------------------------
+def can_schedule(database):
+    """
+    Return True if the database can be opened by worker processes.
+
+    This requires a database stored on disk with no pending changes.
+    """
+    return (isinstance(database, DbGeneric) and
+            database.get_save_path() not in (None, ':memory:') and
+            database.transaction is None)
+
+class PageScheduler:
+    """
+    Sends the pages of the objects to a pool of worker processes, and
+    writes the files they return.
+
+    The pool is started when the first page is sent, so that the workers
+    get the complete dictionaries of the objects in the report.
+    """
+    def __init__(self, report, database, processes):
+        """
+        @param: report    -- The instance of the main report class
+        @param: database  -- The database of the report, without proxies
+        @param: processes -- The number of worker processes
+        """
+        self.report = report
+        self.path = database.get_save_path()
+        self.backend = get_dbid_from_path(self.path)
+        self.processes = processes
+        self.pool = None
+        self.manager = None
+        self.chunk = []
+        self.results = deque()
+
+    def submit(self, class_name, method, args):
+        """
+        Send a page to the workers.  Each worker calls the method of its
+        own report with its report and the arguments, as in
+        report.tab[class_name].method(report, *args).
+
+        @param: class_name -- The class name of the object of the page
+        @param: method     -- The name of the method writing the page
+        @param: args       -- The arguments of the method after the report
+        """
+        self.chunk.append((class_name, method, args))
+        if len(self.chunk) >= CHUNK_SIZE:
+            self.__send()
+
+    def flush(self):
+        """
+        Wait until all the pages sent are written.
+        """
+        self.__send()
+        while self.results:
+            self.__write(self.results.popleft().get())
+
+    def close(self):
+        """
+        Write the remaining pages, and stop the worker processes.
+        """
+        try:
+            self.flush()
+        finally:
+            if self.pool is not None:
+                stop_pool(self.pool)
+                self.pool = None
+            if self.manager is not None:
+                self.report.fam_link = self.report.fam_link.copy()
+                self.manager.shutdown()
+                self.manager = None
+
+    def __start(self):
+        """
+        Start the worker processes.
+        """
+        report = self.report
+        index = ({obj_class: dict(objects)
+                  for obj_class, objects in report.obj_dict.items()},
+                 {obj_class: {handle: tuple(bkrefs)
+                              for handle, bkrefs in objects.items()}
+                  for obj_class, objects in report.bkref_dict.items()})
+        self.manager = start_manager()
+        report.fam_link = self.manager.dict(report.fam_link)
+        self.pool = start_pool(self.processes, _init_worker,
+                               (self.backend, self.path, report.options,
+                                index, report.fam_link))
+
+    def __send(self):
+        """
+        Send the current chunk of pages, and write the results of the
+        oldest chunks when too many are waiting.
+        """
+        if not self.chunk:
+            return
+        if self.pool is None:
+            self.__start()
+        self.results.append(self.pool.apply_async(_write_pages,
+                                                  (self.chunk,)))
+        self.chunk = []
+        while len(self.results) > 2 * self.processes:
+            self.__write(self.results.popleft().get())
+
+    def __write(self, output):
+        """
+        Write the files and the warnings returned by a worker.
+        """
+        archive = self.report.archive
+        for entry in output:
+            if entry[0] == 'warn':
+                self.report.user.warn(*entry[1:])
+            elif entry[0] == 'write':
+                name, data, mtime = entry[1:]
+                if name not in archive:
+                    archive.write_file(name, BytesIO(data), mtime)
+            else:
+                path, name = entry[1:]
+                if name not in archive:
+                    archive.copy_file(path, name)
+
+#------------------------------------------------
+# Worker process
+#------------------------------------------------
+class PageArchive:
+    """
+    Stands in for the archive of the report in a worker process, see
+    WebArchive.  The files added by the pages are returned to the main
+    process, which adds them to the real archive.
+    """
+    def __init__(self):
+        self.names = set()
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def write_file(self, name, fileobj, mtime):
+        """
+        Add a file with the content of a binary file object.
+        """
+        self.names.add(name)
+        fileobj.seek(0)
+        _OUTPUT.append(('write', name, fileobj.read(), mtime))
+
+    def copy_file(self, path, name):
+        """
+        Add a file from the disk.
+        """
+        self.names.add(name)
+        _OUTPUT.append(('copy', path, name))
+
+class PageUser(User):
+    """
+    Returns the warnings of the pages to the main process.
+    """
+    def warn(self, title, warning=""):
+        _OUTPUT.append(('warn', title, warning))
+
+def _init_worker(backend, path, options, index, fam_link):
+    """
+    Build the report in a worker process.
+    """
+    global _REPORT
+    try:
+        _REPORT = _build_report(backend, path, options, index, fam_link)
+    except Exception as err:
+        # The pool would start a new worker in place of a failed one, so
+        # the error is raised with the first chunk of pages instead.
+        _REPORT = err
+
+def _build_report(backend, path, options, index, fam_link):
+    """
+    Open the database, and return a report with the same options and the
+    same objects as the main report.
+    """
+    from gramps.gen.db.dbconst import DBMODE_R
+    from gramps.gen.db.utils import make_database
+    from gramps.gen.filters import reload_custom_filters
+    reload_custom_filters()
+    # This registers the plugins, which the report needs to be imported
+    database = make_database(backend)
+    database.load(path, mode=DBMODE_R, update=False)
+    from gramps.plugins.webreport.narrativeweb import (NavWebReport,
+                                                       NavWebOptions)
+    report_options = NavWebOptions('navwebpage', database)
+    report_options.load_previous_values()
+    menu = report_options.menu
+    for optname, value in options.items():
+        menu.get_option_by_name(optname).set_value(value)
+    report = NavWebReport(database, report_options, PageUser())
+    report.scheduler = None
+    if report.use_archive:
+        report.archive = PageArchive()
+
+    obj_dict, bkref_dict = index
+    report.obj_dict = defaultdict(lambda: defaultdict(set))
+    for obj_class, objects in obj_dict.items():
+        report.obj_dict[obj_class] = defaultdict(set, objects)
+    report.bkref_dict = defaultdict(lambda: defaultdict(set))
+    for obj_class, objects in bkref_dict.items():
+        report.bkref_dict[obj_class] = defaultdict(
+            set, ((handle, set(bkrefs)) for handle, bkrefs in objects.items()))
+    report.fam_link = fam_link
+    report.visited = []
+    report.init_pages()
+    return report
+
+def _write_pages(chunk):
+    """
+    Write a chunk of pages, and return the files to add to the archive and
+    the warnings.
+    """
+    if isinstance(_REPORT, Exception):
+        raise _REPORT
+    for class_name, method, args in chunk:
+        getattr(_REPORT.tab[class_name], method)(_REPORT, *args)
+    output = list(_OUTPUT)
+    del _OUTPUT[:]
+    return output
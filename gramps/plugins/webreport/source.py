@@ -110,7 +110,9 @@ class SourcePages(BasePage):
             for source_handle in self.report.obj_dict[Source]:
                 step()
                 index += 1
-                self.sourcepage(self.report, title, source_handle)
+                self.report.build_page(("Source", source_handle),
+                                       self.sourcepage,
+                                       self.report, title, source_handle)
 
     def sourcelistpage(self, report, title, source_handles):
         """
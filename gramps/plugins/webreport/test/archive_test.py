@@ -0,0 +1,155 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the archive of the Narrated Web Site
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import unittest
+import zipfile
+from io import BytesIO
+from unittest.mock import patch
+
+from ..archive import WebArchive, REPRODUCIBLE_MTIME
+
+PAGE = b"<html><body>Page</body></html>"
+IMAGE = b"\x89PNG image"
+MTIME = 1500000000
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.image = self.make_file("image.png", MTIME)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def make_file(self, name, mtime):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as image_file:
+            image_file.write(IMAGE)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def make_archive(self, name, reproducible=False, reverse=False,
+                     mtime=MTIME, image=None):
+        """
+        Write an archive with a page and an image, and return its path.
+        """
+        filename = os.path.join(self.tmpdir, name)
+        archive = WebArchive(filename, reproducible)
+        members = [lambda: archive.write_file("index.html", BytesIO(PAGE),
+                                              mtime),
+                   lambda: archive.copy_file(image or self.image,
+                                             "images/image.png")]
+        for add_member in (reversed(members) if reverse else members):
+            add_member()
+        self.assertIn("index.html", archive)
+        self.assertIn("images/image.png", archive)
+        self.assertNotIn("other.html", archive)
+        archive.close()
+        return filename
+
+    def read(self, filename):
+        with open(filename, 'rb') as archive_file:
+            return archive_file.read()
+
+    def test_contains(self):
+        archive = WebArchive(os.path.join(self.tmpdir, "site.tar.gz"))
+        self.assertNotIn("index.html", archive)
+        archive.write_file("index.html", BytesIO(PAGE), MTIME)
+        self.assertIn("index.html", archive)
+        self.assertNotIn("images/image.png", archive)
+        archive.copy_file(self.image, "images/image.png")
+        self.assertIn("images/image.png", archive)
+        archive.close()
+
+    def test_tar(self):
+        filename = self.make_archive("site.tar.gz")
+        with tarfile.open(filename, "r:gz") as tar:
+            self.assertEqual(tar.getnames(),
+                             ["index.html", "images/image.png"])
+            for name, content in (("index.html", PAGE),
+                                  ("images/image.png", IMAGE)):
+                member = tar.getmember(name)
+                self.assertEqual(tar.extractfile(member).read(), content)
+                self.assertEqual(member.mtime, MTIME)
+                self.assertEqual(member.mode, 0o644)
+
+    def test_zip(self):
+        filename = self.make_archive("site.zip")
+        with zipfile.ZipFile(filename) as archive:
+            self.assertEqual(archive.namelist(),
+                             ["index.html", "images/image.png"])
+            self.assertEqual(archive.read("index.html"), PAGE)
+            self.assertEqual(archive.read("images/image.png"), IMAGE)
+            self.assertEqual(archive.getinfo("index.html").date_time,
+                             time.localtime(MTIME)[:6])
+
+    def check_reproducible(self, extension, mtime):
+        """
+        Check that the archives of the same files are the same, whatever
+        the order and the times of the files, and return the times of the
+        members.
+        """
+        first = self.make_archive("first" + extension, True)
+        other_image = self.make_file("other.png", MTIME + 1000)
+        second = self.make_archive("second" + extension, True, reverse=True,
+                                   mtime=MTIME + 2000, image=other_image)
+        self.assertEqual(self.read(first), self.read(second))
+        if extension == ".zip":
+            with zipfile.ZipFile(first) as archive:
+                self.assertEqual(archive.namelist(),
+                                 ["images/image.png", "index.html"])
+                self.assertEqual(archive.read("index.html"), PAGE)
+                for info in archive.infolist():
+                    self.assertEqual(info.date_time, time.gmtime(mtime)[:6])
+        else:
+            # No time in the gzip header
+            self.assertEqual(self.read(first)[4:8], bytes(4))
+            with tarfile.open(first, "r:gz") as tar:
+                self.assertEqual(tar.getnames(),
+                                 ["images/image.png", "index.html"])
+                self.assertEqual(
+                    tar.extractfile("images/image.png").read(), IMAGE)
+                for member in tar.getmembers():
+                    self.assertEqual(member.mtime, mtime)
+                    self.assertEqual((member.uid, member.gid), (0, 0))
+
+    def test_reproducible(self):
+        with patch.dict(os.environ):
+            os.environ.pop('SOURCE_DATE_EPOCH', None)
+            for extension in (".tar.gz", ".zip"):
+                self.check_reproducible(extension, REPRODUCIBLE_MTIME)
+
+    def test_source_date_epoch(self):
+        with patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '1600000000'}):
+            for extension in (".tar.gz", ".zip"):
+                self.check_reproducible(extension, 1600000000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the manifest of the incremental Narrated Web Site
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import defaultdict
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person, Name, Surname
+from ..incremental import PageManifest, RecordingDb
+
+class Report:
+    """
+    The parts of NavWebReport used by the manifest.
+    """
+    def __init__(self, db, options):
+        self.options = options
+        self.fam_link = {}
+        self.obj_dict = defaultdict(lambda: defaultdict(set))
+        self.bkref_dict = defaultdict(lambda: defaultdict(set))
+        self.manifest = PageManifest(self)
+        self.database = RecordingDb(db, self.manifest)
+
+class ManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.handles = []
+        with DbTxn("Add people", self.db) as trans:
+            for first_name in ("John", "Mary", "Anna"):
+                self.handles.append(
+                    self.db.add_person(self.make_person(first_name), trans))
+        self.options = {'title': 'Test'}
+        self.bkrefs = {}
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    @staticmethod
+    def make_person(first_name):
+        person = Person()
+        name = Name()
+        name.set_first_name(first_name)
+        surname = Surname()
+        surname.set_surname("Smith")
+        name.set_surname_list([surname])
+        person.set_primary_name(name)
+        return person
+
+    def rename(self, index, first_name):
+        with DbTxn("Rename", self.db) as trans:
+            person = self.db.get_person_from_handle(self.handles[index])
+            person.get_primary_name().set_first_name(first_name)
+            # a later change, even within the same second
+            self.db.commit_person(person, trans, person.change + 1)
+
+    def write_pages(self, handles=None):
+        """
+        Write a page for each person, which shows the first name of the
+        person and the ID of the next person.  Return the number of pages
+        built and the files written.
+        """
+        if handles is None:
+            handles = self.handles
+        report = Report(self.db, self.options)
+        for handle in handles:
+            report.obj_dict[Person][handle] = True
+        report.bkref_dict[Person].update(self.bkrefs)
+        manifest = report.manifest
+        manifest.load(self.tmpdir)
+        written = []
+        for index, handle in enumerate(handles):
+            key = ("Person", handle)
+            if manifest.is_current(key):
+                continue
+            manifest.begin(key)
+            person = report.database.get_person_from_handle(handle)
+            other = report.database.get_person_from_handle(
+                handles[(index + 1) % len(handles)])
+            data = ("%s %s" % (person.get_primary_name().get_first_name(),
+                               other.gramps_id)).encode()
+            fname = handle + ".html"
+            if manifest.add_file(fname, data):
+                with open(os.path.join(self.tmpdir, fname), 'wb') as page:
+                    page.write(data)
+                written.append(handle)
+            manifest.end()
+        manifest.save()
+        return manifest.written, written
+
+    def test_unchanged(self):
+        self.assertEqual(self.write_pages(), (3, self.handles))
+        self.assertEqual(self.write_pages(), (0, []))
+
+    def test_changed_input(self):
+        self.write_pages()
+        self.rename(1, "Maria")
+        # the page of John shows the ID of Mary, which did not change
+        self.assertEqual(self.write_pages(), (2, [self.handles[1]]))
+        self.assertEqual(self.write_pages(), (0, []))
+
+    def test_back_references(self):
+        self.write_pages()
+        self.bkrefs = {self.handles[2]: {(Person, self.handles[0])}}
+        self.assertEqual(self.write_pages(), (2, []))
+
+    def test_options(self):
+        self.write_pages()
+        self.options = {'title': 'Other'}
+        self.assertEqual(self.write_pages(), (3, []))
+
+    def test_removed_page(self):
+        self.write_pages()
+        self.write_pages(self.handles[:2])
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         sorted([".narrativeweb.json"] +
+                                [handle + ".html"
+                                 for handle in self.handles[:2]]))
+
+    def test_missing_file(self):
+        self.write_pages()
+        os.remove(os.path.join(self.tmpdir, self.handles[0] + ".html"))
+        self.assertEqual(self.write_pages(), (1, [self.handles[0]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
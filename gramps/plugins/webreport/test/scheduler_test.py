@@ -0,0 +1,210 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of the scheduler of the pages of the Narrated Web Site
+"""
+
+import os
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+import unittest
+from collections import defaultdict
+from io import BytesIO
+from unittest.mock import patch
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import DBBACKEND
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person
+from gramps.gen.proxy import LivingProxyDb
+from .. import scheduler
+from ..archive import WebArchive
+from ..scheduler import (PageArchive, PageScheduler, PageUser, can_schedule,
+                         _init_worker, _write_pages)
+
+MTIME = 1500000000
+
+class Pages:
+    """
+    The methods writing the pages of a class of objects.
+    """
+    def write(self, report, name):
+        report.archive.write_file(name, BytesIO(name.encode()), MTIME)
+
+    def copy(self, report, path, name):
+        report.archive.copy_file(path, name)
+
+    def warn(self, report, title):
+        report.user.warn(title, "warning")
+
+class WorkerReport:
+    """
+    The report of a worker process.
+    """
+    def __init__(self):
+        self.archive = PageArchive()
+        self.user = PageUser()
+        self.tab = {'Page': Pages()}
+
+class MainReport:
+    """
+    The parts of NavWebReport used by the scheduler.
+    """
+    def __init__(self, archive):
+        self.archive = archive
+        self.warnings = []
+        self.user = self
+        self.options = {}
+        self.obj_dict = defaultdict(lambda: defaultdict(set))
+        self.bkref_dict = defaultdict(lambda: defaultdict(set))
+        self.fam_link = {}
+
+    def warn(self, title, warning=""):
+        self.warnings.append((title, warning))
+
+class Result:
+    def __init__(self, output):
+        self.output = output
+
+    def get(self):
+        return self.output
+
+class Pool:
+    """
+    Writes the pages in the calling process, as a worker process would.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def apply_async(self, func, args):
+        self.chunks.append(args[0])
+        return Result(func(*args))
+
+    def terminate(self):
+        pass
+
+    def join(self):
+        pass
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "tree")
+        os.mkdir(self.path)
+        with open(os.path.join(self.path, DBBACKEND), "w") as backend_file:
+            backend_file.write("sqlite")
+        self.db = make_database("sqlite")
+        self.db.load(self.path)
+        self.image = os.path.join(self.tmpdir, "image.png")
+        with open(self.image, 'wb') as image_file:
+            image_file.write(b"image")
+
+    def tearDown(self):
+        if self.db.is_open():
+            self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_can_schedule(self):
+        self.assertTrue(can_schedule(self.db))
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_person(Person(), trans)
+            self.assertFalse(can_schedule(self.db))
+        self.assertTrue(can_schedule(self.db))
+        self.assertFalse(can_schedule(
+            LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL)))
+        memory = make_database("sqlite")
+        memory.load(":memory:")
+        self.assertFalse(can_schedule(memory))
+        memory.close()
+
+    def test_page_archive(self):
+        with patch.object(scheduler, '_OUTPUT', []) as output:
+            archive = PageArchive()
+            self.assertNotIn("index.html", archive)
+            archive.write_file("index.html", BytesIO(b"page"), MTIME)
+            archive.copy_file(self.image, "images/image.png")
+            PageUser().warn("title", "warning")
+            self.assertIn("index.html", archive)
+            self.assertIn("images/image.png", archive)
+            self.assertEqual(output,
+                             [('write', "index.html", b"page", MTIME),
+                              ('copy', self.image, "images/image.png"),
+                              ('warn', "title", "warning")])
+
+    def test_write_order(self):
+        filename = os.path.join(self.tmpdir, "site.tar.gz")
+        report = MainReport(WebArchive(filename))
+        names = ["page%02d.html" % number for number in range(12)]
+        pool = Pool()
+        with patch.object(scheduler, 'CHUNK_SIZE', 5), \
+                patch.object(scheduler, '_REPORT', WorkerReport()), \
+                patch.object(scheduler, '_OUTPUT', []):
+            page_scheduler = PageScheduler(report, self.db, 1)
+            page_scheduler.pool = pool
+            for name in names:
+                page_scheduler.submit('Page', 'write', (name,))
+                page_scheduler.submit('Page', 'copy',
+                                      (self.image, "images/image.png"))
+            page_scheduler.submit('Page', 'warn', ("title",))
+            # The pages of the chunks not sent yet are not written
+            self.assertNotIn(names[-1], report.archive)
+            page_scheduler.close()
+        report.archive.close()
+        self.assertIsNone(page_scheduler.pool)
+        self.assertEqual([len(chunk) for chunk in pool.chunks],
+                         [5, 5, 5, 5, 5])
+        self.assertEqual(report.warnings, [("title", "warning")])
+        # The files are written once, in the order of the pages
+        with tarfile.open(filename, "r:gz") as tar:
+            self.assertEqual(tar.getnames(),
+                             [names[0], "images/image.png"] + names[1:])
+            self.assertEqual(tar.extractfile(names[5]).read(),
+                             names[5].encode())
+            self.assertEqual(tar.getmember(names[5]).mtime, MTIME)
+
+    def test_init_failure(self):
+        with patch.object(scheduler, '_REPORT', None), \
+                patch.object(scheduler, '_build_report',
+                             side_effect=RuntimeError("no database")):
+            _init_worker("sqlite", self.path, {}, ({}, {}), {})
+            with self.assertRaisesRegex(RuntimeError, "no database"):
+                _write_pages([('Page', 'write', ("index.html",))])
+
+    def test_worker_failure(self):
+        # The workers cannot open a database that is gone
+        report = MainReport(WebArchive(os.path.join(self.tmpdir,
+                                                    "site.tar.gz")))
+        page_scheduler = PageScheduler(report, self.db, 2)
+        self.db.close()
+        shutil.rmtree(self.path)
+        page_scheduler.submit('Page', 'write', ("index.html",))
+        with self.assertRaises(sqlite3.OperationalError):
+            page_scheduler.close()
+        self.assertIsNone(page_scheduler.pool)
+        self.assertIsNone(page_scheduler.manager)
+        report.archive.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
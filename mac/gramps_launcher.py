@@ -41,5 +41,8 @@ environ['APPDATA'] = join(environ['HOME'], 'Library', 'Application Support')
 environ['PATH'] = join(bundle_contents, 'MacOS') + ':' + environ['PATH']
 
 import gramps.grampsapp as app
-app.main()
+
+# not when imported by a spawned worker process
+if __name__ == '__main__':
+    app.main()
 